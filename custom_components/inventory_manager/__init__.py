@@ -3,24 +3,31 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+import time
 from typing import TYPE_CHECKING
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
 
 from .const import (
-    CONF_ITEM_VENDOR,
+    CONF_ITEMS,
     DOMAIN,
 )
-from .coordinator import InventoryManagerItem
+from .coordinator import InventoryManagerCoordinator, is_hub, item_configs
 from .data import (
     InventoryManagerConfigEntry,
     InventoryManagerData,
 )
+from .doses import async_get_dose_scheduler
+from .ledger import async_get_ledger
+from .services import async_setup_services
+from .snapshot import async_get_snapshot
 
 if TYPE_CHECKING:
     from homeassistant import core
+    from homeassistant.helpers.typing import ConfigType
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,6 +35,17 @@ _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = [Platform.NUMBER, Platform.SENSOR, Platform.BINARY_SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: core.HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the domain services and load stored data."""
+    async_setup_services(hass)
+    await async_get_ledger(hass).async_load()
+    await async_get_dose_scheduler(hass).async_load()
+    await async_get_snapshot(hass).async_load()
+    return True
+
 
 async def async_setup_entry(
     hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
@@ -35,37 +53,117 @@ async def async_setup_entry(
     """Set up platform from a ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = InventoryManagerItem(
-        entry, hass, logger=_LOGGER, name=DOMAIN, update_interval=timedelta(hours=1)
+    absorbed_entries = []
+    if is_hub(entry):
+        absorbed_entries = await _async_unload_absorbed_entries(hass, entry)
+
+    start = time.perf_counter()
+    coordinator = InventoryManagerCoordinator(
+        entry, hass, logger=_LOGGER, name=DOMAIN, update_interval=None
     )
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-    entry.runtime_data = InventoryManagerData(
-        device_info=DeviceInfo(
-            identifiers={(DOMAIN, entry.entry_id)},
-            manufacturer=entry.data.get(CONF_ITEM_VENDOR),
-            entry_type=DeviceEntryType.SERVICE,
-            name=entry.title,
-        ),
-        coordinator=coordinator,
-    )
+    entry.runtime_data = InventoryManagerData(coordinator=coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Deadlines and doses are scheduled once all numbers have been restored
+    for item in coordinator.items.values():
+        item.async_reschedule()
+    coordinator.doses.async_add_items(coordinator.items.values())
+    coordinator.triggers.async_add_items(coordinator.items.values())
+    coordinator.forecaster.async_request(coordinator.items.values())
+    coordinator.stats.durations["setup"] = time.perf_counter() - start
+
+    if is_hub(entry):
+        _async_remove_stale_devices(hass, entry)
+
+        # The entities of absorbed entries now belong to the hub, so removing
+        # the old entries only removes the entries themselves.
+        for absorbed_entry_id in absorbed_entries:
+            hass.async_create_task(hass.config_entries.async_remove(absorbed_entry_id))
+
     # Register update listener to handle option changes
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def _async_unload_absorbed_entries(
+    hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
+) -> list[str]:
+    """
+    Unload single item entries that have been moved into a hub.
+
+    Items imported into a hub keep the entry id of their original config
+    entry as item id. As long as the original entry exists, the migration
+    into the hub has not been completed.
+    """
+    absorbed_entries = []
+    for item_id in entry.data.get(CONF_ITEMS, {}):
+        item_entry = hass.config_entries.async_get_entry(item_id)
+        if item_entry is None or item_entry.domain != DOMAIN or is_hub(item_entry):
+            continue
+        _LOGGER.debug("Moving item %s into hub %s", item_entry.title, entry.title)
+        if item_entry.state is ConfigEntryState.LOADED:
+            await hass.config_entries.async_unload(item_id)
+        absorbed_entries.append(item_id)
+    return absorbed_entries
+
+
+def _async_remove_stale_devices(
+    hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
+) -> None:
+    """Remove devices of items that have been removed from the hub."""
+    device_registry = dr.async_get(hass)
+    # The hub itself is a device as well
+    device_ids = {*entry.runtime_data.coordinator.items, entry.entry_id}
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        if not any(
+            domain == DOMAIN and device_id in device_ids
+            for domain, device_id in device.identifiers
+        ):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+            for domain, item_id in device.identifiers:
+                if domain == DOMAIN:
+                    async_get_ledger(hass).async_remove(item_id)
+                    async_get_dose_scheduler(hass).async_forget(item_id)
+                    async_get_snapshot(hass).async_forget(item_id)
+
+
 async def async_unload_entry(
     hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
 ) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        await entry.runtime_data.coordinator.async_shutdown()
+        hass.data[DOMAIN].pop(entry.entry_id)
+    return unload_ok
 
 
 async def async_reload_entry(
     hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
 ) -> None:
-    """Reload config entry when options change."""
+    """Apply changed options in place, reload if the entities change."""
+    if entry.runtime_data.coordinator.async_apply_config():
+        return
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(
+    hass: core.HomeAssistant, entry: InventoryManagerConfigEntry
+) -> None:
+    """Remove stored data of the items of a removed config entry."""
+    # Items moved into a hub keep their data
+    owned = {
+        item_id
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        for item_id in coordinator.items
+    }
+    for item_id in item_configs(entry):
+        if item_id not in owned:
+            async_get_ledger(hass).async_remove(item_id)
+            async_get_dose_scheduler(hass).async_forget(item_id)
+            async_get_snapshot(hass).async_forget(item_id)
@@ -0,0 +1,108 @@
+"""Aggregates over all items of a config entry, maintained incrementally."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Any
+
+from .const import NO_CONSUMPTION_DAYS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date, datetime
+
+    from .coordinator import InventoryManagerItem
+
+
+class _Earliest:
+    """
+    Track the item with the earliest value.
+
+    Updating an item pushes a new heap entry, outdated entries are skipped
+    when they come up, so no update needs to scan all items.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[Any, int, InventoryManagerItem]] = []
+        self._values: dict[InventoryManagerItem, Any] = {}
+        self._counter = itertools.count()
+
+    def first(self) -> tuple[Any, InventoryManagerItem] | None:
+        """Return the earliest value and its item."""
+        while self._heap:
+            value, _, item = self._heap[0]
+            if self._values.get(item) == value:
+                return value, item
+            heapq.heappop(self._heap)
+        return None
+
+    def update(self, item: InventoryManagerItem, value: Any) -> None:
+        """Set the value of an item, or remove the item if None."""
+        if value is None:
+            self._values.pop(item, None)
+        elif self._values.get(item) != value:
+            self._values[item] = value
+            heapq.heappush(self._heap, (value, next(self._counter), item))
+
+    def compact(self) -> None:
+        """Drop outdated entries once they make up most of the heap."""
+        if len(self._heap) > 2 * len(self._values) + 16:
+            self._heap = [
+                (value, next(self._counter), item)
+                for item, value in self._values.items()
+            ]
+            heapq.heapify(self._heap)
+
+
+class InventoryManagerAggregate:
+    """
+    Track the items in warning, the item running out first and the lot expiring first.
+
+    Items are updated one by one when they change. Items in warning are
+    kept in a set, predicted empty times and lot expiry dates in heaps.
+    """
+
+    def __init__(self) -> None:
+        """Create new, empty aggregates."""
+        self._warning: set[InventoryManagerItem] = set()
+        self._empty_at = _Earliest()
+        self._expiry = _Earliest()
+
+    @property
+    def warning_count(self) -> int:
+        """Return the number of items in warning."""
+        return len(self._warning)
+
+    def next_empty(self) -> tuple[datetime, InventoryManagerItem] | None:
+        """Return the earliest predicted empty time and its item."""
+        return self._empty_at.first()
+
+    def next_expiry(self) -> tuple[tuple[date, float], InventoryManagerItem] | None:
+        """Return expiry date and amount of the lot expiring first, and its item."""
+        return self._expiry.first()
+
+    def update(self, items: Iterable[InventoryManagerItem]) -> bool:
+        """Take over the state of items, return whether the aggregates changed."""
+        before = (len(self._warning), self.next_empty(), self.next_expiry())
+        for item in items:
+            if item.is_warning():
+                self._warning.add(item)
+            else:
+                self._warning.discard(item)
+
+            # Items that are not consumed never run out
+            self._empty_at.update(
+                item,
+                item.predicted_empty_at()
+                if item.days_remaining() < NO_CONSUMPTION_DAYS
+                else None,
+            )
+
+            self._expiry.update(
+                item, item.lots.earliest() if item.lots is not None else None
+            )
+
+        self._empty_at.compact()
+        self._expiry.compact()
+        return (len(self._warning), self.next_empty(), self.next_expiry()) != before
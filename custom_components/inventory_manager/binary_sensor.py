@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from homeassistant.components.binary_sensor import (
@@ -10,24 +11,19 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
     BinarySensorEntityDescription,
 )
-from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.const import STATE_UNAVAILABLE, Platform
 from homeassistant.helpers import entity_platform
 
 from .const import (
-    CONF_SENSOR_BEFORE_EMPTY,
-    ENTITY_ID,
     STRING_PROBLEM_ENTITY,
-    UNIQUE_ID,
 )
 from .entity import InventoryManagerEntity, InventoryManagerEntityType
 
 if TYPE_CHECKING:
     from homeassistant import core
 
-    from .coordinator import (
-        InventoryManagerConfigEntry,
-        InventoryManagerItem,
-    )
+    from .coordinator import InventoryManagerItem
+    from .data import InventoryManagerConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,58 +43,70 @@ async def async_setup_entry(
     async_add_entities: entity_platform.AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
+    entity_ids = config_entry.runtime_data.coordinator.async_allocate_entity_ids(
+        Platform.BINARY_SENSOR, [InventoryManagerEntityType.WARNING]
+    )
     async_add_entities(
         [
-            WarnSensor(config_entry.runtime_data.coordinator, description)
+            WarnSensor(
+                item,
+                description,
+                entity_ids[item.item_id, InventoryManagerEntityType.WARNING],
+            )
+            for item in config_entry.runtime_data.coordinator.items.values()
             for description in SENSOR_TYPES
         ],
-        update_before_add=True,
+        update_before_add=False,
     )
 
 
 class WarnSensor(InventoryManagerEntity, BinarySensorEntity):
     """Represents a warning entity."""
 
+    entity_type = InventoryManagerEntityType.WARNING
+
     _attr_has_entity_name = True
+    _attr_should_poll = False
 
     def __init__(
-        self, item: InventoryManagerItem, description: BinarySensorEntityDescription
+        self,
+        item: InventoryManagerItem,
+        description: BinarySensorEntityDescription,
+        entity_id: str,
     ) -> None:
         """Create a new object."""
-        super().__init__(item)
+        super().__init__(item, entity_id)
         self.entity_description = description
 
         _LOGGER.debug("Initializing WarnSensor")
-        self.coordinator.entity[InventoryManagerEntityType.WARNING] = self
         self.platform = entity_platform.async_get_current_platform()
 
-        self._attr_should_poll = False
-        self._attr_unique_id = self.coordinator.entity_config[
-            InventoryManagerEntityType.WARNING
-        ][UNIQUE_ID]
-
         self._attr_available = False
         self._attr_is_on = False
-        self.entity_id = item.entity_config[InventoryManagerEntityType.WARNING][
-            ENTITY_ID
-        ]
 
     async def async_added_to_hass(self) -> None:
-        """Call update to get initial state after entity is added."""
+        """Calculate the initial state, which is written once the entity is added."""
         await super().async_added_to_hass()
-        self.update()
+        self._calculate()
 
     def update(self) -> None:
         """Update the state of the entity."""
         _LOGGER.debug("Updating binary sensor")
+        start = time.perf_counter_ns()
+        if self._calculate():
+            self.coordinator.schedule_write(self)
+        else:
+            self.coordinator.stats.count(self.item.item_id, "writes_suppressed")
+        self.coordinator.stats.time("binary_sensor_update", start)
 
-        days_remaining = self.coordinator.days_remaining()
+    def _calculate(self) -> bool:
+        """Calculate the state, return whether it changed."""
+        previous = (self._attr_available, self._attr_is_on)
+        days_remaining = self.item.days_remaining()
         if days_remaining == STATE_UNAVAILABLE:
             self._attr_is_on = False
             self._attr_available = False
         else:
             self._attr_available = True
-            self._attr_is_on = days_remaining < self.coordinator.config_entry.data.get(
-                CONF_SENSOR_BEFORE_EMPTY, 0
-            )
-        self.schedule_update_ha_state()
+            self._attr_is_on = self.item.is_warning()
+        return (self._attr_available, self._attr_is_on) != previous
@@ -1,6 +1,7 @@
 """Config flow for inventory manager."""
 
 import logging
+import uuid
 from typing import Any
 
 import homeassistant.helpers.config_validation as cv
@@ -11,28 +12,194 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     OptionsFlow,
 )
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+    TimeSelector,
+)
 
 from .const import (
+    CONF_AUTO_CONSUME,
+    CONF_ENTRY_TYPE,
+    CONF_EVENING_TIME,
+    CONF_FORECAST,
+    CONF_HUB_NAME,
+    CONF_IMPORT_ENTRIES,
+    CONF_ITEM,
     CONF_ITEM_AGENT,
+    CONF_ITEM_DATA,
     CONF_ITEM_MAX_CONSUMPTION,
     CONF_ITEM_NAME,
     CONF_ITEM_SIZE,
+    CONF_ITEM_TITLE,
     CONF_ITEM_UNIT,
     CONF_ITEM_VENDOR,
+    CONF_ITEMS,
+    CONF_LEAD_TIME,
+    CONF_LEARN_CONSUMPTION,
+    CONF_MORNING_TIME,
+    CONF_NIGHT_TIME,
+    CONF_NOON_TIME,
+    CONF_PREDICTION_RESOLUTION,
     CONF_SENSOR_BEFORE_EMPTY,
+    CONF_SERVICE_LEVEL,
+    CONF_TRIGGER_AMOUNT,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_MODE,
+    DEFAULT_EVENING_TIME,
+    DEFAULT_LEAD_TIME,
+    DEFAULT_MORNING_TIME,
+    DEFAULT_NIGHT_TIME,
+    DEFAULT_NOON_TIME,
+    DEFAULT_PREDICTION_RESOLUTION,
+    DEFAULT_SERVICE_LEVEL,
     DOMAIN,
+    ENTRY_TYPE_HUB,
+    TRIGGER_MODE_INCREMENT,
+    TRIGGER_MODES,
 )
+from .coordinator import build_entry_title, build_item, is_hub
+from .planner import SERVICE_LEVEL
 
 _LOGGER = logging.getLogger(__name__)
 
+TRIGGER_MODE_SELECTOR = SelectSelector(
+    SelectSelectorConfig(
+        options=TRIGGER_MODES,
+        mode=SelectSelectorMode.DROPDOWN,
+        translation_key=CONF_TRIGGER_MODE,
+    )
+)
+
+
+def _item_entries(hass: HomeAssistant) -> dict[str, str]:
+    """Return entry ids and titles of all single item entries."""
+    return {
+        entry.entry_id: entry.title
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if not is_hub(entry)
+    }
+
+
+def _import_item_entries(hass: HomeAssistant, entry_ids: list[str]) -> dict[str, Any]:
+    """
+    Build hub items from single item entries.
+
+    Imported items keep the entry id as item id and the entry title, such that
+    the hub takes over their devices and entities and removes the old entries.
+    """
+    items = {}
+    for entry_id in entry_ids:
+        item_entry = hass.config_entries.async_get_entry(entry_id)
+        items[entry_id] = {
+            CONF_ITEM_TITLE: item_entry.title,
+            CONF_ITEM_DATA: dict(item_entry.data),
+        }
+    return items
+
+
+def _merge_options(
+    current_data: dict[str, Any], user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Merge changed options into the data of an item."""
+    data = {**current_data, **user_input}
+    # A cleared entity selector is left out of the input
+    if CONF_TRIGGER_ENTITY not in user_input:
+        data.pop(CONF_TRIGGER_ENTITY, None)
+    return data
 
-def _build_entry_title(data: dict[str, Any]) -> str:
-    """Build entry title from configuration data."""
-    title = data.get(CONF_ITEM_NAME, "")
-    if data.get(CONF_ITEM_SIZE):
-        title += " " + str(data[CONF_ITEM_SIZE])
-    return title
+
+def _build_options_schema(current_data: dict[str, Any]) -> vol.Schema:
+    """Build the options schema with current values as defaults."""
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_ITEM_NAME,
+                default=current_data.get(CONF_ITEM_NAME, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_ITEM_SIZE,
+                default=current_data.get(CONF_ITEM_SIZE),
+            ): cv.positive_int,
+            vol.Required(
+                CONF_ITEM_UNIT,
+                default=current_data.get(CONF_ITEM_UNIT, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_ITEM_AGENT,
+                default=current_data.get(CONF_ITEM_AGENT, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_ITEM_VENDOR,
+                default=current_data.get(CONF_ITEM_VENDOR, ""),
+            ): cv.string,
+            vol.Optional(
+                CONF_ITEM_MAX_CONSUMPTION,
+                default=current_data.get(CONF_ITEM_MAX_CONSUMPTION, 5.0),
+            ): cv.positive_float,
+            vol.Required(
+                CONF_SENSOR_BEFORE_EMPTY,
+                default=current_data.get(CONF_SENSOR_BEFORE_EMPTY, 10),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_LEAD_TIME,
+                default=current_data.get(CONF_LEAD_TIME, DEFAULT_LEAD_TIME),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_SERVICE_LEVEL,
+                default=current_data.get(CONF_SERVICE_LEVEL, DEFAULT_SERVICE_LEVEL),
+            ): SERVICE_LEVEL,
+            vol.Optional(
+                CONF_PREDICTION_RESOLUTION,
+                default=current_data.get(
+                    CONF_PREDICTION_RESOLUTION, DEFAULT_PREDICTION_RESOLUTION
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_LEARN_CONSUMPTION,
+                default=current_data.get(CONF_LEARN_CONSUMPTION, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_FORECAST,
+                default=current_data.get(CONF_FORECAST, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_AUTO_CONSUME,
+                default=current_data.get(CONF_AUTO_CONSUME, False),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_MORNING_TIME,
+                default=current_data.get(CONF_MORNING_TIME, DEFAULT_MORNING_TIME),
+            ): TimeSelector(),
+            vol.Optional(
+                CONF_NOON_TIME,
+                default=current_data.get(CONF_NOON_TIME, DEFAULT_NOON_TIME),
+            ): TimeSelector(),
+            vol.Optional(
+                CONF_EVENING_TIME,
+                default=current_data.get(CONF_EVENING_TIME, DEFAULT_EVENING_TIME),
+            ): TimeSelector(),
+            vol.Optional(
+                CONF_NIGHT_TIME,
+                default=current_data.get(CONF_NIGHT_TIME, DEFAULT_NIGHT_TIME),
+            ): TimeSelector(),
+            vol.Optional(
+                CONF_TRIGGER_ENTITY,
+                description={"suggested_value": current_data.get(CONF_TRIGGER_ENTITY)},
+            ): EntitySelector(),
+            vol.Optional(
+                CONF_TRIGGER_MODE,
+                default=current_data.get(CONF_TRIGGER_MODE, TRIGGER_MODE_INCREMENT),
+            ): TRIGGER_MODE_SELECTOR,
+            vol.Optional(
+                CONF_TRIGGER_AMOUNT,
+                default=current_data.get(CONF_TRIGGER_AMOUNT, 1.0),
+            ): cv.positive_float,
+        }
+    )
 
 
 INVENTORY_MANAGER_SCHEMA = vol.Schema(
@@ -40,10 +207,27 @@ INVENTORY_MANAGER_SCHEMA = vol.Schema(
         vol.Required(CONF_ITEM_NAME): cv.string,
         vol.Required(CONF_ITEM_MAX_CONSUMPTION, default=5.0): cv.positive_float,
         vol.Required(CONF_SENSOR_BEFORE_EMPTY, default=10): cv.positive_int,
+        vol.Optional(CONF_LEAD_TIME, default=DEFAULT_LEAD_TIME): cv.positive_int,
+        vol.Optional(CONF_SERVICE_LEVEL, default=DEFAULT_SERVICE_LEVEL): SERVICE_LEVEL,
+        vol.Optional(
+            CONF_PREDICTION_RESOLUTION, default=DEFAULT_PREDICTION_RESOLUTION
+        ): cv.positive_int,
         vol.Optional(CONF_ITEM_SIZE): cv.positive_int,
         vol.Optional(CONF_ITEM_UNIT): cv.string,
         vol.Optional(CONF_ITEM_AGENT): cv.string,
         vol.Optional(CONF_ITEM_VENDOR): cv.string,
+        vol.Optional(CONF_LEARN_CONSUMPTION, default=False): cv.boolean,
+        vol.Optional(CONF_FORECAST, default=False): cv.boolean,
+        vol.Optional(CONF_AUTO_CONSUME, default=False): cv.boolean,
+        vol.Optional(CONF_MORNING_TIME, default=DEFAULT_MORNING_TIME): TimeSelector(),
+        vol.Optional(CONF_NOON_TIME, default=DEFAULT_NOON_TIME): TimeSelector(),
+        vol.Optional(CONF_EVENING_TIME, default=DEFAULT_EVENING_TIME): TimeSelector(),
+        vol.Optional(CONF_NIGHT_TIME, default=DEFAULT_NIGHT_TIME): TimeSelector(),
+        vol.Optional(CONF_TRIGGER_ENTITY): EntitySelector(),
+        vol.Optional(
+            CONF_TRIGGER_MODE, default=TRIGGER_MODE_INCREMENT
+        ): TRIGGER_MODE_SELECTOR,
+        vol.Optional(CONF_TRIGGER_AMOUNT, default=1.0): cv.positive_float,
     }
 )
 
@@ -59,27 +243,60 @@ class InventoryConfigFlow(ConfigFlow, domain=DOMAIN):
     @staticmethod
     @callback
     def async_get_options_flow(
-        _config_entry: ConfigEntry,
+        config_entry: ConfigEntry,
     ) -> OptionsFlow:
         """Get the options flow for this handler."""
+        if is_hub(config_entry):
+            return HubOptionsFlowHandler()
         return InventoryOptionsFlowHandler()
 
     async def async_step_user(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user choose between a single item and a hub."""
+        return self.async_show_menu(step_id="user", menu_options=["item", "hub"])
+
+    async def async_step_item(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
-        """Handle user step to configure the integration."""
+        """Handle step to configure a single item."""
         errors: dict[str, str] = {}
         if user_input is not None:
             # Input is valid, set data.
             self.data = user_input
             # Return the form of the next step.
             return self.async_create_entry(
-                title=_build_entry_title(self.data),
+                title=build_entry_title(self.data),
                 data=self.data,
             )
 
         return self.async_show_form(
-            step_id="user", data_schema=INVENTORY_MANAGER_SCHEMA, errors=errors
+            step_id="item", data_schema=INVENTORY_MANAGER_SCHEMA, errors=errors
+        )
+
+    async def async_step_hub(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle step to configure a hub, optionally importing existing items."""
+        if user_input is not None:
+            items = _import_item_entries(
+                self.hass, user_input.get(CONF_IMPORT_ENTRIES, [])
+            )
+            return self.async_create_entry(
+                title=user_input[CONF_HUB_NAME],
+                data={CONF_ENTRY_TYPE: ENTRY_TYPE_HUB, CONF_ITEMS: items},
+            )
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HUB_NAME): cv.string,
+                    vol.Optional(CONF_IMPORT_ENTRIES, default=[]): cv.multi_select(
+                        _item_entries(self.hass)
+                    ),
+                }
+            ),
         )
 
 
@@ -94,8 +311,8 @@ class InventoryOptionsFlowHandler(OptionsFlow):
             # Update config entry with new data (merging with existing)
             self.hass.config_entries.async_update_entry(
                 self.config_entry,
-                title=_build_entry_title(user_input),
-                data={**self.config_entry.data, **user_input},
+                title=build_entry_title(user_input),
+                data=_merge_options(self.config_entry.data, user_input),
             )
             # Return empty entry to signal completion (data is already saved above)
             return self.async_create_entry(title="", data={})
@@ -104,38 +321,7 @@ class InventoryOptionsFlowHandler(OptionsFlow):
         current_data = self.config_entry.data
 
         # Create schema with current values as defaults
-        options_schema = vol.Schema(
-            {
-                vol.Required(
-                    CONF_ITEM_NAME,
-                    default=current_data.get(CONF_ITEM_NAME, ""),
-                ): cv.string,
-                vol.Optional(
-                    CONF_ITEM_SIZE,
-                    default=current_data.get(CONF_ITEM_SIZE),
-                ): cv.positive_int,
-                vol.Required(
-                    CONF_ITEM_UNIT,
-                    default=current_data.get(CONF_ITEM_UNIT, ""),
-                ): cv.string,
-                vol.Optional(
-                    CONF_ITEM_AGENT,
-                    default=current_data.get(CONF_ITEM_AGENT, ""),
-                ): cv.string,
-                vol.Optional(
-                    CONF_ITEM_VENDOR,
-                    default=current_data.get(CONF_ITEM_VENDOR, ""),
-                ): cv.string,
-                vol.Optional(
-                    CONF_ITEM_MAX_CONSUMPTION,
-                    default=current_data.get(CONF_ITEM_MAX_CONSUMPTION, 5.0),
-                ): cv.positive_float,
-                vol.Required(
-                    CONF_SENSOR_BEFORE_EMPTY,
-                    default=current_data.get(CONF_SENSOR_BEFORE_EMPTY, 10),
-                ): cv.positive_int,
-            }
-        )
+        options_schema = _build_options_schema(current_data)
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
@@ -143,3 +329,144 @@ class InventoryOptionsFlowHandler(OptionsFlow):
                 "name": current_data.get(CONF_ITEM_NAME, "Item name")
             },
         )
+
+
+class HubOptionsFlowHandler(OptionsFlow):
+    """Handle options flow for a hub of items."""
+
+    def __init__(self) -> None:
+        """Create a new options flow."""
+        self._item_id: str | None = None
+
+    @property
+    def _items(self) -> dict[str, dict[str, Any]]:
+        return self.config_entry.data.get(CONF_ITEMS, {})
+
+    def _save_items(self, items: dict[str, dict[str, Any]]) -> ConfigFlowResult:
+        """Store the items of the hub, which reloads it."""
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, data={**self.config_entry.data, CONF_ITEMS: items}
+        )
+        return self.async_create_entry(title="", data={})
+
+    async def async_step_init(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Start the options flow of the hub."""
+        return await self.async_step_hub()
+
+    async def async_step_hub(
+        self, _user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user choose what to change."""
+        return self.async_show_menu(
+            step_id="hub",
+            menu_options=["add_item", "edit_item", "remove_item", "import_entries"],
+            description_placeholders={"name": self.config_entry.title},
+        )
+
+    async def async_step_add_item(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add a new item to the hub."""
+        if user_input is not None:
+            return self._save_items(
+                {**self._items, uuid.uuid4().hex: build_item(user_input)}
+            )
+
+        return self.async_show_form(
+            step_id="add_item", data_schema=INVENTORY_MANAGER_SCHEMA
+        )
+
+    async def async_step_edit_item(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Select the item to edit."""
+        if user_input is not None:
+            self._item_id = user_input[CONF_ITEM]
+            return await self.async_step_item_options()
+
+        return self.async_show_form(
+            step_id="edit_item",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ITEM): vol.In(
+                        {
+                            item_id: item[CONF_ITEM_TITLE]
+                            for item_id, item in self._items.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+    async def async_step_item_options(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options of the selected item."""
+        current_data = self._items[self._item_id][CONF_ITEM_DATA]
+        if user_input is not None:
+            return self._save_items(
+                {
+                    **self._items,
+                    self._item_id: build_item(_merge_options(current_data, user_input)),
+                }
+            )
+
+        return self.async_show_form(
+            step_id="item_options",
+            data_schema=_build_options_schema(current_data),
+            description_placeholders={
+                "name": current_data.get(CONF_ITEM_NAME, "Item name")
+            },
+        )
+
+    async def async_step_remove_item(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Remove items from the hub."""
+        if user_input is not None:
+            return self._save_items(
+                {
+                    item_id: item
+                    for item_id, item in self._items.items()
+                    if item_id not in user_input[CONF_ITEMS]
+                }
+            )
+
+        return self.async_show_form(
+            step_id="remove_item",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ITEMS, default=[]): cv.multi_select(
+                        {
+                            item_id: item[CONF_ITEM_TITLE]
+                            for item_id, item in self._items.items()
+                        }
+                    )
+                }
+            ),
+        )
+
+    async def async_step_import_entries(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Move existing single item entries into the hub."""
+        if user_input is not None:
+            return self._save_items(
+                {
+                    **self._items,
+                    **_import_item_entries(self.hass, user_input[CONF_IMPORT_ENTRIES]),
+                }
+            )
+
+        return self.async_show_form(
+            step_id="import_entries",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_IMPORT_ENTRIES, default=[]): cv.multi_select(
+                        _item_entries(self.hass)
+                    ),
+                }
+            ),
+        )
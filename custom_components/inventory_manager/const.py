@@ -2,6 +2,13 @@
 
 DOMAIN = "inventory_manager"
 
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+DATA_LEDGER = f"{DOMAIN}_ledger"
+DATA_DOSES = f"{DOMAIN}_doses"
+DATA_SNAPSHOT = f"{DOMAIN}_snapshot"
+DATA_TRIGGERS = f"{DOMAIN}_triggers"
+DATA_FORECASTER = f"{DOMAIN}_forecaster"
+
 SPACE = " "
 
 CONF_ITEM_NAME = "item_name"
@@ -9,19 +16,87 @@ CONF_ITEM_SIZE = "item_size"
 CONF_ITEM_VENDOR = "item_vendor"
 CONF_ITEM_MAX_CONSUMPTION = "item_max_consumption"
 CONF_SENSOR_BEFORE_EMPTY = "warning_days_before_empty"
+CONF_LEAD_TIME = "lead_time_days"
+CONF_SERVICE_LEVEL = "service_level"
+CONF_PREDICTION_RESOLUTION = "prediction_resolution"
 CONF_ITEM_AGENT = "item_agent"
 CONF_ITEM_UNIT = "item_unit"
+CONF_LEARN_CONSUMPTION = "learn_consumption"
+CONF_FORECAST = "forecast"
+CONF_AUTO_CONSUME = "auto_consume"
+CONF_MORNING_TIME = "morning_time"
+CONF_NOON_TIME = "noon_time"
+CONF_EVENING_TIME = "evening_time"
+CONF_NIGHT_TIME = "night_time"
+
+CONF_TRIGGER_ENTITY = "trigger_entity"
+CONF_TRIGGER_MODE = "trigger_mode"
+CONF_TRIGGER_AMOUNT = "trigger_amount"
+
+TRIGGER_MODE_INCREMENT = "increment"
+TRIGGER_MODE_ON = "on"
+TRIGGER_MODES = [TRIGGER_MODE_INCREMENT, TRIGGER_MODE_ON]
+
+DEFAULT_MORNING_TIME = "08:00:00"
+DEFAULT_NOON_TIME = "12:00:00"
+DEFAULT_EVENING_TIME = "18:00:00"
+DEFAULT_NIGHT_TIME = "22:00:00"
+
+# No lead time, and supply lasting the lead time in 95 percent of all cases
+DEFAULT_LEAD_TIME = 0
+DEFAULT_SERVICE_LEVEL = 95.0
+DEFAULT_COVER_DAYS = 30
+
+# Minutes the predicted empty time has to move before it is shown
+DEFAULT_PREDICTION_RESOLUTION = 60
+
+CONF_ENTRY_TYPE = "entry_type"
+CONF_HUB_NAME = "hub_name"
+CONF_ITEMS = "items"
+CONF_ITEM_TITLE = "title"
+CONF_ITEM_DATA = "data"
+CONF_IMPORT_ENTRIES = "import_entries"
+CONF_ITEM = "item"
+
+ENTRY_TYPE_ITEM = "item"
+ENTRY_TYPE_HUB = "hub"
 
 UNIT_PCS = "pcs."
 
+# Days remaining of items that are not consumed
+NO_CONSUMPTION_DAYS = 10000
+
 ATTR_DAILY = "daily"
+ATTR_ITEM = "item"
 ATTR_DAYS_REMAINING = "days_remaining"
+ATTR_FORECAST = "forecast"
+ATTR_SUPPLY = "supply"
+ATTR_ITEMS = "items"
+ATTR_AMOUNT = "amount"
+ATTR_EXPIRY = "expiry"
+ATTR_EMPTY_AT = "empty_at"
+ATTR_VENDOR = "vendor"
+ATTR_ORDERS = "orders"
+ATTR_REORDER_POINT = "reorder_point"
+ATTR_QUANTITY = "quantity"
+ATTR_PACKAGES = "packages"
+
+EVENT_LOT_EXPIRED = f"{DOMAIN}_lot_expired"
 
 SERVICE_CONSUME = "consume"
 SERVICE_STORE = "store"
+SERVICE_BATCH = "batch"
+SERVICE_IMPORT_ITEMS = "import_items"
+SERVICE_EXPORT_ITEMS = "export_items"
+SERVICE_QUERY = "query"
+SERVICE_PLAN_ORDERS = "plan_orders"
 
 STRING_PROBLEM_ENTITY = "problem_entity"
 STRING_SENSOR_ENTITY = "sensor_entity"
+STRING_WARNING_COUNT_ENTITY = "warning_count_entity"
+STRING_NEXT_EMPTY_ENTITY = "next_empty_entity"
+STRING_EXPIRES_SOONEST_ENTITY = "expires_soonest_entity"
+STRING_DEBUG_ENTITY = "debug_entity"
 
 STRING_SUPPLY_ENTITY = "supply_entity"
 STRING_MORNING_ENTITY = "morning_entity"
@@ -34,6 +109,18 @@ STRING_MONTH_ENTITY = "month_entity"
 SERVICE_AMOUNT = "amount"
 SERVICE_PREDEFINED_AMOUNT = "predefined-amount"
 SERVICE_AMOUNT_SPECIFICATION = "amount-specification"
+SERVICE_OPERATIONS = "operations"
+SERVICE_ITEM = "item"
+SERVICE_ACTION = "action"
+SERVICE_EXPIRY = "expiry"
+SERVICE_FILE = "file"
+SERVICE_FORMAT = "format"
+SERVICE_CONFIG_ENTRY = "config_entry_id"
+SERVICE_VENDOR = "vendor"
+SERVICE_AGENT = "agent"
+SERVICE_UNIT = "unit"
+SERVICE_DAYS_REMAINING_BELOW = "days_remaining_below"
+SERVICE_COVER_DAYS = "cover_days"
 
 NATIVE_VALUE = "native_value"
 UNIQUE_ID = "unique_id"
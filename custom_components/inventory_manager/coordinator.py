@@ -1,71 +1,486 @@
 """Coordinator for Inventory Manager integration."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
-import uuid
-from typing import Any
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify as ha_slugify
 from slugify import slugify
 
+from .aggregate import InventoryManagerAggregate
 from .const import (
-    ENTITY_ID,
-    ENTITY_TYPE,
+    CONF_ENTRY_TYPE,
+    CONF_FORECAST,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_SIZE,
+    CONF_ITEM_TITLE,
+    CONF_ITEM_UNIT,
+    CONF_ITEM_VENDOR,
+    CONF_ITEMS,
+    CONF_LEAD_TIME,
+    CONF_LEARN_CONSUMPTION,
+    CONF_PREDICTION_RESOLUTION,
+    CONF_SENSOR_BEFORE_EMPTY,
+    CONF_SERVICE_LEVEL,
+    DEFAULT_LEAD_TIME,
+    DEFAULT_PREDICTION_RESOLUTION,
+    DEFAULT_SERVICE_LEVEL,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+    NO_CONSUMPTION_DAYS,
     SPACE,
-    UNIQUE_ID,
 )
-from .data import InventoryManagerConfigEntry
-from .entity import InventoryManagerEntityType
+from .doses import DOSE_OPTIONS, async_get_dose_scheduler
+from .entity import ENTITY_INDEX, NUMBER_INDEX, InventoryManagerEntityType
+from .forecast import async_get_forecaster
+from .index import INDEX_OPTIONS, InventoryManagerIndex
+from .ledger import LedgerEventKind, async_get_ledger
+from .lots import InventoryManagerLots
+from .planner import reorder_point
+from .scheduler import async_get_scheduler
+from .snapshot import async_get_snapshot
+from .stats import InventoryManagerStats
+from .triggers import TRIGGER_OPTIONS, async_get_triggers
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity import Entity
+
+    from .data import InventoryManagerConfigEntry
+    from .forecast import ForecastInputs
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class InventoryManagerItem(DataUpdateCoordinator):
-    """The class represents the item data itself."""
+def is_hub(config_entry: ConfigEntry) -> bool:
+    """Return whether the config entry hosts a collection of items."""
+    return config_entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_HUB
+
+
+def item_configs(
+    config_entry: ConfigEntry,
+) -> dict[str, tuple[str, Mapping[str, Any]]]:
+    """
+    Return title and configuration of all items hosted by a config entry.
+
+    A single item entry hosts exactly one item, which is identified by the
+    entry id. A hub entry hosts all items stored in its data.
+    """
+    if is_hub(config_entry):
+        return {
+            item_id: (item[CONF_ITEM_TITLE], item[CONF_ITEM_DATA])
+            for item_id, item in config_entry.data.get(CONF_ITEMS, {}).items()
+        }
+    return {config_entry.entry_id: (config_entry.title, config_entry.data)}
+
+
+def build_entry_title(data: Mapping[str, Any]) -> str:
+    """Build entry title from configuration data."""
+    title = data.get(CONF_ITEM_NAME, "")
+    if data.get(CONF_ITEM_SIZE):
+        title += " " + str(data[CONF_ITEM_SIZE])
+    return title
+
+
+def build_item(data: Mapping[str, Any]) -> dict[str, Any]:
+    """Build the representation of an item stored in a hub."""
+    return {CONF_ITEM_TITLE: build_entry_title(data), CONF_ITEM_DATA: data}
+
+
+def anchor(
+    previous: datetime | None, value: datetime, resolution: timedelta
+) -> datetime:
+    """Return the previous moment, unless the value moved away by the resolution."""
+    if previous is None or abs(value - previous) >= resolution:
+        return value
+    return previous
+
+
+class InventoryManagerCoordinator(DataUpdateCoordinator):
+    """The class coordinates all items of one config entry."""
 
     def __init__(
         self, config_entry: InventoryManagerConfigEntry, *args: Any, **kwargs: Any
     ) -> None:
         """
-        Create a new item coordinator.
+        Create a new coordinator.
 
         Args:
-            config_entry: The configuration entry for this item.
+            config_entry: The configuration entry hosting the items.
             *args: Additional positional arguments passed to DataUpdateCoordinator.
             **kwargs: Additional keyword arguments passed to DataUpdateCoordinator.
 
         """
         super().__init__(*args, **kwargs)
-        self._numbers = {}
         self.config_entry = config_entry
+        self.scheduler = async_get_scheduler(self.hass)
+        self.ledger = async_get_ledger(self.hass)
+        self.doses = async_get_dose_scheduler(self.hass)
+        self.snapshot = async_get_snapshot(self.hass)
+        self.triggers = async_get_triggers(self.hass)
+        self.forecaster = async_get_forecaster(self.hass)
+
+        # Changes are collected and flushed once per event loop iteration
+        self._flush_pending = False
+        self._dirty_items: set[InventoryManagerItem] = set()
+        self._dirty_entities: dict[Entity, None] = {}
+        self.writes_requested = 0
+        self.writes_flushed = 0
+        self.stats = InventoryManagerStats()
 
-        self.entity = {}
-        self.entity_config = {
-            entity_type: self._generate_entity_config(entity_type)
-            for entity_type in InventoryManagerEntityType
+        self.items: dict[str, InventoryManagerItem] = {
+            item_id: InventoryManagerItem(self, item_id, title, data)
+            for item_id, (title, data) in item_configs(config_entry).items()
         }
+        start = time.perf_counter()
+        for item in self.items.values():
+            item.restored = self.snapshot.async_restore(item)
+        self.stats.durations["snapshot_restore"] = time.perf_counter() - start
+
+        # Aggregates over all items and the entities showing them
+        self.aggregate = InventoryManagerAggregate()
+        self.aggregate.update(self.items.values())
+        self.aggregate_entities: list[Entity] = []
+
+        # Indexes to look up items by options and days remaining
+        self.index = InventoryManagerIndex()
+        self.index.update(self.items.values())
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
 
-    def _generate_entity_config(self, entity_type: InventoryManagerEntityType) -> dict:
-        if entity_type == InventoryManagerEntityType.EMPTYPREDICTION:
-            fmt = "sensor.{}"
-        elif entity_type == InventoryManagerEntityType.WARNING:
-            fmt = "binary_sensor.{}"
-        else:
-            fmt = "number.{}"
+    async def async_shutdown(self) -> None:
+        """Remove all items from the schedulers and release them."""
+        await super().async_shutdown()
+        self.triggers.async_remove_items(self.items.values())
+        self.doses.async_remove_items(self.items.values())
+        self.scheduler.async_remove(
+            [
+                *self.items.values(),
+                *(item.lots for item in self.items.values() if item.lots is not None),
+            ]
+        )
+        # Changes that have not been flushed yet are kept in the snapshot
+        for item in self._dirty_items:
+            self.snapshot.async_update(item)
+        self._dirty_items.clear()
+        self._dirty_entities.clear()
+        for item in self.items.values():
+            item.release_entities()
+        self.items.clear()
+        self.aggregate_entities.clear()
 
-        # We try to generate a sensible unique id
-        if self.config_entry.entry_id is not None and entity_type.name is not None:
-            unique_id = slugify(self.config_entry.title + SPACE + entity_type.name)
-        else:
-            unique_id = str(uuid.uuid4())
+    @callback
+    def async_apply_config(self) -> bool:
+        """
+        Apply the changed configuration of the config entry to the items.
+
+        Returns False without changing anything if items have been added,
+        removed or renamed, or their device changed, which requires a reload.
+        """
+        configs = item_configs(self.config_entry)
+        if configs.keys() != self.items.keys() or any(
+            title != self.items[item_id].title
+            or data.get(CONF_ITEM_VENDOR)
+            != self.items[item_id].data.get(CONF_ITEM_VENDOR)
+            for item_id, (title, data) in configs.items()
+        ):
+            return False
+
+        for item_id, (_, data) in configs.items():
+            self.items[item_id].async_update_config(data)
+        return True
+
+    @callback
+    def async_allocate_entity_ids(
+        self, domain: str, entity_types: Iterable[InventoryManagerEntityType]
+    ) -> dict[tuple[str, InventoryManagerEntityType], str]:
+        """
+        Allocate the entity ids of the entities of one platform for all items.
+
+        Entities in the registry keep their entity id. New entity ids are
+        checked against the registry, the state machine and the ids allocated
+        in this pass, without copying any of them. Returns the entity ids by
+        item id and entity type.
+        """
+        registry = er.async_get(self.hass)
+        # Entity ids allocated in this pass, which are not registered yet
+        allocated: set[str] = set()
+        entity_ids: dict[tuple[str, InventoryManagerEntityType], str] = {}
+        for item in self.items.values():
+            for entity_type in entity_types:
+                unique_id = item.unique_id(entity_type)
+                entity_id = registry.async_get_entity_id(domain, DOMAIN, unique_id)
+                if entity_id is None:
+                    entity_id = preferred = f"{domain}.{ha_slugify(unique_id)}"
+                    tries = 1
+                    while (
+                        entity_id in allocated
+                        or registry.async_is_registered(entity_id)
+                        or not self.hass.states.async_available(entity_id)
+                    ):
+                        tries += 1
+                        entity_id = f"{preferred}_{tries}"
+                    allocated.add(entity_id)
+                entity_ids[item.item_id, entity_type] = entity_id
+        return entity_ids
+
+    @property
+    def writes_coalesced(self) -> int:
+        """Return the number of state writes saved by coalescing."""
+        return self.writes_requested - self.writes_flushed
+
+    def statistics(self) -> dict[str, Any]:
+        """Return the counters and timings of the config entry."""
         return {
-            UNIQUE_ID: unique_id,
-            ENTITY_ID: generate_entity_id(fmt, unique_id, hass=self.hass),
-            ENTITY_TYPE: entity_type,
+            "items": len(self.items),
+            "writes_requested": self.writes_requested,
+            "writes_flushed": self.writes_flushed,
+            "writes_coalesced": self.writes_coalesced,
+            **self.stats.as_dict(),
+        }
+
+    @callback
+    def mark_dirty(self, item: InventoryManagerItem) -> None:
+        """Mark an item as changed."""
+        self._dirty_items.add(item)
+        self._schedule_flush()
+
+    @callback
+    def schedule_write(self, entity: Entity) -> None:
+        """Write the state of an entity once."""
+        self.writes_requested += 1
+        self._dirty_entities[entity] = None
+        self._schedule_flush()
+
+    async def async_flushed(self) -> None:
+        """
+        Wait for a pending flush, after changing items on the event loop.
+
+        The flush is scheduled before yielding, so it runs first. Calls in
+        parallel still share a flush, but a blocking service call returns with
+        its states written.
+        """
+        if self._flush_pending:
+            await asyncio.sleep(0)
+
+    @callback
+    def _schedule_flush(self) -> None:
+        """Schedule a flush, unless one is pending."""
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Reschedule, snapshot, aggregate and index changed items, write entities."""
+        items, self._dirty_items = self._dirty_items, set()
+        entities, self._dirty_entities = self._dirty_entities, {}
+        self._flush_pending = False
+
+        for item in items:
+            item.async_reschedule()
+            self.snapshot.async_update(item)
+        if items and self.aggregate.update(items):
+            entities.update(dict.fromkeys(self.aggregate_entities))
+        if items:
+            self.index.update(items)
+            self.forecaster.async_request(items)
+        for entity in entities:
+            # Entities that are not added yet write their state when added
+            if entity.hass is not None:
+                self.writes_flushed += 1
+                entity.async_write_ha_state()
+
+
+class InventoryManagerItem:
+    """The class represents the item data itself."""
+
+    __slots__ = (
+        "_daily_consumption",
+        "_days_remaining",
+        "_entities",
+        "_forecast_dates",
+        "_numbers",
+        "_predicted_empty_at",
+        "changed_at",
+        "coordinator",
+        "data",
+        "forecast",
+        "forecast_inputs_used",
+        "hass",
+        "item_id",
+        "lots",
+        "restored",
+        "title",
+    )
+
+    def __init__(
+        self,
+        coordinator: InventoryManagerCoordinator,
+        item_id: str,
+        title: str,
+        data: Mapping[str, Any],
+    ) -> None:
+        """
+        Create a new item.
+
+        Args:
+            coordinator: The coordinator of the config entry hosting the item.
+            item_id: The id of the item, used to identify its device.
+            title: The title of the item, used to derive entity ids.
+            data: The configuration of the item.
+
+        """
+        self.coordinator = coordinator
+        self.hass: HomeAssistant = coordinator.hass
+        self.item_id = item_id
+        self.title = title
+        self.data = data
+        self._numbers = array("d", bytes(8 * len(NUMBER_INDEX)))
+        self.changed_at: datetime = dt_util.utcnow()
+
+        # Whether the numbers have been restored from the snapshot
+        self.restored = False
+
+        # Derived values, None if they need to be recalculated
+        self._daily_consumption: float | None = None
+        self._days_remaining: float | None = None
+
+        # Predictions as last shown, which only move by the prediction resolution
+        self._predicted_empty_at: datetime | None = None
+        self._forecast_dates: list[datetime] | None = None
+
+        self._entities: list[Entity | None] = [None] * len(ENTITY_INDEX)
+
+        # Lots with expiry dates, only created once the first lot is stored
+        self.lots: InventoryManagerLots | None = None
+
+        # Percentiles of the days until empty and the inputs they were forecast from
+        self.forecast: tuple[float, ...] | None = None
+        self.forecast_inputs_used: ForecastInputs | None = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device representing the item."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.item_id)},
+            manufacturer=self.data.get(CONF_ITEM_VENDOR),
+            entry_type=DeviceEntryType.SERVICE,
+            name=self.title,
+        )
+
+    def unique_id(self, entity_type: InventoryManagerEntityType) -> str:
+        """Return the unique id of an entity of the item."""
+        return slugify(self.title + SPACE + entity_type.name)
+
+    def entity(self, entity_type: InventoryManagerEntityType) -> Entity | None:
+        """Return an entity of the item, if it has been created."""
+        return self._entities[ENTITY_INDEX[entity_type]]
+
+    def register_entity(
+        self, entity_type: InventoryManagerEntityType, entity: Entity
+    ) -> None:
+        """Register an entity of the item."""
+        self._entities[ENTITY_INDEX[entity_type]] = entity
+
+    def release_entities(self) -> None:
+        """Drop the references to the entities of the item."""
+        self._entities = [None] * len(ENTITY_INDEX)
+
+    def restore(
+        self,
+        numbers: Mapping[str, float],
+        changed_at: float,
+        lots: list[tuple[str, float]] | None = None,
+    ) -> None:
+        """Restore the numbers and lots without updating any entity."""
+        for name, value in numbers.items():
+            self._numbers[NUMBER_INDEX[InventoryManagerEntityType[name]]] = value
+        self.changed_at = dt_util.utc_from_timestamp(changed_at)
+        if lots:
+            self.lots = InventoryManagerLots(self)
+            self.lots.restore(lots)
+        self._daily_consumption = None
+        self._days_remaining = None
+
+    def as_snapshot(self) -> dict[str, Any]:
+        """Return the numbers and lots in the form stored in the snapshot."""
+        snapshot = {
+            "numbers": {
+                entity_type.name: self._numbers[index]
+                for entity_type, index in NUMBER_INDEX.items()
+            },
+            "changed_at": self.changed_at.timestamp(),
+        }
+        if self.lots:
+            snapshot["lots"] = self.lots.as_list()
+        return snapshot
+
+    @callback
+    def async_update_config(self, data: Mapping[str, Any]) -> None:
+        """Update the configuration and the state depending on changed options."""
+        changed = {
+            key
+            for key in data.keys() | self.data.keys()
+            if data.get(key) != self.data.get(key)
         }
+        self.data = data
+
+        if changed & {CONF_ITEM_UNIT, CONF_ITEM_MAX_CONSUMPTION}:
+            for entity_type in NUMBER_INDEX:
+                entity = self.entity(entity_type)
+                if entity is not None:
+                    entity.update()
+
+        if changed & {
+            CONF_LEARN_CONSUMPTION,
+            CONF_SENSOR_BEFORE_EMPTY,
+            CONF_LEAD_TIME,
+            CONF_SERVICE_LEVEL,
+            CONF_PREDICTION_RESOLUTION,
+        }:
+            if CONF_LEARN_CONSUMPTION in changed:
+                self._daily_consumption = None
+            self._days_remaining = None
+            for entity_type in [
+                InventoryManagerEntityType.EMPTYPREDICTION,
+                InventoryManagerEntityType.WARNING,
+            ]:
+                entity = self.entity(entity_type)
+                if entity is not None:
+                    entity.update()
+            self.coordinator.mark_dirty(self)
+
+        if changed & INDEX_OPTIONS:
+            self.coordinator.mark_dirty(self)
+
+        if CONF_FORECAST in changed:
+            self.set_forecast(None, None)
+            self.coordinator.forecaster.async_request([self])
+
+        if changed & DOSE_OPTIONS:
+            self.coordinator.doses.async_remove_items([self])
+            self.coordinator.doses.async_add_items([self], catch_up=False)
+
+        if changed & TRIGGER_OPTIONS:
+            self.coordinator.triggers.async_remove_items([self])
+            self.coordinator.triggers.async_add_items([self])
 
     def take_dose(self, dose: InventoryManagerEntityType) -> None:
         """Consume one dose."""
@@ -82,47 +497,243 @@ class InventoryManagerItem(DataUpdateCoordinator):
         amount = self.get(dose)
         self.take_number(amount)
 
+    def add_lot(self, expiry: date, amount: float) -> None:
+        """Add a lot to the lots, the supply is changed separately."""
+        if self.lots is None:
+            self.lots = InventoryManagerLots(self)
+        self.lots.add(expiry, amount)
+
+    def draw_lots(self, amount: float) -> None:
+        """Consume from the lots expiring first."""
+        if self.lots:
+            self.lots.draw(amount)
+
+    def store_lot(self, amount: float, expiry: date) -> None:
+        """Store a lot expiring at the given date."""
+        self.add_lot(expiry, amount)
+        self.take_number(-amount)
+
     def take_number(self, number: float) -> None:
-        """Consume specified number."""
+        """Consume specified number, from the lots expiring first."""
+        if number > 0:
+            # Only what is left is consumed and recorded
+            number = min(number, self.get(InventoryManagerEntityType.SUPPLY))
+            self.draw_lots(number)
         if number != 0:
+            self.record(
+                LedgerEventKind.CONSUME if number > 0 else LedgerEventKind.STORE,
+                abs(number),
+            )
             self.set(
                 InventoryManagerEntityType.SUPPLY,
                 self.get(InventoryManagerEntityType.SUPPLY) - number,
             )
 
+    def record(self, kind: LedgerEventKind, value: float) -> None:
+        """Record a change of supply in the ledger."""
+        if self.coordinator.ledger.append(self.item_id, kind, value) and self.data.get(
+            CONF_LEARN_CONSUMPTION, False
+        ):
+            self._daily_consumption = None
+            self._days_remaining = None
+
     def set(self, spec: InventoryManagerEntityType, val: float) -> None:
         """Set one number."""
-        if val < 0:
-            self._numbers[spec] = 0.0
-        else:
-            self._numbers[spec] = val
+        self.coordinator.stats.count(self.item_id, "sets")
+        self._numbers[NUMBER_INDEX[spec]] = max(val, 0.0)
+        self.changed_at = dt_util.utcnow()
+        if spec == InventoryManagerEntityType.SUPPLY and self.lots:
+            self.lots.trim(self._numbers[NUMBER_INDEX[spec]])
+
+        # A new supply keeps the daily consumption, only doses invalidate it
+        self._days_remaining = None
+        if spec != InventoryManagerEntityType.SUPPLY:
+            self._daily_consumption = None
+            self.coordinator.doses.async_dose_changed(self, spec)
 
         for et in [
             InventoryManagerEntityType.EMPTYPREDICTION,
             InventoryManagerEntityType.WARNING,
             InventoryManagerEntityType.SUPPLY,
         ]:
-            if et in self.entity and self.entity[et] is not None:
-                self.entity[et].update()
+            entity = self.entity(et)
+            if entity is not None:
+                entity.update()
             else:
                 _LOGGER.debug(
                     "%s cannot be updated yet", InventoryManagerEntityType(et).name
                 )
+        self.coordinator.mark_dirty(self)
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Schedule the next deadline of the item and the expiry of its lots."""
+        self.coordinator.scheduler.async_schedule(self, self.next_deadline())
+        if self.lots is not None:
+            self.coordinator.scheduler.async_schedule(
+                self.lots, self.lots.next_expiry()
+            )
+
+    @callback
+    def async_deadline_reached(self) -> None:
+        """Update the state that changed because time has passed."""
+        warning = self.entity(InventoryManagerEntityType.WARNING)
+        if warning is not None:
+            warning.update()
+        self.coordinator.mark_dirty(self)
+
+    def next_deadline(self) -> datetime | None:
+        """Return the next moment the derived state changes without input."""
+        if self.daily_consumption() <= 0:
+            return None
+        warning_at = self.warning_at()
+        if warning_at <= dt_util.utcnow():
+            return None
+        return warning_at
 
     def get(self, entity_type: InventoryManagerEntityType) -> float:
         """Get number."""
-        return self._numbers.setdefault(entity_type, 0)
+        index = NUMBER_INDEX.get(entity_type)
+        return self._numbers[index] if index is not None else 0.0
 
     def days_remaining(self) -> float:
-        """Calculate days remaining."""
-        supply = self.get(InventoryManagerEntityType.SUPPLY)
+        """Return days remaining."""
+        if self._days_remaining is None:
+            start = time.perf_counter_ns()
+            supply = self.get(InventoryManagerEntityType.SUPPLY)
+            daily = self.daily_consumption()
+            self._days_remaining = supply / daily if daily > 0 else NO_CONSUMPTION_DAYS
+            self.coordinator.stats.time("days_remaining", start)
+        return self._days_remaining
+
+    def empty_at(self) -> datetime:
+        """Calculate the moment the supply is expected to be empty."""
+        return self.changed_at + timedelta(days=self.days_remaining())
+
+    def reorder_point(self) -> float:
+        """Return the supply at which the item needs to be reordered."""
+        return reorder_point(
+            self.daily_consumption(),
+            self.daily_variance(),
+            self.data.get(CONF_LEAD_TIME, DEFAULT_LEAD_TIME),
+            self.data.get(CONF_SERVICE_LEVEL, DEFAULT_SERVICE_LEVEL),
+        )
+
+    def prediction_resolution(self) -> timedelta:
+        """Return how far predictions have to move before they are shown."""
+        return timedelta(
+            minutes=self.data.get(
+                CONF_PREDICTION_RESOLUTION, DEFAULT_PREDICTION_RESOLUTION
+            )
+        )
+
+    def predicted_empty_at(self) -> datetime:
+        """
+        Return the moment the supply is expected to be empty, as shown.
+
+        The shown prediction stays anchored until the prediction moves by
+        the prediction resolution, such that consuming about as predicted
+        does not change the state.
+        """
+        self._predicted_empty_at = anchor(
+            self._predicted_empty_at, self.empty_at(), self.prediction_resolution()
+        )
+        return self._predicted_empty_at
+
+    def warning_at(self) -> datetime:
+        """
+        Calculate the moment the supply is expected to run low.
+
+        That is the configured days before empty, or when the supply reaches
+        the reorder point if that comes first.
+        """
+        warning_at = self.empty_at() - timedelta(
+            days=self.data.get(CONF_SENSOR_BEFORE_EMPTY, 0)
+        )
+        daily = self.daily_consumption()
+        point = self.reorder_point()
+        if point > 0 and daily > 0:
+            warning_at = min(
+                warning_at,
+                self.changed_at
+                + timedelta(
+                    days=(self.get(InventoryManagerEntityType.SUPPLY) - point) / daily
+                ),
+            )
+        return warning_at
+
+    def is_warning(self) -> bool:
+        """Return whether the supply is expected to run low by now."""
+        return dt_util.utcnow() >= self.warning_at()
+
+    def daily_variance(self) -> float:
+        """
+        Return the variance of the daily consumption.
+
+        Learned consumption comes with its variance. Configured weekly and
+        monthly doses vary, because they are consumed on one day only.
+        """
+        if self.data.get(CONF_LEARN_CONSUMPTION, False):
+            rate = self.coordinator.ledger.rate(self.item_id)
+            if rate is not None and rate.available:
+                return rate.variance
+        week = self.get(InventoryManagerEntityType.WEEK)
+        month = self.get(InventoryManagerEntityType.MONTH)
+        return week * week * 6 / 49 + month * month * 27 / 784
+
+    def forecast_inputs(self) -> ForecastInputs | None:
+        """Return supply, mean and variance of the consumption, if consumed."""
         daily = self.daily_consumption()
-        if daily > 0:
-            return supply / daily
-        return 10000
+        if daily <= 0:
+            return None
+        return (
+            self.get(InventoryManagerEntityType.SUPPLY),
+            daily,
+            self.daily_variance(),
+        )
+
+    def set_forecast(
+        self, inputs: ForecastInputs | None, forecast: tuple[float, ...] | None
+    ) -> None:
+        """Take over a forecast and show it."""
+        if forecast == self.forecast and inputs == self.forecast_inputs_used:
+            return
+        self.forecast_inputs_used = inputs
+        self.forecast = forecast
+        sensor = self.entity(InventoryManagerEntityType.EMPTYPREDICTION)
+        if sensor is not None:
+            sensor.update()
+
+    def forecast_dates(self) -> list[datetime] | None:
+        """Return the percentiles of the moment the supply is empty, anchored."""
+        if self.forecast is None:
+            self._forecast_dates = None
+            return None
+        dates = [
+            self.changed_at + timedelta(days=min(days, NO_CONSUMPTION_DAYS))
+            for days in self.forecast
+        ]
+        if self._forecast_dates is not None:
+            resolution = self.prediction_resolution()
+            dates = [
+                anchor(previous, value, resolution)
+                for previous, value in zip(self._forecast_dates, dates, strict=True)
+            ]
+        self._forecast_dates = dates
+        return dates
 
     def daily_consumption(self) -> float:
+        """Return the daily consumption."""
+        if self._daily_consumption is None:
+            self._daily_consumption = self._calculate_daily_consumption()
+        return self._daily_consumption
+
+    def _calculate_daily_consumption(self) -> float:
         """Calculate the daily consumption."""
+        if self.data.get(CONF_LEARN_CONSUMPTION, False):
+            rate = self.coordinator.ledger.rate(self.item_id)
+            if rate is not None and rate.available:
+                return rate.mean
         try:
             s = sum(
                 self.get(entity_type)
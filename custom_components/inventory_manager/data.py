@@ -8,9 +8,7 @@ from typing import TYPE_CHECKING
 from homeassistant.config_entries import ConfigEntry
 
 if TYPE_CHECKING:
-    from homeassistant.helpers.device_registry import DeviceInfo
-
-    from .coordinator import InventoryManagerItem
+    from .coordinator import InventoryManagerCoordinator
 
 type InventoryManagerConfigEntry = ConfigEntry[InventoryManagerData]
 
@@ -19,5 +17,4 @@ type InventoryManagerConfigEntry = ConfigEntry[InventoryManagerData]
 class InventoryManagerData:
     """The class represents the inventory manager data."""
 
-    device_info: DeviceInfo
-    coordinator: InventoryManagerItem
+    coordinator: InventoryManagerCoordinator
@@ -0,0 +1,33 @@
+"""Diagnostics support for Inventory Manager."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import InventoryManagerConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    _hass: HomeAssistant, entry: InventoryManagerConfigEntry
+) -> dict[str, Any]:
+    """Return the configuration, state and statistics of a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    stats = coordinator.stats
+    return {
+        "entry": {"title": entry.title, "data": dict(entry.data)},
+        "statistics": coordinator.statistics(),
+        "items": {
+            item_id: {
+                "title": item.title,
+                **item.as_snapshot(),
+                "days_remaining": item.days_remaining(),
+                "daily_consumption": item.daily_consumption(),
+                "restored": item.restored,
+                "counters": dict(stats.items.get(item_id, {})),
+            }
+            for item_id, item in coordinator.items.items()
+        },
+    }
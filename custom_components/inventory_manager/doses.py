@@ -0,0 +1,227 @@
+"""Consume the configured doses of items at their time of day."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, time, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_AUTO_CONSUME,
+    CONF_EVENING_TIME,
+    CONF_MORNING_TIME,
+    CONF_NIGHT_TIME,
+    CONF_NOON_TIME,
+    DATA_DOSES,
+    DEFAULT_EVENING_TIME,
+    DEFAULT_MORNING_TIME,
+    DEFAULT_NIGHT_TIME,
+    DEFAULT_NOON_TIME,
+    DOMAIN,
+)
+from .entity import InventoryManagerEntityType
+from .scheduler import async_get_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .coordinator import InventoryManagerItem
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.doses"
+STORAGE_VERSION = 1
+
+SAVE_DELAY = 10
+
+# Doses missed for longer are not caught up
+MAX_CATCH_UP_DAYS = 366
+
+# Weekly doses are due on Mondays and monthly doses on the first of a month,
+# both at the time of the morning dose
+DOSE_TIMES = {
+    InventoryManagerEntityType.MORNING: (CONF_MORNING_TIME, DEFAULT_MORNING_TIME),
+    InventoryManagerEntityType.NOON: (CONF_NOON_TIME, DEFAULT_NOON_TIME),
+    InventoryManagerEntityType.EVENING: (CONF_EVENING_TIME, DEFAULT_EVENING_TIME),
+    InventoryManagerEntityType.NIGHT: (CONF_NIGHT_TIME, DEFAULT_NIGHT_TIME),
+    InventoryManagerEntityType.WEEK: (CONF_MORNING_TIME, DEFAULT_MORNING_TIME),
+    InventoryManagerEntityType.MONTH: (CONF_MORNING_TIME, DEFAULT_MORNING_TIME),
+}
+
+# Options affecting the doses consumed automatically
+DOSE_OPTIONS = frozenset({CONF_AUTO_CONSUME, *(key for key, _ in DOSE_TIMES.values())})
+
+
+@callback
+def async_get_dose_scheduler(hass: HomeAssistant) -> InventoryManagerDoseScheduler:
+    """Return the dose scheduler shared by all config entries."""
+    if DATA_DOSES not in hass.data:
+        hass.data[DATA_DOSES] = InventoryManagerDoseScheduler(hass)
+    return hass.data[DATA_DOSES]
+
+
+def next_occurrence(
+    dose: InventoryManagerEntityType, at: time, after: datetime
+) -> datetime:
+    """Return the first time a dose is due after the given moment."""
+    day = dt_util.as_local(after).date()
+    while True:
+        due = datetime.combine(day, at, tzinfo=dt_util.get_default_time_zone())
+        if (
+            due > after
+            and (dose != InventoryManagerEntityType.WEEK or day.weekday() == 0)
+            and (dose != InventoryManagerEntityType.MONTH or day.day == 1)
+        ):
+            return due
+        day += timedelta(days=1)
+
+
+class _DoseSlot:
+    """One dose of one item, scheduled at its next occurrence."""
+
+    __slots__ = ("at", "dose", "item", "scheduler")
+
+    def __init__(
+        self,
+        scheduler: InventoryManagerDoseScheduler,
+        item: InventoryManagerItem,
+        dose: InventoryManagerEntityType,
+    ) -> None:
+        self.scheduler = scheduler
+        self.item = item
+        self.dose = dose
+        key, default = DOSE_TIMES[dose]
+        self.at = dt_util.parse_time(item.data.get(key, default))
+
+    @callback
+    def async_deadline_reached(self) -> None:
+        self.scheduler.async_apply(self)
+
+
+class InventoryManagerDoseScheduler:
+    """
+    Consume doses of all items that consume automatically.
+
+    Dose slots of all items share the integration-wide scheduler, so doses of
+    all items due at the same time are consumed in one pass. Slots without a
+    dose are not scheduled until a dose is set. The time up to which the
+    doses of an item have been consumed is stored, such that doses missed
+    while Home Assistant was not running are consumed at startup.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new dose scheduler."""
+        self.hass = hass
+        self.scheduler = async_get_scheduler(hass)
+        self._store: Store[dict[str, int]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._consumed_until: dict[str, int] = {}
+        self._slots: dict[InventoryManagerItem, list[_DoseSlot]] = {}
+
+    async def async_load(self) -> None:
+        """Load the time up to which doses have been consumed."""
+        self._consumed_until = await self._store.async_load() or {}
+
+    @callback
+    def async_add_items(
+        self, items: Iterable[InventoryManagerItem], *, catch_up: bool = True
+    ) -> None:
+        """
+        Catch up missed doses of items and schedule their next doses.
+
+        Items added again after their options changed are not caught up, as
+        their doses have been consumed while running, possibly at other times.
+        """
+        now = dt_util.utcnow()
+        consumed = False
+        for item in items:
+            if not item.data.get(CONF_AUTO_CONSUME, False):
+                # Doses are not caught up after enabling it again
+                self._consumed_until.pop(item.item_id, None)
+                continue
+
+            slots = [_DoseSlot(self, item, dose) for dose in DOSE_TIMES]
+            self._slots[item] = slots
+            if catch_up and item.item_id in self._consumed_until:
+                since = dt_util.utc_from_timestamp(self._consumed_until[item.item_id])
+                since = max(since, now - timedelta(days=MAX_CATCH_UP_DAYS))
+                consumed |= self._async_catch_up(item, slots, since, now)
+            self._consumed_until[item.item_id] = int(now.timestamp())
+
+            for slot in slots:
+                self._async_schedule(slot, now)
+        if consumed:
+            self._async_save_now()
+        else:
+            self._store.async_delay_save(lambda: self._consumed_until, SAVE_DELAY)
+
+    @callback
+    def async_remove_items(self, items: Iterable[InventoryManagerItem]) -> None:
+        """Stop consuming doses of items."""
+        self.scheduler.async_remove(
+            [slot for item in items for slot in self._slots.pop(item, [])]
+        )
+
+    @callback
+    def async_dose_changed(
+        self, item: InventoryManagerItem, dose: InventoryManagerEntityType
+    ) -> None:
+        """Schedule or unschedule a slot of an item after its dose changed."""
+        now = dt_util.utcnow()
+        for slot in self._slots.get(item, []):
+            if slot.dose == dose:
+                self._async_schedule(slot, now)
+
+    @callback
+    def async_forget(self, item_id: str) -> None:
+        """Forget the consumed doses of a removed item."""
+        if self._consumed_until.pop(item_id, None) is not None:
+            self._store.async_delay_save(lambda: self._consumed_until, SAVE_DELAY)
+
+    @callback
+    def _async_catch_up(
+        self,
+        item: InventoryManagerItem,
+        slots: list[_DoseSlot],
+        since: datetime,
+        now: datetime,
+    ) -> bool:
+        """Consume all doses missed between two moments at once, if any."""
+        amount = 0.0
+        for slot in slots:
+            dose = item.get(slot.dose)
+            if dose <= 0:
+                continue
+            due = next_occurrence(slot.dose, slot.at, since)
+            while due <= now:
+                amount += dose
+                due = next_occurrence(slot.dose, slot.at, due)
+        if amount > 0:
+            _LOGGER.debug("Catching up %f of missed doses of %s", amount, item.title)
+            item.take_number(amount)
+        return amount > 0
+
+    @callback
+    def async_apply(self, slot: _DoseSlot) -> None:
+        """Consume a due dose and schedule its next occurrence."""
+        now = dt_util.utcnow()
+        slot.item.take_dose(slot.dose)
+        self._consumed_until[slot.item.item_id] = int(now.timestamp())
+        self._async_save_now()
+        self._async_schedule(slot, now)
+
+    @callback
+    def _async_save_now(self) -> None:
+        """Save right after consuming, such that no dose is consumed twice."""
+        self.hass.async_create_task(self._store.async_save(self._consumed_until))
+
+    @callback
+    def _async_schedule(self, slot: _DoseSlot, now: datetime) -> None:
+        """Schedule the next occurrence of a slot, unless its dose is 0."""
+        if slot.item.get(slot.dose) <= 0:
+            self.scheduler.async_unschedule(slot)
+            return
+        self.scheduler.async_schedule(slot, next_occurrence(slot.dose, slot.at, now))
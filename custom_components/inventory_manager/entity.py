@@ -5,11 +5,14 @@ from __future__ import annotations
 from enum import IntFlag
 from typing import TYPE_CHECKING
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 if TYPE_CHECKING:
-    from .coordinator import InventoryManagerItem
+    from homeassistant.helpers.device_registry import DeviceInfo
+
+    from .coordinator import InventoryManagerCoordinator, InventoryManagerItem
 
 
 class InventoryManagerEntityType(IntFlag):
@@ -26,14 +29,69 @@ class InventoryManagerEntityType(IntFlag):
     MONTH = 1024
 
 
+# Positions of the numbers in the storage of an item
+NUMBER_INDEX = {
+    entity_type: index
+    for index, entity_type in enumerate(
+        (
+            InventoryManagerEntityType.SUPPLY,
+            InventoryManagerEntityType.NIGHT,
+            InventoryManagerEntityType.MORNING,
+            InventoryManagerEntityType.NOON,
+            InventoryManagerEntityType.EVENING,
+            InventoryManagerEntityType.WEEK,
+            InventoryManagerEntityType.MONTH,
+        )
+    )
+}
+
+# Positions of the entities of an item
+ENTITY_INDEX = {
+    entity_type: index for index, entity_type in enumerate(InventoryManagerEntityType)
+}
+
+
 class InventoryManagerEntity(CoordinatorEntity, Entity):
-    """Base Inventory Manager Entity."""
+    """
+    Base Inventory Manager Entity.
+
+    Ids and device info are derived from the item when needed, such that
+    entities only hold a reference to their item.
+    """
+
+    entity_type: InventoryManagerEntityType
 
-    def __init__(self, coordinator: InventoryManagerItem) -> None:
+    def __init__(self, item: InventoryManagerItem, entity_id: str) -> None:
         """Create a new object."""
-        super().__init__(coordinator)
-        self._attr_device_info = coordinator.config_entry.runtime_data.device_info
-        self.coordinator: InventoryManagerItem = coordinator
+        super().__init__(item.coordinator)
+        self.coordinator: InventoryManagerCoordinator = item.coordinator
+        self.item: InventoryManagerItem = item
+        self.entity_id = entity_id
+        item.register_entity(self.entity_type, self)
+
+    @property
+    def unique_id(self) -> str:
+        """Return the unique id, derived from the item."""
+        return self.item.unique_id(self.entity_type)
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the item."""
+        return self.item.device_info
+
+    def _calculate(self) -> bool:
+        """Calculate state and attributes from the item, return whether they changed."""
+        return False
+
+    def update(self) -> None:
+        """Write the state once, along with other changes of the item."""
+        self.coordinator.schedule_write(self)
+
+    async def async_update(self) -> None:
+        """Recalculate from the item, instead of refreshing the coordinator."""
+        self._calculate()
 
+    @callback
     def _handle_coordinator_update(self) -> None:
-        return super()._handle_coordinator_update()
+        """Write the state through the coalesced flush, if it changed."""
+        self.update()
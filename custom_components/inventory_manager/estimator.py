@@ -0,0 +1,96 @@
+"""Estimate the consumption rate of an item from observed consumption."""
+
+from __future__ import annotations
+
+import struct
+
+# Weight of the latest day, about two weeks of history dominate the estimate
+ALPHA = 2 / (14 + 1)
+
+# Current day, amount consumed on it, mean, variance and number of days
+RATE_FORMAT = struct.Struct("<Ifffi")
+
+
+class ConsumptionRate:
+    """
+    Exponentially weighted mean and variance of the daily consumption.
+
+    Consumption is summed per day. Whenever a day is completed, its sum and
+    all following days without consumption update the estimate in constant
+    time, so no history needs to be replayed.
+    """
+
+    __slots__ = ("amount", "day", "days", "mean", "variance")
+
+    def __init__(
+        self,
+        day: int = 0,
+        amount: float = 0.0,
+        mean: float = 0.0,
+        variance: float = 0.0,
+        days: int = 0,
+    ) -> None:
+        """Create a new estimate."""
+        self.day = day
+        self.amount = amount
+        self.mean = mean
+        self.variance = variance
+        self.days = days
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ConsumptionRate:
+        """Restore an estimate from its binary form."""
+        return cls(*RATE_FORMAT.unpack(data))
+
+    def to_bytes(self) -> bytes:
+        """Return the binary form of the estimate."""
+        return RATE_FORMAT.pack(
+            self.day, self.amount, self.mean, self.variance, self.days
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return whether at least one day has been completed."""
+        return self.days > 0
+
+    def add(self, day: int, amount: float) -> bool:
+        """
+        Add the amount consumed on a day, given as ordinal.
+
+        Returns whether the estimate changed.
+        """
+        if self.day == 0:
+            self.day = day
+        if day <= self.day:
+            self.amount += amount
+            return False
+
+        self._update(self.amount)
+        self._decay(day - self.day - 1)
+        self.day = day
+        self.amount = amount
+        return True
+
+    def _update(self, value: float) -> None:
+        if self.days == 0:
+            self.mean = value
+            self.variance = 0.0
+        else:
+            diff = value - self.mean
+            self.mean += ALPHA * diff
+            self.variance = (1 - ALPHA) * (self.variance + ALPHA * diff * diff)
+        self.days += 1
+
+    def _decay(self, days: int) -> None:
+        """
+        Update the estimate by a number of days without consumption at once.
+
+        Each such day multiplies the mean by 1 - ALPHA. The updates of the
+        variance form a geometric series, which sums to the closed form below.
+        """
+        if days <= 0:
+            return
+        factor = (1 - ALPHA) ** days
+        self.variance = factor * (self.variance + self.mean**2 * (1 - factor))
+        self.mean *= factor
+        self.days += days
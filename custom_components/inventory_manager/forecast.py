@@ -0,0 +1,112 @@
+"""Forecast the range of dates an item runs out, in the executor."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import numpy as np
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_FORECAST, DATA_FORECASTER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .coordinator import InventoryManagerItem
+
+_LOGGER = logging.getLogger(__name__)
+
+# Percentiles of the days until empty
+PERCENTILES = (10, 50, 90)
+
+# Samples drawn per item, and items sampled at once to bound memory
+SAMPLES = 1000
+CHUNK_SIZE = 1024
+
+# Supply, mean and variance of the daily consumption
+type ForecastInputs = tuple[float, float, float]
+
+
+@callback
+def async_get_forecaster(hass: HomeAssistant) -> InventoryManagerForecaster:
+    """Return the forecaster shared by all config entries."""
+    if DATA_FORECASTER not in hass.data:
+        hass.data[DATA_FORECASTER] = InventoryManagerForecaster(hass)
+    return hass.data[DATA_FORECASTER]
+
+
+def simulate(inputs: list[ForecastInputs]) -> np.ndarray:
+    """
+    Return the percentiles of the days until empty of many items.
+
+    Daily consumption is modelled as a random walk. The days it takes to
+    consume the supply then follow an inverse Gaussian distribution, which
+    is sampled for all items at once. Items without variance run out
+    exactly when predicted.
+    """
+    supply, mean, variance = np.asarray(inputs, dtype=np.float64).reshape(-1, 3).T
+    days = supply / mean
+    result = np.repeat(days[:, np.newaxis], len(PERCENTILES), axis=1)
+
+    random = np.flatnonzero((variance > 0) & (supply > 0))
+    generator = np.random.default_rng()
+    for start in range(0, len(random), CHUNK_SIZE):
+        index = random[start : start + CHUNK_SIZE]
+        samples = generator.wald(
+            days[index, np.newaxis],
+            (supply[index] ** 2 / variance[index])[:, np.newaxis],
+            size=(len(index), SAMPLES),
+        )
+        result[index] = np.percentile(samples, PERCENTILES, axis=1).T
+    return result
+
+
+class InventoryManagerForecaster:
+    """
+    Compute forecasts of items whose inputs changed.
+
+    Changed items are collected and forecast together in one executor job.
+    Items changing while a job runs are forecast in the next one. Items
+    whose supply and consumption did not change keep their forecast.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new forecaster."""
+        self.hass = hass
+        self._pending: dict[InventoryManagerItem, ForecastInputs] = {}
+        self._running = False
+
+    @callback
+    def async_request(self, items: Iterable[InventoryManagerItem]) -> None:
+        """Forecast items with changed inputs."""
+        for item in items:
+            if not item.data.get(CONF_FORECAST, False):
+                continue
+            inputs = item.forecast_inputs()
+            if inputs is None:
+                item.set_forecast(None, None)
+            elif inputs != item.forecast_inputs_used:
+                self._pending[item] = inputs
+        if self._pending and not self._running:
+            self._running = True
+            self.hass.async_create_background_task(
+                self._async_run(), "inventory_manager forecast"
+            )
+
+    async def _async_run(self) -> None:
+        """Forecast pending items until there are none."""
+        try:
+            while self._pending:
+                pending, self._pending = self._pending, {}
+                inputs = list(pending.values())
+                result = await self.hass.async_add_executor_job(simulate, inputs)
+                _LOGGER.debug("Forecast %i items", len(pending))
+                for item, item_inputs, days in zip(
+                    pending, inputs, result.tolist(), strict=True
+                ):
+                    # Items of unloaded entries are skipped
+                    if item.coordinator.items.get(item.item_id) is item:
+                        item.set_forecast(item_inputs, tuple(days))
+        finally:
+            self._running = False
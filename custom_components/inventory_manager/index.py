@@ -0,0 +1,113 @@
+"""Indexes over the items of a config entry, maintained incrementally."""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Any
+
+from .const import CONF_ITEM_AGENT, CONF_ITEM_UNIT, CONF_ITEM_VENDOR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from datetime import datetime
+
+    from .coordinator import InventoryManagerItem
+
+# Options items can be looked up by
+INDEX_OPTIONS = frozenset({CONF_ITEM_VENDOR, CONF_ITEM_AGENT, CONF_ITEM_UNIT})
+
+
+def index_key(value: Any) -> str | None:
+    """Return the key an option value is indexed by, ignoring case."""
+    if value is None:
+        return None
+    key = str(value).strip().casefold()
+    return key or None
+
+
+class InventoryManagerIndex:
+    """
+    Look up items by vendor, agent and unit, and by when they run out.
+
+    Items are updated one by one when they change. Every option maps its
+    values to the set of items having them, predicted empty times are kept
+    in a sorted list that is searched by bisection.
+    """
+
+    def __init__(self) -> None:
+        """Create new, empty indexes."""
+        self._options: dict[str, dict[str, set[InventoryManagerItem]]] = {
+            option: {} for option in INDEX_OPTIONS
+        }
+        self._items: dict[str, InventoryManagerItem] = {}
+        # Option keys and empty key each item is indexed by
+        self._keys: dict[
+            InventoryManagerItem, tuple[dict[str, str | None], tuple[float, str]]
+        ] = {}
+        # Predicted empty timestamps and item ids, sorted
+        self._empty: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._keys)
+
+    def update(self, items: Iterable[InventoryManagerItem]) -> None:
+        """Take over the options and predicted empty times of items."""
+        for item in items:
+            options = {
+                option: index_key(item.data.get(option)) for option in INDEX_OPTIONS
+            }
+            empty = (item.empty_at().timestamp(), item.item_id)
+            previous = self._keys.get(item)
+            if previous is None:
+                previous = dict.fromkeys(INDEX_OPTIONS), None
+                self._items[item.item_id] = item
+            elif previous == (options, empty):
+                continue
+            previous_options, previous_empty = previous
+            self._keys[item] = options, empty
+
+            for option, key in options.items():
+                previous_key = previous_options[option]
+                if key == previous_key:
+                    continue
+                index = self._options[option]
+                if previous_key is not None:
+                    index[previous_key].discard(item)
+                    if not index[previous_key]:
+                        del index[previous_key]
+                if key is not None:
+                    index.setdefault(key, set()).add(item)
+
+            if empty != previous_empty:
+                if previous_empty is not None:
+                    del self._empty[bisect.bisect_left(self._empty, previous_empty)]
+                bisect.insort(self._empty, empty)
+
+    def find(
+        self, options: Mapping[str, str], empty_before: datetime | None = None
+    ) -> list[InventoryManagerItem]:
+        """
+        Return the items matching all options and running out before a moment.
+
+        Items are returned in the order they run out. The smaller of the
+        matching option sets and the matching range of empty times is
+        scanned, the other one only checked.
+        """
+        candidates: set[InventoryManagerItem] | None = None
+        for option, value in options.items():
+            matches = self._options[option].get(index_key(value), set())
+            candidates = matches if candidates is None else candidates & matches
+
+        limit = (float("inf"),) if empty_before is None else (empty_before.timestamp(),)
+        end = bisect.bisect_left(self._empty, limit)
+        if candidates is not None and len(candidates) < end:
+            return sorted(
+                (item for item in candidates if self._keys[item][1] < limit),
+                key=lambda item: self._keys[item][1],
+            )
+        return [
+            self._items[item_id]
+            for _, item_id in self._empty[:end]
+            if candidates is None or self._items[item_id] in candidates
+        ]
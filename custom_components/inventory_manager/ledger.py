@@ -0,0 +1,223 @@
+"""Append-only ledger of the supply changes of all items."""
+
+from __future__ import annotations
+
+import base64
+import logging
+import struct
+from datetime import UTC, date, datetime
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_LEDGER, DOMAIN
+from .estimator import ConsumptionRate
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.ledger"
+STORAGE_VERSION = 1
+
+# Appends are written to disk in batches
+SAVE_DELAY = 60
+
+# Events are kept for this many days, older events are compacted into
+# daily aggregates, which are kept for this many days
+EVENT_RETENTION_DAYS = 30
+DAY_RETENTION_DAYS = 5 * 366
+
+# Busy items are compacted earlier to keep appending cheap
+MAX_EVENTS = 4096
+
+SECONDS_PER_DAY = 86400
+
+# Timestamp, kind and value of an event
+EVENT_FORMAT = struct.Struct("<IBf")
+# Ordinal of the local day, amount consumed, amount stored and number of events of a day
+DAY_FORMAT = struct.Struct("<IffH")
+
+
+class LedgerEventKind(IntEnum):
+    """Kinds of supply changes."""
+
+    CONSUME = 0
+    STORE = 1
+    SET = 2
+
+
+@callback
+def async_get_ledger(hass: HomeAssistant) -> InventoryManagerLedger:
+    """Return the ledger shared by all config entries."""
+    if DATA_LEDGER not in hass.data:
+        hass.data[DATA_LEDGER] = InventoryManagerLedger(hass)
+    return hass.data[DATA_LEDGER]
+
+
+class _ItemLedger:
+    """Events and daily aggregates of one item in their binary form."""
+
+    __slots__ = ("days", "events", "rate")
+
+    def __init__(
+        self, events: bytes = b"", days: bytes = b"", rate: bytes | None = None
+    ) -> None:
+        self.events = bytearray(events)
+        self.days = bytearray(days)
+        self.rate = (
+            ConsumptionRate.from_bytes(rate) if rate is not None else ConsumptionRate()
+        )
+
+
+class InventoryManagerLedger:
+    """
+    Record every change of supply.
+
+    Events are packed into fixed size binary records, such that appending is
+    cheap and the ledger stays small on disk. Old events are compacted into
+    daily aggregates, old aggregates are dropped. Consumption also updates
+    the estimated consumption rate of the item.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new ledger."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._items: dict[str, _ItemLedger] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the ledger from disk."""
+        data = await self._store.async_load()
+        if data is None:
+            return
+        for item_id, item in data.get("items", {}).items():
+            self._items[item_id] = _ItemLedger(
+                base64.b64decode(item["events"]),
+                base64.b64decode(item["days"]),
+                base64.b64decode(item["rate"]) if "rate" in item else None,
+            )
+
+    @callback
+    def append(self, item_id: str, kind: LedgerEventKind, value: float) -> bool:
+        """
+        Record a change of supply.
+
+        Returns whether the estimated consumption rate of the item changed.
+        """
+        now = dt_util.utcnow()
+        item = self._items.get(item_id)
+        if item is None:
+            item = self._items[item_id] = _ItemLedger()
+        item.events += EVENT_FORMAT.pack(int(now.timestamp()), kind, value)
+        rate_changed = kind == LedgerEventKind.CONSUME and item.rate.add(
+            dt_util.as_local(now).date().toordinal(), value
+        )
+        # The save is delayed once, instead of on every append
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return rate_changed
+
+    def rate(self, item_id: str) -> ConsumptionRate | None:
+        """Return the estimated consumption rate of an item."""
+        item = self._items.get(item_id)
+        return item.rate if item is not None else None
+
+    @callback
+    def async_remove(self, item_id: str) -> None:
+        """Remove the ledger of an item."""
+        if self._items.pop(item_id, None) is None:
+            return
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def events(self, item_id: str) -> Iterator[tuple[datetime, LedgerEventKind, float]]:
+        """Iterate over the recent events of an item, oldest first."""
+        # A copy, such that appending while iterating is possible
+        item = self._items.get(item_id)
+        events = bytes(item.events) if item is not None else b""
+        for timestamp, kind, value in EVENT_FORMAT.iter_unpack(events):
+            yield (
+                datetime.fromtimestamp(timestamp, UTC),
+                LedgerEventKind(kind),
+                value,
+            )
+
+    def days(self, item_id: str) -> Iterator[tuple[date, float, float, int]]:
+        """Iterate over the daily aggregates of an item by local day, oldest first."""
+        item = self._items.get(item_id)
+        days = bytes(item.days) if item is not None else b""
+        for day, consumed, stored, count in DAY_FORMAT.iter_unpack(days):
+            yield date.fromordinal(day), consumed, stored, count
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Compact the ledgers and return the data to store."""
+        now = int(dt_util.utcnow().timestamp())
+        self._save_pending = False
+        for item in self._items.values():
+            _compact(item, now)
+        return {
+            "items": {
+                item_id: {
+                    "events": base64.b64encode(item.events).decode(),
+                    "days": base64.b64encode(item.days).decode(),
+                    "rate": base64.b64encode(item.rate.to_bytes()).decode(),
+                }
+                for item_id, item in self._items.items()
+            }
+        }
+
+
+def _local_day(timestamp: int) -> int:
+    """Return the ordinal of the local day of a timestamp."""
+    return dt_util.as_local(datetime.fromtimestamp(timestamp, UTC)).date().toordinal()
+
+
+def _compact(item: _ItemLedger, now: int) -> None:
+    """Move old events of an item into its daily aggregates."""
+    cutoff = now - EVENT_RETENTION_DAYS * SECONDS_PER_DAY
+    overflow = len(item.events) // EVENT_FORMAT.size - MAX_EVENTS
+    if not item.events or (
+        EVENT_FORMAT.unpack_from(item.events)[0] >= cutoff and overflow <= 0
+    ):
+        return
+
+    aggregates: dict[int, list] = {}
+    if item.days:
+        # The latest day may still receive events
+        item.days, last = item.days[: -DAY_FORMAT.size], item.days[-DAY_FORMAT.size :]
+        day, consumed, stored, count = DAY_FORMAT.unpack(last)
+        aggregates[day] = [consumed, stored, count]
+
+    compacted = 0
+    for index, (timestamp, kind, value) in enumerate(
+        EVENT_FORMAT.iter_unpack(item.events)
+    ):
+        if timestamp >= cutoff and index >= overflow:
+            break
+        day = _local_day(timestamp)
+        aggregate = aggregates.setdefault(day, [0.0, 0.0, 0])
+        if kind == LedgerEventKind.CONSUME:
+            aggregate[0] += value
+        elif kind == LedgerEventKind.STORE:
+            aggregate[1] += value
+        aggregate[2] = min(aggregate[2] + 1, 0xFFFF)
+        compacted += 1
+
+    del item.events[: compacted * EVENT_FORMAT.size]
+    for day in sorted(aggregates):
+        item.days += DAY_FORMAT.pack(day, *aggregates[day])
+
+    first_day = _local_day(now) - DAY_RETENTION_DAYS
+    expired = 0
+    for day, *_ in DAY_FORMAT.iter_unpack(item.days):
+        if day >= first_day:
+            break
+        expired += 1
+    del item.days[: expired * DAY_FORMAT.size]
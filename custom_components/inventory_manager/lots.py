@@ -0,0 +1,132 @@
+"""Lots of an item with their expiry dates."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_AMOUNT, ATTR_EXPIRY, ATTR_ITEM, EVENT_LOT_EXPIRED
+from .entity import InventoryManagerEntityType
+
+if TYPE_CHECKING:
+    from .coordinator import InventoryManagerItem
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def expires_at(expiry: date) -> datetime:
+    """Return the moment a lot expires, which is the end of its expiry date."""
+    return datetime.combine(
+        expiry + timedelta(days=1), time(), tzinfo=dt_util.get_default_time_zone()
+    )
+
+
+class InventoryManagerLots:
+    """
+    Keep the lots of an item ordered by expiry date.
+
+    Consumption draws from the lots expiring first. Lots never add up to
+    more than the supply, the remaining supply has no known expiry date.
+    The lots are a target of the shared scheduler, which wakes them when
+    their next lot expires.
+    """
+
+    __slots__ = ("_amounts", "_expiries", "_watching", "item")
+
+    def __init__(self, item: InventoryManagerItem) -> None:
+        """Create empty lots."""
+        self.item = item
+        self._expiries: list[date] = []
+        self._amounts: list[float] = []
+        # Expiry date of the lots the scheduler wakes us for
+        self._watching: date | None = None
+
+    def __bool__(self) -> bool:
+        """Return whether there are any lots."""
+        return bool(self._expiries)
+
+    @property
+    def total(self) -> float:
+        """Return the amount in all lots."""
+        return sum(self._amounts)
+
+    def earliest(self) -> tuple[date, float] | None:
+        """Return expiry date and amount of the lot expiring first."""
+        if not self._expiries:
+            return None
+        return self._expiries[0], self._amounts[0]
+
+    def add(self, expiry: date, amount: float) -> None:
+        """Add a lot, merging lots of the same expiry date."""
+        index = bisect.bisect_left(self._expiries, expiry)
+        if index < len(self._expiries) and self._expiries[index] == expiry:
+            self._amounts[index] += amount
+        else:
+            self._expiries.insert(index, expiry)
+            self._amounts.insert(index, amount)
+
+    def draw(self, amount: float) -> None:
+        """Consume from the lots expiring first."""
+        drawn = 0
+        while drawn < len(self._amounts) and amount >= self._amounts[drawn]:
+            amount -= self._amounts[drawn]
+            drawn += 1
+        del self._expiries[:drawn]
+        del self._amounts[:drawn]
+        if self._amounts and amount > 0:
+            self._amounts[0] -= amount
+
+    def trim(self, supply: float) -> None:
+        """Draw from the lots until they do not exceed the supply."""
+        excess = self.total - supply
+        if excess > 0:
+            self.draw(excess)
+
+    def next_expiry(self) -> datetime | None:
+        """Return when the next lot that has not expired yet expires."""
+        index = bisect.bisect_left(self._expiries, dt_util.now().date())
+        if index == len(self._expiries):
+            self._watching = None
+            return None
+        self._watching = self._expiries[index]
+        return expires_at(self._watching)
+
+    @callback
+    def async_deadline_reached(self) -> None:
+        """Report the lots that have expired and wait for the next one."""
+        if self._watching is not None:
+            start = bisect.bisect_left(self._expiries, self._watching)
+            end = bisect.bisect_left(self._expiries, dt_util.now().date())
+            supply = self.item.entity(InventoryManagerEntityType.SUPPLY)
+            for expiry, amount in zip(
+                self._expiries[start:end], self._amounts[start:end], strict=True
+            ):
+                _LOGGER.debug("Lot of %s expired on %s", self.item.title, expiry)
+                self.item.hass.bus.async_fire(
+                    EVENT_LOT_EXPIRED,
+                    {
+                        ATTR_ITEM: self.item.title,
+                        ATTR_ENTITY_ID: getattr(supply, "entity_id", None),
+                        ATTR_EXPIRY: expiry.isoformat(),
+                        ATTR_AMOUNT: amount,
+                    },
+                )
+        self.item.coordinator.scheduler.async_schedule(self, self.next_expiry())
+
+    def as_list(self) -> list[tuple[str, float]]:
+        """Return the lots in the form stored in the snapshot."""
+        return [
+            (expiry.isoformat(), amount)
+            for expiry, amount in zip(self._expiries, self._amounts, strict=True)
+        ]
+
+    def restore(self, lots: list[tuple[str, float]]) -> None:
+        """Restore the lots from the snapshot."""
+        for expiry, amount in lots:
+            self.add(date.fromisoformat(expiry), amount)
@@ -10,18 +10,18 @@ import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant import config_entries, core
 from homeassistant.components.number import NumberEntityDescription, RestoreNumber
-from homeassistant.const import EntityCategory
+from homeassistant.const import EntityCategory, Platform
 from homeassistant.helpers import entity_platform
 
 from .const import (
     CONF_ITEM_MAX_CONSUMPTION,
     CONF_ITEM_UNIT,
     DOMAIN,
-    ENTITY_ID,
     NATIVE_VALUE,
     SERVICE_AMOUNT,
     SERVICE_AMOUNT_SPECIFICATION,
     SERVICE_CONSUME,
+    SERVICE_EXPIRY,
     SERVICE_PREDEFINED_AMOUNT,
     SERVICE_STORE,
     STRING_EVENING_ENTITY,
@@ -31,17 +31,17 @@ from .const import (
     STRING_NOON_ENTITY,
     STRING_SUPPLY_ENTITY,
     STRING_WEEK_ENTITY,
-    UNIQUE_ID,
     UNIT_PCS,
 )
 from .entity import InventoryManagerEntity, InventoryManagerEntityType
+from .ledger import LedgerEventKind
 
 if TYPE_CHECKING:
     from types import NoneType
 
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-    from .coordinator import InventoryManagerItem
+    from .coordinator import InventoryManagerCoordinator, InventoryManagerItem
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -120,17 +120,25 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> NoneType:
     """Set up number entities and register service."""
-    # Get the item object
-    coordinator: InventoryManagerItem = hass.data[DOMAIN][config_entry.entry_id]
+    # Get the coordinator of all items
+    coordinator: InventoryManagerCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     # Create numeric entities
+    entity_ids = coordinator.async_allocate_entity_ids(
+        Platform.NUMBER, [description.entity_type for description in NUMBER_TYPES]
+    )
     entities = [
-        InventoryNumber(coordinator, description) for description in NUMBER_TYPES
+        InventoryNumber(
+            item, description, entity_ids[item.item_id, description.entity_type]
+        )
+        for item in coordinator.items.values()
+        for description in NUMBER_TYPES
     ]
 
     async_add_entities(entities, update_before_add=False)
 
-    # Register service, if needed
+    # Register service, if needed. The handlers are coroutines, such that they
+    # run on the event loop and no two calls interleave.
     if not hass.services.has_service(DOMAIN, SERVICE_CONSUME):
         _LOGGER.debug("Registering service %s.%s", DOMAIN, SERVICE_CONSUME)
         platform = entity_platform.async_get_current_platform()
@@ -145,7 +153,7 @@ async def async_setup_entry(
                     SERVICE_PREDEFINED_AMOUNT, SERVICE_AMOUNT_SPECIFICATION
                 ): cv.string,
             },
-            lambda target, payload: target.take(payload),
+            InventoryNumber.async_take,
         )
 
         platform.async_register_entity_service(
@@ -154,8 +162,9 @@ async def async_setup_entry(
                 vol.Required(
                     SERVICE_AMOUNT, SERVICE_AMOUNT_SPECIFICATION
                 ): cv.positive_int,
+                vol.Optional(SERVICE_EXPIRY): cv.date,
             },
-            lambda target, payload: target.store(payload),
+            InventoryNumber.async_store,
         )
 
 
@@ -164,15 +173,16 @@ class InventoryNumber(InventoryManagerEntity, RestoreNumber):
 
     entity_description: InventoryManagerNumberEntityDescription
 
+    _attr_native_step = 0.25
+    _attr_native_min_value = 0
+
     def __init__(
         self,
         item: InventoryManagerItem,
         description: InventoryManagerNumberEntityDescription,
+        entity_id: str,
     ) -> None:
         """Create a new number entity."""
-        super().__init__(item)
-        self.entity_description = description
-
         if description.entity_type is None:
             msg = (
                 f"entity_type must be specified in the entity description "
@@ -180,48 +190,49 @@ class InventoryNumber(InventoryManagerEntity, RestoreNumber):
             )
             raise ValueError(msg)
 
-        self.entity_type: InventoryManagerEntityType = description.entity_type
-
-        # register self with the item object
-        self.coordinator.entity[self.entity_type] = self
+        self.entity_description = description
+        super().__init__(item, entity_id)
 
-        entity_config: dict = item.entity_config[self.entity_type]
-        self.entity_id: str = entity_config[ENTITY_ID]
-        self.unique_id: str = entity_config[UNIQUE_ID]
+    @property
+    def entity_type(self) -> InventoryManagerEntityType:
+        """Return the type of the number."""
+        return self.entity_description.entity_type
 
-        self._available: bool = True
-        self._attr_native_unit_of_measurement = item.config_entry.data.get(
-            CONF_ITEM_UNIT, UNIT_PCS
-        )
-        self._attr_native_step = 0.25
-        self._attr_native_min_value = 0
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the unit of the item."""
+        return self.item.data.get(CONF_ITEM_UNIT, UNIT_PCS)
 
-        # Set max value based on entity type
+    @property
+    def native_max_value(self) -> float:
+        """Return the maximum, which is limited for doses."""
         if self.entity_type == InventoryManagerEntityType.SUPPLY:
-            self.native_max_value = 1000000
-        else:
-            self.native_max_value = float(
-                item.config_entry.data.get(CONF_ITEM_MAX_CONSUMPTION, 5)
-            )
+            return 1000000
+        return float(self.item.data.get(CONF_ITEM_MAX_CONSUMPTION, 5))
 
     @property
     def native_value(self) -> float:
         """The native value."""
-        return self.coordinator.get(self.entity_type)
+        return self.item.get(self.entity_type)
 
     @native_value.setter
     def native_value(self, value: float) -> None:
         _LOGGER.debug("Setting native value of %s to %2.1f.", self.entity_id, value)
-        self.coordinator.set(self.entity_type, value)
-        self.schedule_update_ha_state()
+        self.item.set(self.entity_type, value)
+        self.coordinator.schedule_write(self)
 
-    def set_native_value(self, value: float) -> None:
+    async def async_set_native_value(self, value: float) -> None:
         """Set the native value."""
+        self.coordinator.stats.count(self.item.item_id, "service_calls")
+        if self.entity_type == InventoryManagerEntityType.SUPPLY:
+            self.item.record(LedgerEventKind.SET, value)
         self.native_value = value
-        self.schedule_update_ha_state()
+        await self.coordinator.async_flushed()
 
     async def async_added_to_hass(self) -> None:
-        """Restore the number from last time."""
+        """Restore the number from last time, unless restored from the snapshot."""
+        if self.item.restored:
+            return
         try:
             last_data = await self.async_get_last_number_data()
             if last_data is not None:
@@ -231,8 +242,7 @@ class InventoryNumber(InventoryManagerEntity, RestoreNumber):
                 else:
                     self.native_value = 0.0
         except AttributeError:
-            self.set_native_value(0.0)
-            self.schedule_update_ha_state()
+            await self.async_set_native_value(0.0)
 
     @property
     def supported_features(self) -> int:
@@ -246,29 +256,32 @@ class InventoryNumber(InventoryManagerEntity, RestoreNumber):
             return 4  # LightEntityFeature.EFFECT
         return 0
 
-    def take(self, call: core.ServiceCall) -> None:
+    async def async_take(self, call: core.ServiceCall) -> None:
         """Execute the consume service call."""
+        self.coordinator.stats.count(self.item.item_id, "service_calls")
         if SERVICE_PREDEFINED_AMOUNT in call.data:
+            dose = InventoryManagerEntityType[
+                call.data[SERVICE_PREDEFINED_AMOUNT].upper()
+            ]
             _LOGGER.debug(
-                "Calling service 'consume' with predefined amount %s, which is %i",
+                "Calling service 'consume' with predefined amount %s, which is %f",
                 call.data[SERVICE_PREDEFINED_AMOUNT],
-                self.coordinator.get(call.data[SERVICE_PREDEFINED_AMOUNT]),
-            )
-            self.coordinator.take_dose(
-                InventoryManagerEntityType[call.data[SERVICE_PREDEFINED_AMOUNT].upper()]
+                self.item.get(dose),
             )
+            self.item.take_dose(dose)
         elif SERVICE_AMOUNT in call.data:
             _LOGGER.debug(
                 "Calling service 'consume' with amount %f",
                 call.data[SERVICE_AMOUNT],
             )
-            self.coordinator.take_number(call.data[SERVICE_AMOUNT])
+            self.item.take_number(call.data[SERVICE_AMOUNT])
+        await self.coordinator.async_flushed()
 
-    def store(self, call: core.ServiceCall) -> None:
+    async def async_store(self, call: core.ServiceCall) -> None:
         """Execute the service call to store additional supplies."""
-        self.coordinator.take_number(-1 * call.data[SERVICE_AMOUNT])
-
-    def update(self) -> None:
-        """Update the state."""
-        self._available = True
-        self.schedule_update_ha_state()
+        self.coordinator.stats.count(self.item.item_id, "service_calls")
+        if SERVICE_EXPIRY in call.data:
+            self.item.store_lot(call.data[SERVICE_AMOUNT], call.data[SERVICE_EXPIRY])
+        else:
+            self.item.take_number(-1 * call.data[SERVICE_AMOUNT])
+        await self.coordinator.async_flushed()
@@ -0,0 +1,103 @@
+"""Plan orders from reorder points derived from the consumption statistics."""
+
+from __future__ import annotations
+
+import functools
+import math
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+
+from .const import (
+    ATTR_ITEM,
+    ATTR_ITEMS,
+    ATTR_PACKAGES,
+    ATTR_QUANTITY,
+    ATTR_REORDER_POINT,
+    ATTR_SUPPLY,
+    ATTR_VENDOR,
+    CONF_ITEM_SIZE,
+    CONF_ITEM_VENDOR,
+)
+from .entity import InventoryManagerEntityType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .coordinator import InventoryManagerItem
+
+# Service levels in percent, at 100 percent the safety stock would be infinite
+SERVICE_LEVEL = vol.All(vol.Coerce(float), vol.Range(min=50, max=99.9))
+
+# Tolerance when rounding to packages, so float noise does not add a package
+EPSILON = 1e-9
+
+
+@functools.lru_cache(maxsize=32)
+def safety_factor(service_level: float) -> float:
+    """Return the standard deviations of safety stock for a service level in percent."""
+    return NormalDist().inv_cdf(service_level / 100)
+
+
+def reorder_point(
+    mean: float, variance: float, lead_time: float, service_level: float
+) -> float:
+    """
+    Return the supply at which to reorder.
+
+    The supply has to last the lead time, while daily consumption varies
+    independently around its mean, in the given percent of all cases.
+    """
+    if lead_time <= 0:
+        return 0.0
+    return mean * lead_time + safety_factor(service_level) * math.sqrt(
+        variance * lead_time
+    )
+
+
+def round_to_packages(quantity: float, size: float | None) -> tuple[float, int | None]:
+    """Round a quantity up to whole packages, return quantity and packages."""
+    if not size:
+        return quantity, None
+    packages = math.ceil(quantity / size - EPSILON)
+    return packages * size, packages
+
+
+def plan_orders(
+    items: Iterable[InventoryManagerItem], cover_days: float
+) -> list[dict[str, Any]]:
+    """
+    Return the orders of all items in warning, grouped by vendor.
+
+    Orders bring the supply up to the reorder point plus the consumption of
+    the covered days. Everything is derived from the current statistics of
+    the items in one pass, no history is replayed.
+    """
+    orders: dict[str, list[dict[str, Any]]] = {}
+    for item in items:
+        daily = item.daily_consumption()
+        if daily <= 0 or not item.is_warning():
+            continue
+        supply = item.get(InventoryManagerEntityType.SUPPLY)
+        point = item.reorder_point()
+        shortfall = point + daily * cover_days - supply
+        if shortfall <= 0:
+            continue
+        quantity, packages = round_to_packages(shortfall, item.data.get(CONF_ITEM_SIZE))
+        entity = item.entity(InventoryManagerEntityType.SUPPLY)
+        orders.setdefault(item.data.get(CONF_ITEM_VENDOR) or "", []).append(
+            {
+                ATTR_ITEM: item.title,
+                ATTR_ENTITY_ID: getattr(entity, "entity_id", None),
+                ATTR_SUPPLY: supply,
+                ATTR_REORDER_POINT: round(point, 2),
+                ATTR_QUANTITY: round(quantity, 2),
+                ATTR_PACKAGES: packages,
+            }
+        )
+    return [
+        {ATTR_VENDOR: vendor or None, ATTR_ITEMS: orders[vendor]}
+        for vendor in sorted(orders)
+    ]
@@ -0,0 +1,138 @@
+"""Integration-wide scheduler waking items and doses at their next deadline."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING, Protocol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SCHEDULER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduledTarget(Protocol):
+    """Something to wake at a deadline."""
+
+    def async_deadline_reached(self) -> None:
+        """Handle that the deadline has been reached."""
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> InventoryManagerScheduler:
+    """Return the scheduler shared by all config entries."""
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = InventoryManagerScheduler(hass)
+    return hass.data[DATA_SCHEDULER]
+
+
+class InventoryManagerScheduler:
+    """
+    Wake targets at their deadline.
+
+    Targets are items, at the moment their derived state changes, and dose
+    slots, at the moment they are due. Deadlines of all targets are kept in
+    one heap and a single timer is armed for the earliest one. Rescheduling
+    a target does not remove its old heap entry, outdated entries are
+    skipped when they come up. All targets due at the same time are woken
+    in one pass.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new scheduler."""
+        self.hass = hass
+        self._heap: list[tuple[datetime, int, ScheduledTarget]] = []
+        self._deadlines: dict[ScheduledTarget, datetime] = {}
+        self._counter = itertools.count()
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_at: datetime | None = None
+
+    @callback
+    def async_schedule(
+        self, target: ScheduledTarget, deadline: datetime | None
+    ) -> None:
+        """Set the next deadline of a target, or remove it if None."""
+        if deadline is None:
+            self.async_unschedule(target)
+            return
+        if self._deadlines.get(target) == deadline:
+            return
+        self._deadlines[target] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), target))
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._async_compact()
+        self._async_arm()
+
+    @callback
+    def async_unschedule(self, target: ScheduledTarget) -> None:
+        """Remove the deadline of a target."""
+        if self._deadlines.pop(target, None) is not None and not self._deadlines:
+            self._heap.clear()
+            self._async_disarm()
+
+    @callback
+    def async_remove(self, targets: Iterable[ScheduledTarget]) -> None:
+        """Remove targets for good, including outdated entries referencing them."""
+        for target in targets:
+            self._deadlines.pop(target, None)
+        self._async_compact()
+        self._async_arm()
+
+    @callback
+    def _async_compact(self) -> None:
+        """Rebuild the heap without outdated entries."""
+        self._heap = [
+            (deadline, next(self._counter), target)
+            for target, deadline in self._deadlines.items()
+        ]
+        heapq.heapify(self._heap)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest deadline, if it changed."""
+        if not self._heap:
+            self._async_disarm()
+            return
+        deadline = self._heap[0][0]
+        if self._timer is not None and self._timer_at == deadline:
+            return
+        self._async_disarm()
+        self._timer_at = deadline
+        self._timer = async_track_point_in_utc_time(
+            self.hass, self._async_fire, deadline
+        )
+
+    @callback
+    def _async_disarm(self) -> None:
+        if self._timer is not None:
+            self._timer()
+        self._timer = None
+        self._timer_at = None
+
+    @callback
+    def _async_fire(self, _now: datetime) -> None:
+        """Wake all targets whose deadline has passed."""
+        self._timer = None
+        self._timer_at = None
+        now = dt_util.utcnow()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, target = heapq.heappop(self._heap)
+            # Skip entries that have been superseded or removed
+            if self._deadlines.get(target) == deadline:
+                del self._deadlines[target]
+                due.append(target)
+
+        _LOGGER.debug("Deadline reached for %i targets", len(due))
+        for target in due:
+            target.async_deadline_reached()
+        self._async_arm()
@@ -7,34 +7,58 @@ The sensor predicts when we run out of supplies.
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
+from homeassistant.const import EntityCategory, Platform
+from homeassistant.core import callback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import now
 
 from .const import (
+    ATTR_AMOUNT,
+    ATTR_DAILY,
     ATTR_DAYS_REMAINING,
-    ENTITY_ID,
+    ATTR_FORECAST,
+    ATTR_ITEM,
+    DOMAIN,
+    NO_CONSUMPTION_DAYS,
+    STRING_DEBUG_ENTITY,
+    STRING_EXPIRES_SOONEST_ENTITY,
+    STRING_NEXT_EMPTY_ENTITY,
     STRING_SENSOR_ENTITY,
-    UNIQUE_ID,
+    STRING_WARNING_COUNT_ENTITY,
 )
+from .coordinator import InventoryManagerCoordinator, is_hub
 from .entity import InventoryManagerEntity, InventoryManagerEntityType
+from .forecast import PERCENTILES
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
+    from .aggregate import InventoryManagerAggregate
     from .coordinator import InventoryManagerItem
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only the debug sensor is polled
+SCAN_INTERVAL = timedelta(seconds=60)
 
 SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
     SensorEntityDescription(
@@ -46,70 +70,281 @@ SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
 )
 
 
+def _next_expiry(aggregate: InventoryManagerAggregate) -> date | None:
+    next_expiry = aggregate.next_expiry()
+    return next_expiry[0][0] if next_expiry is not None else None
+
+
+def _next_expiry_lot(aggregate: InventoryManagerAggregate) -> dict[str, Any]:
+    next_expiry = aggregate.next_expiry()
+    if next_expiry is None:
+        return {ATTR_ITEM: None, ATTR_AMOUNT: None}
+    (_, amount), item = next_expiry
+    return {ATTR_ITEM: item.title, ATTR_AMOUNT: amount}
+
+
+def _next_empty_at(aggregate: InventoryManagerAggregate) -> datetime | None:
+    next_empty = aggregate.next_empty()
+    return next_empty[0] if next_empty is not None else None
+
+
+def _next_empty_item(aggregate: InventoryManagerAggregate) -> dict[str, Any]:
+    next_empty = aggregate.next_empty()
+    return {ATTR_ITEM: next_empty[1].title if next_empty is not None else None}
+
+
+@dataclass(frozen=True, kw_only=True)
+class InventoryManagerAggregateSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor summarizing all items of a config entry."""
+
+    value_fn: Callable[[InventoryManagerAggregate], StateType | date | datetime]
+    attributes_fn: Callable[[InventoryManagerAggregate], dict[str, Any]] | None = None
+
+
+AGGREGATE_SENSOR_TYPES: tuple[InventoryManagerAggregateSensorEntityDescription, ...] = (
+    InventoryManagerAggregateSensorEntityDescription(
+        key="warning_count",
+        translation_key=STRING_WARNING_COUNT_ENTITY,
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.warning_count,
+    ),
+    InventoryManagerAggregateSensorEntityDescription(
+        key="next_empty",
+        translation_key=STRING_NEXT_EMPTY_ENTITY,
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=_next_empty_at,
+        attributes_fn=_next_empty_item,
+    ),
+)
+
+# Entries with a single item have these as well
+EXPIRY_SENSOR_TYPES: tuple[InventoryManagerAggregateSensorEntityDescription, ...] = (
+    InventoryManagerAggregateSensorEntityDescription(
+        key="expires_soonest",
+        translation_key=STRING_EXPIRES_SOONEST_ENTITY,
+        icon="mdi:calendar-alert",
+        device_class=SensorDeviceClass.DATE,
+        value_fn=_next_expiry,
+        attributes_fn=_next_expiry_lot,
+    ),
+)
+
+
 async def async_setup_entry(
-    _hass: HomeAssistant,
+    hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up sensors from a config entry created in the integrations UI."""
+    entity_ids = config_entry.runtime_data.coordinator.async_allocate_entity_ids(
+        Platform.SENSOR, [InventoryManagerEntityType.EMPTYPREDICTION]
+    )
     sensors = [
         EmptyPredictionSensor(
-            config_entry.runtime_data.coordinator,
+            item,
             description,
+            entity_ids[item.item_id, InventoryManagerEntityType.EMPTYPREDICTION],
         )
+        for item in config_entry.runtime_data.coordinator.items.values()
         for description in SENSOR_TYPES
     ]
-    async_add_entities(sensors, update_before_add=True)
+    async_add_entities(sensors, update_before_add=False)
+
+    # Hubs also summarize their items
+    descriptions = EXPIRY_SENSOR_TYPES
+    if is_hub(config_entry):
+        descriptions = AGGREGATE_SENSOR_TYPES + EXPIRY_SENSOR_TYPES
+    async_add_entities(
+        InventoryAggregateSensor(config_entry.runtime_data.coordinator, description)
+        for description in descriptions
+    )
+
+    if is_hub(config_entry):
+        async_add_entities(
+            [InventoryDebugSensor(config_entry.runtime_data.coordinator)],
+            update_before_add=True,
+        )
+    else:
+        _async_remove_debug_sensor(hass, config_entry)
+
+
+@callback
+def _async_remove_debug_sensor(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the debug sensor that single item entries used to have."""
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{config_entry.entry_id}_debug"
+    )
+    if entity_id is not None:
+        registry.async_remove(entity_id)
+
+
+def _entry_device_info(coordinator: InventoryManagerCoordinator) -> DeviceInfo:
+    """Return the device of a hub, or of the item of a single item entry."""
+    config_entry = coordinator.config_entry
+    if not is_hub(config_entry):
+        return coordinator.items[config_entry.entry_id].device_info
+    return DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        entry_type=DeviceEntryType.SERVICE,
+        name=config_entry.title,
+    )
 
 
 class EmptyPredictionSensor(InventoryManagerEntity, SensorEntity):
     """Represents a sensor to predict when we run out of supplies."""
 
     entity_description: SensorEntityDescription
+    entity_type = InventoryManagerEntityType.EMPTYPREDICTION
 
     _attr_should_poll = False
 
+    # Attributes changing with every change of supply
+    _unrecorded_attributes = frozenset({ATTR_DAYS_REMAINING, ATTR_FORECAST})
+
     def __init__(
         self,
         item: InventoryManagerItem,
         description: SensorEntityDescription,
+        entity_id: str,
     ) -> None:
         """Construct a new EmptyPredictionSensor."""
-        super().__init__(item)
+        super().__init__(item, entity_id)
         self.entity_description = description
         _LOGGER.debug("Initializing EmptyPredictionSensor")
 
         self.platform = entity_platform.async_get_current_platform()
 
-        self.coordinator.entity[InventoryManagerEntityType.EMPTYPREDICTION] = self
-
-        entity_config: dict = item.entity_config[
-            InventoryManagerEntityType.EMPTYPREDICTION
-        ]
-
-        self._available = True
-        self.unique_id = entity_config[UNIQUE_ID]
-        self._attr_extra_state_attributes = {}
-        self.entity_id = entity_config[ENTITY_ID]
-        self._attr_native_value: datetime = now() + timedelta(days=10000)
+        self._attr_extra_state_attributes: dict[str, Any] = {}
+        self._attr_native_value: datetime = now() + timedelta(days=NO_CONSUMPTION_DAYS)
 
     async def async_added_to_hass(self) -> None:
-        """Call update to get initial state after entity is added."""
+        """Calculate the initial state, which is written once the entity is added."""
         await super().async_added_to_hass()
-        self.update()
+        self._calculate()
 
     def update(self) -> None:
         """Recalculate the remaining time until supply is empty."""
         _LOGGER.debug("Updating sensor")
+        start = time.perf_counter_ns()
+        if self._calculate():
+            self.coordinator.schedule_write(self)
+        else:
+            self.coordinator.stats.count(self.item.item_id, "writes_suppressed")
+        self.coordinator.stats.time("sensor_update", start)
 
-        self._attr_extra_state_attributes[ATTR_DAYS_REMAINING] = (
-            self.coordinator.days_remaining()
-        )
-        self._attr_native_value = now() + timedelta(
-            days=self.coordinator.days_remaining()
-        )
+    def _calculate(self) -> bool:
+        """
+        Calculate state and attributes, return whether they changed.
+
+        Days remaining are only taken over along with the anchored
+        prediction, such that they do not change the state on their own.
+        """
+        empty_at = self.item.predicted_empty_at()
+        daily = self.item.daily_consumption()
+        forecast = self.item.forecast_dates()
+        attributes = {
+            ATTR_DAYS_REMAINING: self.item.days_remaining(),
+            ATTR_DAILY: daily,
+        }
+        if forecast is not None:
+            attributes[ATTR_FORECAST] = dict(
+                zip((f"p{p}" for p in PERCENTILES), forecast, strict=True)
+            )
+        previous = self._attr_extra_state_attributes
+        if (
+            empty_at == self._attr_native_value
+            and ATTR_DAYS_REMAINING in previous
+            and attributes.keys() == previous.keys()
+            and all(
+                attributes[key] == previous[key]
+                for key in attributes
+                if key != ATTR_DAYS_REMAINING
+            )
+        ):
+            return False
+        self._attr_extra_state_attributes = attributes
+        self._attr_native_value = empty_at
         _LOGGER.debug(
             "Setting native value of %s to %s", self.entity_id, self._attr_native_value
         )
-        self._available = True
-        self.schedule_update_ha_state()
+        return True
+
+
+class InventoryAggregateSensor(
+    CoordinatorEntity[InventoryManagerCoordinator], SensorEntity
+):
+    """Represents a sensor summarizing all items of a config entry."""
+
+    entity_description: InventoryManagerAggregateSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: InventoryManagerCoordinator,
+        description: InventoryManagerAggregateSensorEntityDescription,
+    ) -> None:
+        """Create a new aggregate sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{description.key}"
+        self._attr_device_info = _entry_device_info(coordinator)
+        coordinator.aggregate_entities.append(self)
+
+    async def async_update(self) -> None:
+        """Read the aggregate when written, instead of refreshing the coordinator."""
+
+    @property
+    def native_value(self) -> StateType | date | datetime:
+        """Return the aggregate of all items."""
+        return self.entity_description.value_fn(self.coordinator.aggregate)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return details of the aggregate."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.aggregate)
+
+
+class InventoryDebugSensor(
+    CoordinatorEntity[InventoryManagerCoordinator], SensorEntity
+):
+    """
+    Represents a sensor showing the counters of a hub.
+
+    The sensor is disabled by default. Once enabled, it is polled every
+    SCAN_INTERVAL instead of being written on every change. Timings change
+    on every poll, so they are left to the diagnostics.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:bug-outline"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_translation_key = STRING_DEBUG_ENTITY
+
+    def __init__(self, coordinator: InventoryManagerCoordinator) -> None:
+        """Create a new debug sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_debug"
+        self._attr_device_info = _entry_device_info(coordinator)
+
+    @property
+    def should_poll(self) -> bool:
+        """Poll the sensor, coordinator entities are not polled otherwise."""
+        return True
+
+    async def async_update(self) -> None:
+        """Read the statistics, without refreshing the coordinator."""
+        statistics = self.coordinator.statistics()
+        self._attr_native_value = statistics["totals"].get("service_calls", 0)
+        self._attr_extra_state_attributes = {
+            key: value
+            for key, value in statistics.items()
+            if key not in ("durations_s", "timings")
+        }
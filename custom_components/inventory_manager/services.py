@@ -0,0 +1,371 @@
+"""Domain services for inventory manager."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_DAYS_REMAINING,
+    ATTR_EMPTY_AT,
+    ATTR_ITEM,
+    ATTR_ITEMS,
+    ATTR_ORDERS,
+    ATTR_SUPPLY,
+    CONF_ITEM_AGENT,
+    CONF_ITEM_UNIT,
+    CONF_ITEM_VENDOR,
+    DEFAULT_COVER_DAYS,
+    DOMAIN,
+    SERVICE_ACTION,
+    SERVICE_AGENT,
+    SERVICE_AMOUNT,
+    SERVICE_AMOUNT_SPECIFICATION,
+    SERVICE_BATCH,
+    SERVICE_CONFIG_ENTRY,
+    SERVICE_CONSUME,
+    SERVICE_COVER_DAYS,
+    SERVICE_DAYS_REMAINING_BELOW,
+    SERVICE_EXPIRY,
+    SERVICE_EXPORT_ITEMS,
+    SERVICE_FILE,
+    SERVICE_FORMAT,
+    SERVICE_IMPORT_ITEMS,
+    SERVICE_ITEM,
+    SERVICE_OPERATIONS,
+    SERVICE_PLAN_ORDERS,
+    SERVICE_PREDEFINED_AMOUNT,
+    SERVICE_QUERY,
+    SERVICE_STORE,
+    SERVICE_UNIT,
+    SERVICE_VENDOR,
+    UNIT_PCS,
+)
+from .coordinator import is_hub
+from .entity import InventoryManagerEntityType
+from .ledger import LedgerEventKind
+from .planner import plan_orders
+from .transfer import FORMATS, async_export_items, async_import_items, file_format
+
+if TYPE_CHECKING:
+    from .coordinator import InventoryManagerItem
+    from .data import InventoryManagerConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+DOSES = [
+    InventoryManagerEntityType.MORNING,
+    InventoryManagerEntityType.NOON,
+    InventoryManagerEntityType.EVENING,
+    InventoryManagerEntityType.NIGHT,
+    InventoryManagerEntityType.WEEK,
+    InventoryManagerEntityType.MONTH,
+]
+
+OPERATION_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(SERVICE_ITEM): cv.entity_id,
+            vol.Optional(SERVICE_ACTION, default=SERVICE_CONSUME): vol.In(
+                [SERVICE_CONSUME, SERVICE_STORE]
+            ),
+            vol.Exclusive(SERVICE_AMOUNT, SERVICE_AMOUNT_SPECIFICATION): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            vol.Exclusive(
+                SERVICE_PREDEFINED_AMOUNT, SERVICE_AMOUNT_SPECIFICATION
+            ): vol.In([dose.name.lower() for dose in DOSES]),
+            vol.Optional(SERVICE_EXPIRY): cv.date,
+        }
+    ),
+    cv.has_at_least_one_key(SERVICE_AMOUNT, SERVICE_PREDEFINED_AMOUNT),
+)
+
+BATCH_SCHEMA = vol.Schema(
+    {vol.Required(SERVICE_OPERATIONS): vol.All(cv.ensure_list, [OPERATION_SCHEMA])}
+)
+
+TRANSFER_SCHEMA = vol.Schema(
+    {
+        vol.Required(SERVICE_FILE): cv.string,
+        vol.Optional(SERVICE_FORMAT): vol.In(FORMATS),
+        vol.Optional(SERVICE_CONFIG_ENTRY): cv.string,
+    }
+)
+
+# Query fields and the options they match
+QUERY_OPTIONS = {
+    SERVICE_VENDOR: CONF_ITEM_VENDOR,
+    SERVICE_AGENT: CONF_ITEM_AGENT,
+    SERVICE_UNIT: CONF_ITEM_UNIT,
+}
+
+QUERY_SCHEMA = vol.Schema(
+    {
+        **{vol.Optional(field): cv.string for field in QUERY_OPTIONS},
+        vol.Optional(SERVICE_DAYS_REMAINING_BELOW): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+PLAN_ORDERS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(SERVICE_COVER_DAYS, default=DEFAULT_COVER_DAYS): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BATCH,
+        _async_batch,
+        schema=BATCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_ITEMS,
+        _async_import_items,
+        schema=TRANSFER_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_ITEMS,
+        _async_export_items,
+        schema=TRANSFER_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY,
+        _async_query,
+        schema=QUERY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAN_ORDERS,
+        _async_plan_orders,
+        schema=PLAN_ORDERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def _supply_entities(hass: HomeAssistant) -> dict[str, InventoryManagerItem]:
+    """Map the entity ids of all supply entities to their items."""
+    supply_entities = {}
+    for coordinator in hass.data.get(DOMAIN, {}).values():
+        for item in coordinator.items.values():
+            entity = item.entity(InventoryManagerEntityType.SUPPLY)
+            if entity is not None:
+                supply_entities[entity.entity_id] = item
+    return supply_entities
+
+
+async def _async_batch(call: ServiceCall) -> ServiceResponse:
+    """Consume from and store to many items at once."""
+    operations = call.data[SERVICE_OPERATIONS]
+    supply_entities = _supply_entities(call.hass)
+
+    # Validate the complete list before changing anything
+    unknown = {
+        operation[SERVICE_ITEM]
+        for operation in operations
+        if operation[SERVICE_ITEM] not in supply_entities
+    }
+    if unknown:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unknown_items",
+            translation_placeholders={"items": ", ".join(sorted(unknown))},
+        )
+
+    # Apply all operations of an item in order, but set the item only once
+    supplies: dict[str, float] = {}
+    for operation in operations:
+        item = supply_entities[operation[SERVICE_ITEM]]
+        item.coordinator.stats.count(item.item_id, "service_calls")
+        supply = supplies.get(
+            operation[SERVICE_ITEM], item.get(InventoryManagerEntityType.SUPPLY)
+        )
+        if SERVICE_PREDEFINED_AMOUNT in operation:
+            amount = item.get(
+                InventoryManagerEntityType[operation[SERVICE_PREDEFINED_AMOUNT].upper()]
+            )
+        else:
+            amount = operation[SERVICE_AMOUNT]
+        if operation[SERVICE_ACTION] == SERVICE_STORE:
+            supplies[operation[SERVICE_ITEM]] = supply + amount
+            kind = LedgerEventKind.STORE
+            if SERVICE_EXPIRY in operation:
+                item.add_lot(operation[SERVICE_EXPIRY], amount)
+        else:
+            # Only what is left is consumed and recorded
+            amount = min(amount, supply)
+            supplies[operation[SERVICE_ITEM]] = supply - amount
+            kind = LedgerEventKind.CONSUME
+            item.draw_lots(amount)
+        if amount != 0:
+            item.record(kind, amount)
+
+    _LOGGER.debug("Applying %i operations to %i items", len(operations), len(supplies))
+    result = {}
+    coordinators = set()
+    for entity_id, supply in supplies.items():
+        item = supply_entities[entity_id]
+        item.set(InventoryManagerEntityType.SUPPLY, supply)
+        coordinators.add(item.coordinator)
+        result[entity_id] = {
+            ATTR_SUPPLY: item.get(InventoryManagerEntityType.SUPPLY),
+            ATTR_DAYS_REMAINING: item.days_remaining(),
+        }
+    # Blocking calls return with the states written
+    for coordinator in coordinators:
+        await coordinator.async_flushed()
+    return {ATTR_ITEMS: result}
+
+
+def _file_path(hass: HomeAssistant, file: str) -> Path:
+    """Return the path of a file in the config directory or an allowed directory."""
+    path = Path(hass.config.path(file)).resolve()
+    if not (
+        path.is_relative_to(Path(hass.config.config_dir).resolve())
+        or hass.config.is_allowed_path(str(path))
+    ):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="path_not_allowed",
+            translation_placeholders={"file": file},
+        )
+    return path
+
+
+def _loaded_entries(hass: HomeAssistant) -> list[InventoryManagerConfigEntry]:
+    """Return the config entries that have been set up."""
+    return [
+        entry
+        for entry in hass.config_entries.async_loaded_entries(DOMAIN)
+        if entry.entry_id in hass.data.get(DOMAIN, {})
+    ]
+
+
+async def _async_import_items(call: ServiceCall) -> ServiceResponse:
+    """Create or update the items of a hub from a file."""
+    hubs = {
+        entry.entry_id: entry for entry in _loaded_entries(call.hass) if is_hub(entry)
+    }
+    entry_id = call.data.get(SERVICE_CONFIG_ENTRY)
+    if entry_id is None and len(hubs) == 1:
+        (entry_id,) = hubs
+    if entry_id not in hubs:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="hub_required"
+        )
+
+    path = _file_path(call.hass, call.data[SERVICE_FILE])
+    return await async_import_items(
+        call.hass,
+        hubs[entry_id],
+        path,
+        file_format(path, call.data.get(SERVICE_FORMAT)),
+    )
+
+
+async def _async_export_items(call: ServiceCall) -> ServiceResponse:
+    """Write the items of one or all config entries to a file."""
+    entries = _loaded_entries(call.hass)
+    if SERVICE_CONFIG_ENTRY in call.data:
+        entries = [
+            entry
+            for entry in entries
+            if entry.entry_id == call.data[SERVICE_CONFIG_ENTRY]
+        ]
+        if not entries:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="unknown_entry",
+                translation_placeholders={"entry": call.data[SERVICE_CONFIG_ENTRY]},
+            )
+
+    path = _file_path(call.hass, call.data[SERVICE_FILE])
+    exported = await async_export_items(
+        call.hass,
+        [entry.runtime_data.coordinator for entry in entries],
+        path,
+        file_format(path, call.data.get(SERVICE_FORMAT)),
+    )
+    return {"exported": exported}
+
+
+async def _async_query(call: ServiceCall) -> ServiceResponse:
+    """Return the items matching options and running out within some days."""
+    options = {
+        option: call.data[field]
+        for field, option in QUERY_OPTIONS.items()
+        if field in call.data
+    }
+    now = dt_util.utcnow()
+    empty_before = (
+        now + timedelta(days=call.data[SERVICE_DAYS_REMAINING_BELOW])
+        if SERVICE_DAYS_REMAINING_BELOW in call.data
+        else None
+    )
+
+    items: list[InventoryManagerItem] = []
+    for coordinator in call.hass.data.get(DOMAIN, {}).values():
+        start = time.perf_counter_ns()
+        items.extend(coordinator.index.find(options, empty_before))
+        coordinator.stats.time("query", start)
+    items.sort(key=lambda item: item.empty_at())
+
+    result = []
+    for item in items:
+        supply = item.entity(InventoryManagerEntityType.SUPPLY)
+        empty_at = item.empty_at()
+        result.append(
+            {
+                ATTR_ITEM: item.title,
+                ATTR_ENTITY_ID: getattr(supply, "entity_id", None),
+                ATTR_SUPPLY: item.get(InventoryManagerEntityType.SUPPLY),
+                SERVICE_UNIT: item.data.get(CONF_ITEM_UNIT, UNIT_PCS),
+                SERVICE_VENDOR: item.data.get(CONF_ITEM_VENDOR),
+                SERVICE_AGENT: item.data.get(CONF_ITEM_AGENT),
+                ATTR_DAYS_REMAINING: max((empty_at - now) / timedelta(days=1), 0.0),
+                ATTR_EMPTY_AT: empty_at.isoformat(),
+            }
+        )
+    return {ATTR_ITEMS: result}
+
+
+async def _async_plan_orders(call: ServiceCall) -> ServiceResponse:
+    """Return the orders needed for all items, grouped by vendor."""
+    items = (
+        item
+        for coordinator in call.hass.data.get(DOMAIN, {}).values()
+        for item in coordinator.items.values()
+    )
+    return {ATTR_ORDERS: plan_orders(items, call.data[SERVICE_COVER_DAYS])}
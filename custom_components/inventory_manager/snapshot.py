@@ -0,0 +1,83 @@
+"""Snapshot of the numbers of all items, restored in bulk at setup."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SNAPSHOT, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import InventoryManagerItem
+
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 1
+
+# Changes are written to disk in batches, and when Home Assistant stops
+SAVE_DELAY = 30
+
+
+@callback
+def async_get_snapshot(hass: HomeAssistant) -> InventoryManagerSnapshot:
+    """Return the snapshot shared by all config entries."""
+    if DATA_SNAPSHOT not in hass.data:
+        hass.data[DATA_SNAPSHOT] = InventoryManagerSnapshot(hass)
+    return hass.data[DATA_SNAPSHOT]
+
+
+class InventoryManagerSnapshot:
+    """
+    Keep the numbers of all items in one store.
+
+    The store is loaded once, so items are hydrated before their entities
+    are added, instead of every number entity looking up its last state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create a new snapshot."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._items: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshot from disk."""
+        data = await self._store.async_load()
+        if data is not None:
+            self._items = data.get("items", {})
+
+    @callback
+    def async_restore(self, item: InventoryManagerItem) -> bool:
+        """Hydrate an item from the snapshot, return whether it was found."""
+        data = self._items.get(item.item_id)
+        if data is None:
+            return False
+        item.restore(data["numbers"], data["changed_at"], data.get("lots"))
+        return True
+
+    @callback
+    def async_update(self, item: InventoryManagerItem) -> None:
+        """Take over the current numbers of an item."""
+        self._items[item.item_id] = item.as_snapshot()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_store(self, item_id: str, numbers: dict[str, float]) -> None:
+        """Store the numbers of an item that is not set up yet."""
+        self._items[item_id] = {
+            "numbers": numbers,
+            "changed_at": dt_util.utcnow().timestamp(),
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_forget(self, item_id: str) -> None:
+        """Remove a removed item from the snapshot."""
+        if self._items.pop(item_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"items": self._items}
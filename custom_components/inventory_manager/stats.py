@@ -0,0 +1,92 @@
+"""Counters and timings of the work done by a config entry."""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Any
+
+# Durations are counted in buckets of powers of two microseconds, the last
+# bucket counts everything longer
+HISTOGRAM_BUCKETS = 16
+
+
+class Histogram:
+    """Count durations in buckets growing by powers of two."""
+
+    __slots__ = ("buckets", "count", "max_ns", "total_ns")
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns: int) -> None:
+        """Count one duration."""
+        index = min((duration_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with durations in microseconds."""
+        buckets = {}
+        for index, count in enumerate(self.buckets):
+            if count:
+                label = (
+                    f">={1 << (index - 1)}us"
+                    if index == HISTOGRAM_BUCKETS - 1
+                    else f"<{1 << index}us"
+                )
+                buckets[label] = count
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "max_us": self.max_ns / 1000,
+            "buckets": buckets,
+        }
+
+
+class InventoryManagerStats:
+    """
+    Count calls and time the hot paths of one config entry.
+
+    Counting is a dictionary update and timing two reads of the performance
+    counter, so statistics are always collected. All counting happens on
+    the event loop.
+    """
+
+    def __init__(self) -> None:
+        """Create empty statistics."""
+        self.totals: Counter[str] = Counter()
+        self.items: dict[str, Counter[str]] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.durations: dict[str, float] = {}
+
+    def count(self, item_id: str, key: str) -> None:
+        """Count one call for an item and in total."""
+        self.totals[key] += 1
+        counters = self.items.get(item_id)
+        if counters is None:
+            counters = self.items[item_id] = Counter()
+        counters[key] += 1
+
+    def time(self, key: str, start_ns: int) -> None:
+        """Count the time passed since a reading of the performance counter."""
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.add(time.perf_counter_ns() - start_ns)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals, durations and histograms."""
+        return {
+            "totals": dict(self.totals),
+            "durations_s": dict(self.durations),
+            "timings": {
+                key: histogram.as_dict() for key, histogram in self.histograms.items()
+            },
+        }
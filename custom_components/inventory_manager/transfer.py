@@ -0,0 +1,330 @@
+"""Import and export of items as CSV or JSON Lines files."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import logging
+import uuid
+from typing import TYPE_CHECKING, Any, TextIO
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import callback
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import (
+    CONF_AUTO_CONSUME,
+    CONF_EVENING_TIME,
+    CONF_FORECAST,
+    CONF_ITEM_AGENT,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_SIZE,
+    CONF_ITEM_TITLE,
+    CONF_ITEM_UNIT,
+    CONF_ITEM_VENDOR,
+    CONF_ITEMS,
+    CONF_LEAD_TIME,
+    CONF_LEARN_CONSUMPTION,
+    CONF_MORNING_TIME,
+    CONF_NIGHT_TIME,
+    CONF_NOON_TIME,
+    CONF_PREDICTION_RESOLUTION,
+    CONF_SENSOR_BEFORE_EMPTY,
+    CONF_SERVICE_LEVEL,
+    CONF_TRIGGER_AMOUNT,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_MODE,
+    DOMAIN,
+    TRIGGER_MODES,
+)
+from .coordinator import build_entry_title, build_item
+from .entity import NUMBER_INDEX, InventoryManagerEntityType
+from .ledger import LedgerEventKind
+from .planner import SERVICE_LEVEL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import InventoryManagerCoordinator, InventoryManagerItem
+    from .data import InventoryManagerConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+FORMATS = [FORMAT_CSV, FORMAT_JSON]
+
+# Rows read or written per job in the executor
+BATCH_SIZE = 500
+
+COLUMN_ITEM_ID = "item_id"
+COLUMN_TITLE = "title"
+COLUMN_DAYS_REMAINING = "days_remaining"
+
+# Defaults of new items, as in the config flow
+NEW_ITEM_DEFAULTS = {CONF_ITEM_MAX_CONSUMPTION: 5.0, CONF_SENSOR_BEFORE_EMPTY: 10}
+
+
+def _time(value: Any) -> str:
+    """Validate a time of day in the form stored by the time selector."""
+    return cv.time(value).isoformat()
+
+
+CONFIG_COLUMNS = {
+    CONF_ITEM_NAME: cv.string,
+    CONF_ITEM_SIZE: cv.positive_int,
+    CONF_ITEM_UNIT: cv.string,
+    CONF_ITEM_AGENT: cv.string,
+    CONF_ITEM_VENDOR: cv.string,
+    CONF_ITEM_MAX_CONSUMPTION: cv.positive_float,
+    CONF_SENSOR_BEFORE_EMPTY: cv.positive_int,
+    CONF_LEAD_TIME: cv.positive_int,
+    CONF_SERVICE_LEVEL: SERVICE_LEVEL,
+    CONF_PREDICTION_RESOLUTION: cv.positive_int,
+    CONF_LEARN_CONSUMPTION: cv.boolean,
+    CONF_FORECAST: cv.boolean,
+    CONF_AUTO_CONSUME: cv.boolean,
+    CONF_MORNING_TIME: _time,
+    CONF_NOON_TIME: _time,
+    CONF_EVENING_TIME: _time,
+    CONF_NIGHT_TIME: _time,
+    CONF_TRIGGER_ENTITY: cv.entity_id,
+    CONF_TRIGGER_MODE: vol.In(TRIGGER_MODES),
+    CONF_TRIGGER_AMOUNT: cv.positive_float,
+}
+
+NUMBER_COLUMNS = {entity_type.name.lower(): entity_type for entity_type in NUMBER_INDEX}
+
+ROW_SCHEMA = vol.Schema(
+    {
+        vol.Optional(COLUMN_ITEM_ID): cv.string,
+        **{
+            vol.Optional(column): validator
+            for column, validator in CONFIG_COLUMNS.items()
+        },
+        **{
+            vol.Optional(column): vol.All(vol.Coerce(float), vol.Range(min=0))
+            for column in NUMBER_COLUMNS
+        },
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+EXPORT_COLUMNS = [
+    COLUMN_ITEM_ID,
+    COLUMN_TITLE,
+    *CONFIG_COLUMNS,
+    *NUMBER_COLUMNS,
+    COLUMN_DAYS_REMAINING,
+]
+
+
+def file_format(path: Path, requested: str | None) -> str:
+    """Return the requested format, or the format matching the file name."""
+    if requested is not None:
+        return requested
+    return FORMAT_CSV if path.suffix.lower() == ".csv" else FORMAT_JSON
+
+
+def _read_rows(handle: TextIO, fmt: str) -> Iterator[dict[str, Any]]:
+    """Iterate over the rows of a file without reading it at once."""
+    if fmt == FORMAT_CSV:
+        yield from csv.DictReader(handle)
+        return
+    for line in handle:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _read_batch(rows: Iterator[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Read the next batch of rows, in the executor."""
+    return list(itertools.islice(rows, BATCH_SIZE))
+
+
+def _write_rows(handle: TextIO, fmt: str, rows: list[dict[str, Any]]) -> None:
+    """Append rows to a file, in the executor."""
+    if fmt == FORMAT_CSV:
+        csv.DictWriter(handle, EXPORT_COLUMNS).writerows(rows)
+    else:
+        handle.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+def _write_header(handle: TextIO, fmt: str) -> None:
+    """Start a file, in the executor."""
+    if fmt == FORMAT_CSV:
+        csv.DictWriter(handle, EXPORT_COLUMNS).writeheader()
+
+
+def _export_row(item: InventoryManagerItem) -> dict[str, Any]:
+    """Return the configuration and numbers of an item as a row."""
+    return {
+        COLUMN_ITEM_ID: item.item_id,
+        COLUMN_TITLE: item.title,
+        **{
+            column: item.data[column]
+            for column in CONFIG_COLUMNS
+            if item.data.get(column) is not None
+        },
+        **{
+            column: item.get(entity_type)
+            for column, entity_type in NUMBER_COLUMNS.items()
+        },
+        COLUMN_DAYS_REMAINING: item.days_remaining(),
+    }
+
+
+def _invalid_row(row: int, error: str) -> ServiceValidationError:
+    return ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="invalid_row",
+        translation_placeholders={"row": str(row), "error": error},
+    )
+
+
+def _file_error(path: Path, error: Exception) -> ServiceValidationError:
+    return ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="file_error",
+        translation_placeholders={"file": str(path), "error": str(error)},
+    )
+
+
+class _ItemImport:
+    """Collect the items and numbers of the rows of a file."""
+
+    def __init__(self, items: dict[str, Any]) -> None:
+        self.items = dict(items)
+        self.ids_by_title = {
+            item[CONF_ITEM_TITLE]: item_id for item_id, item in self.items.items()
+        }
+        self.numbers: dict[str, dict[InventoryManagerEntityType, float]] = {}
+        self.created = 0
+        self.updated = 0
+        self.rows = 0
+
+    def add(self, row: dict[str, Any]) -> None:
+        """Validate a row, where empty cells are left out, and take it over."""
+        self.rows += 1
+        if not isinstance(row, dict):
+            raise _invalid_row(self.rows, "rows must be objects")
+        try:
+            data = ROW_SCHEMA({key: value for key, value in row.items() if value != ""})
+        except vol.Invalid as err:
+            raise _invalid_row(self.rows, str(err)) from err
+
+        item_id = data.pop(COLUMN_ITEM_ID, None)
+        values = {
+            NUMBER_COLUMNS[column]: data.pop(column)
+            for column in NUMBER_COLUMNS
+            if column in data
+        }
+        if item_id not in self.items:
+            item_id = self.ids_by_title.get(build_entry_title(data))
+        if item_id is None:
+            if CONF_ITEM_NAME not in data:
+                raise _invalid_row(self.rows, f"new items require {CONF_ITEM_NAME}")
+            item_id = uuid.uuid4().hex
+            data = {**NEW_ITEM_DEFAULTS, **data}
+            self.created += 1
+        else:
+            data = {**self.items[item_id][CONF_ITEM_DATA], **data}
+            self.updated += 1
+
+        self.items[item_id] = build_item(data)
+        self.ids_by_title[self.items[item_id][CONF_ITEM_TITLE]] = item_id
+        if values:
+            self.numbers.setdefault(item_id, {}).update(values)
+
+    @callback
+    def async_apply_numbers(self, coordinator: InventoryManagerCoordinator) -> None:
+        """Set the numbers of live items, store those of new items."""
+        for item_id, values in self.numbers.items():
+            item = coordinator.items.get(item_id)
+            if item is None:
+                coordinator.snapshot.async_store(
+                    item_id,
+                    {entity_type.name: value for entity_type, value in values.items()},
+                )
+                continue
+            for entity_type, value in values.items():
+                if entity_type == InventoryManagerEntityType.SUPPLY:
+                    item.record(LedgerEventKind.SET, value)
+                item.set(entity_type, value)
+            # Renamed items are set up again, from the snapshot
+            coordinator.snapshot.async_update(item)
+
+
+async def async_import_items(
+    hass: HomeAssistant, entry: InventoryManagerConfigEntry, path: Path, fmt: str
+) -> dict[str, int]:
+    """
+    Create or update the items of a hub from a file.
+
+    The file is read and validated in batches before anything is changed.
+    Items are matched by item id or by title, otherwise they are created.
+    The hub is updated once, so it is reloaded at most once, and numbers are
+    set on live items or stored in the snapshot for items not set up yet.
+    """
+    item_import = _ItemImport(entry.data.get(CONF_ITEMS, {}))
+    try:
+        handle = await hass.async_add_executor_job(
+            path.open, "r", -1, "utf-8", None, ""
+        )
+    except OSError as err:
+        raise _file_error(path, err) from err
+    try:
+        rows = _read_rows(handle, fmt)
+        while batch := await hass.async_add_executor_job(_read_batch, rows):
+            for row in batch:
+                item_import.add(row)
+    except (OSError, UnicodeDecodeError, csv.Error, json.JSONDecodeError) as err:
+        raise _file_error(path, err) from err
+    finally:
+        await hass.async_add_executor_job(handle.close)
+
+    _LOGGER.debug(
+        "Importing %i new and %i updated items",
+        item_import.created,
+        item_import.updated,
+    )
+    item_import.async_apply_numbers(entry.runtime_data.coordinator)
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_ITEMS: item_import.items}
+    )
+    return {"created": item_import.created, "updated": item_import.updated}
+
+
+async def async_export_items(
+    hass: HomeAssistant,
+    coordinators: Iterable[InventoryManagerCoordinator],
+    path: Path,
+    fmt: str,
+) -> int:
+    """Write the items of config entries to a file, in batches."""
+    exported = 0
+    items = itertools.chain.from_iterable(
+        list(coordinator.items.values()) for coordinator in coordinators
+    )
+    try:
+        handle = await hass.async_add_executor_job(
+            path.open, "w", -1, "utf-8", None, ""
+        )
+        try:
+            await hass.async_add_executor_job(_write_header, handle, fmt)
+            while batch := [
+                _export_row(item) for item in itertools.islice(items, BATCH_SIZE)
+            ]:
+                await hass.async_add_executor_job(_write_rows, handle, fmt, batch)
+                exported += len(batch)
+        finally:
+            await hass.async_add_executor_job(handle.close)
+    except OSError as err:
+        raise _file_error(path, err) from err
+    return exported
@@ -0,0 +1,176 @@
+"""Consume items when the state of another entity changes."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+
+from .const import (
+    CONF_TRIGGER_AMOUNT,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_MODE,
+    DATA_TRIGGERS,
+    TRIGGER_MODE_ON,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from .coordinator import InventoryManagerItem
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds after a first change until it is consumed, along with all changes
+# arriving in between
+APPLY_DELAY = 1.0
+
+# Options affecting the consumption triggered by other entities
+TRIGGER_OPTIONS = frozenset(
+    {CONF_TRIGGER_AMOUNT, CONF_TRIGGER_ENTITY, CONF_TRIGGER_MODE}
+)
+
+
+@callback
+def async_get_triggers(hass: HomeAssistant) -> InventoryManagerTriggers:
+    """Return the triggers shared by all config entries."""
+    if DATA_TRIGGERS not in hass.data:
+        hass.data[DATA_TRIGGERS] = InventoryManagerTriggers(hass)
+    return hass.data[DATA_TRIGGERS]
+
+
+def _number(state: State | None) -> float | None:
+    """Return the numeric value of a state, if it has one."""
+    if state is None:
+        return None
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+def triggered_amount(
+    item: InventoryManagerItem, old_state: State | None, new_state: State | None
+) -> float:
+    """Return the amount of an item consumed by a state change of its trigger."""
+    amount = float(item.data.get(CONF_TRIGGER_AMOUNT, 1))
+    if item.data.get(CONF_TRIGGER_MODE) == TRIGGER_MODE_ON:
+        if (
+            new_state is not None
+            and new_state.state == STATE_ON
+            and old_state is not None
+            and old_state.state not in (STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN)
+        ):
+            return amount
+        return 0.0
+
+    # Counters consume per increment, resets are ignored
+    old_value, new_value = _number(old_state), _number(new_state)
+    if old_value is None or new_value is None or new_value <= old_value:
+        return 0.0
+    return amount * (new_value - old_value)
+
+
+class InventoryManagerTriggers:
+    """
+    Consume items when the entities they are bound to change.
+
+    All bound entities are tracked with one subscription. Consumption is
+    summed per item and applied APPLY_DELAY after the first change. Later
+    changes do not postpone it, so bursts of changes consume in one step per
+    item, and a steady stream of changes still consumes once per delay.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create new triggers."""
+        self.hass = hass
+        self._bindings: dict[str, list[InventoryManagerItem]] = {}
+        self._pending: dict[InventoryManagerItem, float] = {}
+        self._unsubscribe: CALLBACK_TYPE | None = None
+        self._cancel_apply: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add_items(self, items: Iterable[InventoryManagerItem]) -> None:
+        """Bind items to the entities consuming them."""
+        changed = False
+        for item in items:
+            entity_id = item.data.get(CONF_TRIGGER_ENTITY)
+            if entity_id:
+                self._bindings.setdefault(entity_id, []).append(item)
+                changed = True
+        if changed:
+            self._async_subscribe()
+
+    @callback
+    def async_remove_items(self, items: Iterable[InventoryManagerItem]) -> None:
+        """Unbind items, consuming what has been triggered so far."""
+        items = set(items)
+        self._async_apply(items)
+        changed = False
+        for entity_id, bound in list(self._bindings.items()):
+            if remaining := [item for item in bound if item not in items]:
+                if len(remaining) != len(bound):
+                    self._bindings[entity_id] = remaining
+            else:
+                del self._bindings[entity_id]
+                changed = True
+        if changed:
+            self._async_subscribe()
+
+    @callback
+    def _async_subscribe(self) -> None:
+        """Track all bound entities with one subscription."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._bindings:
+            self._unsubscribe = async_track_state_change_event(
+                self.hass, list(self._bindings), self._async_state_changed
+            )
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Sum the consumption triggered by a state change."""
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        for item in self._bindings.get(event.data["entity_id"], []):
+            amount = triggered_amount(item, old_state, new_state)
+            if amount > 0:
+                self._pending[item] = self._pending.get(item, 0.0) + amount
+
+        # Changes following the first one are consumed together with it
+        if self._pending and self._cancel_apply is None:
+            self._cancel_apply = async_call_later(
+                self.hass, APPLY_DELAY, self._async_apply_delayed
+            )
+
+    @callback
+    def _async_apply_delayed(self, _now: datetime) -> None:
+        self._cancel_apply = None
+        self._async_apply()
+
+    @callback
+    def _async_apply(self, items: set[InventoryManagerItem] | None = None) -> None:
+        """Consume the pending amounts of some or all items."""
+        for item in list(self._pending):
+            if items is None or item in items:
+                amount = self._pending.pop(item)
+                _LOGGER.debug("Consuming %f of %s, triggered", amount, item.title)
+                item.take_number(amount)
+        if not self._pending and self._cancel_apply is not None:
+            self._cancel_apply()
+            self._cancel_apply = None
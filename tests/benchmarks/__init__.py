@@ -0,0 +1 @@
+"""Scale benchmarks for the Inventory Manager integration."""
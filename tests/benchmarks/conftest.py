@@ -0,0 +1,52 @@
+"""Fixtures collecting benchmark results into a report."""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Run benchmarks for every configured number of items."""
+    if "item_count" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--benchmark-sizes")
+        metafunc.parametrize(
+            "item_count", [int(size) for size in sizes.split(",") if size.strip()]
+        )
+
+
+def _merge(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Merge the results of all benchmarks by number of items."""
+    merged: dict[int, dict[str, Any]] = {}
+    for result in results:
+        merged.setdefault(result["items"], {}).update(result)
+    return [merged[items] for items in sorted(merged)]
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(
+    pytestconfig: pytest.Config,
+) -> Generator[list[dict[str, Any]]]:
+    """Collect the results of all benchmarks and write them once done."""
+    results: list[dict[str, Any]] = []
+    yield results
+
+    report = {
+        "created": dt_util.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "homeassistant": HA_VERSION,
+        "platform": platform.platform(),
+        "results": _merge(results),
+    }
+    path = Path(pytestconfig.getoption("--benchmark-report"))
+    path.write_text(json.dumps(report, indent=2) + "\n")
@@ -0,0 +1,198 @@
+"""Benchmark setup, service latency and memory of a hub with many items."""
+
+from __future__ import annotations
+
+import gc
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+
+from custom_components import inventory_manager
+from custom_components.inventory_manager.const import (
+    DOMAIN,
+    SERVICE_AMOUNT,
+    SERVICE_BATCH,
+    SERVICE_CONSUME,
+    SERVICE_ITEM,
+    SERVICE_OPERATIONS,
+    SERVICE_STORE,
+)
+from tests.conftest import hub_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+
+    from custom_components.inventory_manager.coordinator import (
+        InventoryManagerCoordinator,
+    )
+
+pytestmark = pytest.mark.benchmark
+
+# Service calls measured per service
+SERVICE_CALLS = 50
+
+# Entities enabled by default per item: five numbers, a sensor and a binary sensor
+ENTITIES_PER_ITEM = 7
+
+# Entities summarizing all items of a hub
+ENTITIES_PER_HUB = 3
+
+
+def _rss_bytes() -> int:
+    """Return the resident memory of the process."""
+    gc.collect()
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+def _summary(durations: list[float]) -> dict[str, float]:
+    """Summarize durations in milliseconds."""
+    return {
+        "median_ms": statistics.median(durations) * 1000,
+        "p95_ms": statistics.quantiles(durations, n=20)[-1] * 1000,
+        "max_ms": max(durations) * 1000,
+    }
+
+
+async def _measure_service(
+    hass: HomeAssistant,
+    coordinator: InventoryManagerCoordinator,
+    service: str,
+    data: dict[str, Any],
+    writes: list[Event],
+) -> dict[str, float]:
+    """Call a service repeatedly and measure until its state is written."""
+    durations = []
+    writes.clear()
+    flushed = coordinator.writes_flushed
+    for _ in range(SERVICE_CALLS):
+        start = time.perf_counter()
+        await hass.services.async_call(DOMAIN, service, data, blocking=True)
+        await hass.async_block_till_done()
+        durations.append(time.perf_counter() - start)
+    return {
+        **_summary(durations),
+        # Entity state writes, and those that changed the state
+        "writes_per_call": (coordinator.writes_flushed - flushed) / SERVICE_CALLS,
+        "state_changes_per_call": len(writes) / SERVICE_CALLS,
+    }
+
+
+async def test_hub_scale(
+    hass: HomeAssistant,
+    item_count: int,
+    benchmark_report: list[dict[str, Any]],
+) -> None:
+    """Set up a hub with many items and use one of them."""
+    entry = hub_entry(item_count, "Benchmark")
+    entry.add_to_hass(hass)
+
+    writes: list[Event] = []
+    first_state_at: list[float] = []
+
+    def _record_write(event: Event) -> None:
+        if not first_state_at:
+            first_state_at.append(time.perf_counter())
+        writes.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _record_write)
+
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    setup_done = time.perf_counter()
+    await hass.async_block_till_done()
+    settled = time.perf_counter()
+    rss_after = _rss_bytes()
+
+    assert len(writes) == item_count * ENTITIES_PER_ITEM + ENTITIES_PER_HUB
+    setup_writes = len(writes)
+
+    supply = "number.item_00000_supply"
+    assert hass.states.get(supply) is not None
+    coordinator = entry.runtime_data.coordinator
+    amount = {"entity_id": supply, SERVICE_AMOUNT: 1}
+    store = await _measure_service(hass, coordinator, SERVICE_STORE, amount, writes)
+    consume = await _measure_service(hass, coordinator, SERVICE_CONSUME, amount, writes)
+
+    # An item consumed in small steps, which barely move its prediction
+    dosed = "item_00001" if item_count > 1 else "item_00000"
+    for number, value in (("morning", 5), ("evening", 5), ("supply", 1000)):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": f"number.{dosed}_{number}", "value": value},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+    consume_dosed = await _measure_service(
+        hass,
+        coordinator,
+        SERVICE_BATCH,
+        {
+            SERVICE_OPERATIONS: [
+                {SERVICE_ITEM: f"number.{dosed}_supply", SERVICE_AMOUNT: 0.1}
+            ]
+        },
+        writes,
+    )
+
+    benchmark_report.append(
+        {
+            "items": item_count,
+            "entities": setup_writes,
+            "setup_s": setup_done - start,
+            "first_state_s": first_state_at[0] - start,
+            "all_states_s": settled - start,
+            "rss_bytes": rss_after - rss_before,
+            "rss_bytes_per_item": (rss_after - rss_before) / item_count,
+            "store": store,
+            "consume": consume,
+            "consume_dosed": consume_dosed,
+        }
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_item_memory(
+    hass: HomeAssistant,
+    item_count: int,
+    benchmark_report: list[dict[str, Any]],
+) -> None:
+    """Measure the memory held by the integration for every item."""
+    entry = hub_entry(item_count, "Benchmark")
+    entry.add_to_hass(hass)
+
+    tracemalloc.start()
+    try:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # Only count memory allocated by the integration itself, which excludes
+    # the state machine and the registries
+    integration = str(Path(inventory_manager.__file__).parent / "*")
+    allocated = sum(
+        stat.size
+        for stat in snapshot.filter_traces(
+            [tracemalloc.Filter(inclusive=True, filename_pattern=integration)]
+        ).statistics("filename")
+    )
+    benchmark_report.append(
+        {"items": item_count, "integration_bytes_per_item": allocated / item_count}
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,118 @@
+"""Fixtures for Inventory Manager tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_TITLE,
+    CONF_ITEMS,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from homeassistant.core import HomeAssistant
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the options of the benchmarks and the load tests."""
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-sizes",
+        default="10,100,1000,5000",
+        help="Comma separated numbers of items to benchmark",
+    )
+    group.addoption(
+        "--benchmark-report",
+        default="benchmark-report.json",
+        help="Path of the JSON report written by the benchmarks",
+    )
+
+    group = parser.getgroup("load")
+    group.addoption(
+        "--load-items", type=int, default=200, help="Number of items under load"
+    )
+    group.addoption(
+        "--load-rate", type=float, default=200, help="Service calls per second"
+    )
+    group.addoption(
+        "--load-duration", type=float, default=10, help="Seconds of calls to issue"
+    )
+    group.addoption(
+        "--load-mix",
+        default="consume=6,store=2,set=1",
+        help="Comma separated weights of the consume, store and set calls",
+    )
+    group.addoption(
+        "--load-seed", type=int, default=0, help="Seed of the planned calls"
+    )
+    group.addoption(
+        "--load-report",
+        default="load-report.json",
+        help="Path of the JSON report written by the load tests",
+    )
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    enable_custom_integrations: None,
+) -> None:
+    """Enable custom integrations in all tests."""
+
+
+async def async_set_number(hass: HomeAssistant, entity_id: str, value: float) -> None:
+    """Set the value of a number entity through its service."""
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": entity_id, "value": value}, blocking=True
+    )
+
+
+def item_data(name: str, **options: Any) -> dict[str, Any]:
+    """Return the configuration of an item with the given options."""
+    return {
+        CONF_ITEM_NAME: name,
+        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+        CONF_SENSOR_BEFORE_EMPTY: 10,
+        **options,
+    }
+
+
+def hub_entry(
+    items: Mapping[str, str] | int, title: str = "Cabinet", **options: Any
+) -> MockConfigEntry:
+    """
+    Create a hub entry with items by item id and title, or a number of items.
+
+    The options are added to the configuration of every item.
+    """
+    if isinstance(items, int):
+        items = {f"item{index:05d}": f"Item {index:05d}" for index in range(items)}
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=title,
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: title,
+            CONF_ITEMS: {
+                item_id: {
+                    CONF_ITEM_TITLE: name,
+                    CONF_ITEM_DATA: item_data(name, **options),
+                }
+                for item_id, name in items.items()
+            },
+        },
+    )
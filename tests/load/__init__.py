@@ -0,0 +1 @@
+"""Load tests for the Inventory Manager integration."""
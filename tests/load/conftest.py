@@ -0,0 +1,93 @@
+"""Fixtures setting up a hub under load and collecting the results."""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
+from homeassistant.util import dt as dt_util
+
+from .generator import (
+    LoadGenerator,
+    Operation,
+    async_setup_generator,
+    parse_mix,
+    plan_operations,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Generator
+
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass(frozen=True, slots=True)
+class LoadOptions:
+    """The options of a load test."""
+
+    items: int
+    rate: float
+    duration: float
+    mix: dict[str, float]
+    seed: int
+
+
+@pytest.fixture
+def load_options(pytestconfig: pytest.Config) -> LoadOptions:
+    """Return the options of the load test from the command line."""
+    return LoadOptions(
+        items=pytestconfig.getoption("--load-items"),
+        rate=pytestconfig.getoption("--load-rate"),
+        duration=pytestconfig.getoption("--load-duration"),
+        mix=parse_mix(pytestconfig.getoption("--load-mix")),
+        seed=pytestconfig.getoption("--load-seed"),
+    )
+
+
+@pytest.fixture
+def load_operations(load_options: LoadOptions) -> list[Operation]:
+    """Return the planned calls of the load test."""
+    return plan_operations(
+        load_options.seed,
+        load_options.items,
+        load_options.rate,
+        load_options.duration,
+        load_options.mix,
+    )
+
+
+@pytest.fixture
+async def load_generator(
+    hass: HomeAssistant, load_options: LoadOptions
+) -> AsyncGenerator[LoadGenerator]:
+    """Return a generator for a hub with the configured number of items."""
+    entry, generator = await async_setup_generator(hass, load_options.items)
+    yield generator
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.fixture(scope="session")
+def load_report(
+    pytestconfig: pytest.Config,
+) -> Generator[list[dict[str, Any]]]:
+    """Collect the results of all load tests and write them once done."""
+    results: list[dict[str, Any]] = []
+    yield results
+
+    report = {
+        "created": dt_util.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "homeassistant": HA_VERSION,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path = Path(pytestconfig.getoption("--load-report"))
+    path.write_text(json.dumps(report, indent=2) + "\n")
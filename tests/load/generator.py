@@ -0,0 +1,271 @@
+"""Generate seeded traffic of consume, store and set calls and measure it."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_STATE_CHANGED
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.inventory_manager.const import (
+    DOMAIN,
+    SERVICE_AMOUNT,
+    SERVICE_CONSUME,
+    SERVICE_STORE,
+)
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from custom_components.inventory_manager.ledger import LedgerEventKind
+from tests.conftest import hub_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.inventory_manager.coordinator import (
+        InventoryManagerCoordinator,
+        InventoryManagerItem,
+    )
+
+ACTION_SET = "set"
+ACTIONS = (SERVICE_CONSUME, SERVICE_STORE, ACTION_SET)
+
+# Amounts consumed or stored per call, and supplies set per call. Whole
+# numbers are exact in the ledger, such that it can be replayed exactly.
+MAX_AMOUNT = 5
+MAX_SUPPLY = 1000
+
+# Supply of every item before the load starts
+INITIAL_SUPPLY = 500
+
+# Interval of the probe measuring how late the event loop runs callbacks
+LAG_INTERVAL = 0.01
+
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """A service call at a time after the start of the run."""
+
+    at: float
+    action: str
+    item: int
+    amount: int
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse weights of the actions like consume=6,store=2,set=1."""
+    weights = {}
+    for part in mix.split(","):
+        action, _, weight = part.partition("=")
+        action = action.strip()
+        if action not in ACTIONS:
+            msg = f"Unknown action {action!r}, expected one of {', '.join(ACTIONS)}"
+            raise ValueError(msg)
+        weights[action] = float(weight or 1)
+    return weights
+
+
+def plan_operations(
+    seed: int, items: int, rate: float, duration: float, mix: dict[str, float]
+) -> list[Operation]:
+    """
+    Plan the calls of a run, the same seed always plans the same calls.
+
+    Calls arrive as a Poisson process at the given rate per second, and
+    are not held back by slow calls. Items are picked by a Zipf like law,
+    such that a few items are busy, as they are in a real household.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    actions = list(mix)
+    action_weights = list(itertools.accumulate(mix.values()))
+    item_weights = list(itertools.accumulate(1 / rank for rank in range(1, items + 1)))
+    operations = []
+    at = rng.expovariate(rate)
+    while at < duration:
+        (action,) = rng.choices(actions, cum_weights=action_weights)
+        (item,) = rng.choices(range(items), cum_weights=item_weights)
+        amount = (
+            rng.randint(0, MAX_SUPPLY)
+            if action == ACTION_SET
+            else rng.randint(1, MAX_AMOUNT)
+        )
+        operations.append(Operation(at, action, item, amount))
+        at += rng.expovariate(rate)
+    return operations
+
+
+def replay(supply: float, events: list[tuple[Any, LedgerEventKind, float]]) -> float:
+    """Return the supply after applying the recorded changes in order."""
+    for _, kind, value in events:
+        if kind == LedgerEventKind.SET:
+            supply = max(value, 0.0)
+        elif kind == LedgerEventKind.CONSUME:
+            supply = max(supply - value, 0.0)
+        else:
+            supply += value
+    return supply
+
+
+def _summary(values: list[float]) -> dict[str, float | None]:
+    """Summarize durations in milliseconds."""
+    if len(values) < 2:
+        value = values[0] * 1000 if values else None
+        return {"p50_ms": value, "p99_ms": value, "max_ms": value}
+    return {
+        "p50_ms": statistics.median(values) * 1000,
+        "p99_ms": statistics.quantiles(values, n=100)[-1] * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+class LoadGenerator:
+    """Drive the items of a coordinator with planned calls."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: InventoryManagerCoordinator,
+        items: list[InventoryManagerItem],
+    ) -> None:
+        """Create a generator for the given items."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.items = items
+        self.entity_ids = [
+            item.entity(InventoryManagerEntityType.SUPPLY).entity_id for item in items
+        ]
+        self.latencies: list[float] = []
+        self.lags: list[float] = []
+        self.calls: list[int] = [0] * len(items)
+        self.errors = 0
+
+    async def _async_call(self, operation: Operation) -> None:
+        """Call the service of an operation and measure until it returns."""
+        entity_id = self.entity_ids[operation.item]
+        if operation.action == ACTION_SET:
+            domain, service = "number", "set_value"
+            data = {ATTR_ENTITY_ID: entity_id, "value": operation.amount}
+        else:
+            domain, service = DOMAIN, operation.action
+            data = {ATTR_ENTITY_ID: entity_id, SERVICE_AMOUNT: operation.amount}
+        start = time.perf_counter()
+        try:
+            await self.hass.services.async_call(domain, service, data, blocking=True)
+        except HomeAssistantError:
+            self.errors += 1
+            return
+        self.latencies.append(time.perf_counter() - start)
+        self.calls[operation.item] += 1
+
+    async def _async_probe(self) -> None:
+        """Measure how late the event loop wakes up a sleeping task."""
+        loop = self.hass.loop
+        while True:
+            expected = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lags.append(max(loop.time() - expected, 0.0))
+
+    def _lost_updates(
+        self, initial: list[tuple[float, int]]
+    ) -> tuple[int, int, list[str]]:
+        """
+        Compare the items to their ledger, after all calls have returned.
+
+        Every successful call records one change. Changes that are missing,
+        or a supply that differs from replaying the recorded changes, are
+        lost updates. A state that differs from the supply is stale.
+        """
+        lost = stale = 0
+        inconsistent = []
+        ledger = self.coordinator.ledger
+        for index, item in enumerate(self.items):
+            supply, count = initial[index]
+            events = list(ledger.events(item.item_id))[count:]
+            lost += max(self.calls[index] - len(events), 0)
+            current = item.get(InventoryManagerEntityType.SUPPLY)
+            if current != replay(supply, events):
+                lost += 1
+                inconsistent.append(self.entity_ids[index])
+            state = self.hass.states.get(self.entity_ids[index])
+            if state is None or float(state.state) != current:
+                stale += 1
+        return lost, stale, inconsistent
+
+    async def async_run(self, operations: list[Operation]) -> dict[str, Any]:
+        """Issue the operations at their times and report the measurements."""
+        self.latencies.clear()
+        self.lags.clear()
+        self.calls = [0] * len(self.items)
+        self.errors = 0
+        ledger = self.coordinator.ledger
+        initial = [
+            (
+                item.get(InventoryManagerEntityType.SUPPLY),
+                len(list(ledger.events(item.item_id))),
+            )
+            for item in self.items
+        ]
+        changes: list[Event] = []
+        remove_listener = self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED, changes.append
+        )
+        flushed = self.coordinator.writes_flushed
+        probe = self.hass.async_create_background_task(
+            self._async_probe(), "inventory_manager load probe"
+        )
+
+        loop = self.hass.loop
+        tasks = []
+        start = loop.time()
+        try:
+            for operation in operations:
+                delay = start + operation.at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(self._async_call(operation)))
+            await asyncio.gather(*tasks)
+            await self.hass.async_block_till_done()
+            elapsed = loop.time() - start
+        finally:
+            probe.cancel()
+            remove_listener()
+
+        completed = len(self.latencies)
+        writes = self.coordinator.writes_flushed - flushed
+        lost, stale, inconsistent = self._lost_updates(initial)
+        return {
+            "calls": len(operations),
+            "completed": completed,
+            "errors": self.errors,
+            "elapsed_s": elapsed,
+            "throughput_per_s": completed / elapsed if elapsed else 0.0,
+            "latency": _summary(self.latencies),
+            "loop_lag": _summary(self.lags),
+            "state_writes": writes,
+            "state_changes": len(changes),
+            "writes_per_call": writes / completed if completed else 0.0,
+            "lost_updates": lost,
+            "stale_states": stale,
+            "inconsistent": inconsistent,
+        }
+
+
+async def async_setup_generator(
+    hass: HomeAssistant, item_count: int
+) -> tuple[MockConfigEntry, LoadGenerator]:
+    """Set up a hub with items in stock and a generator driving them."""
+    entry = hub_entry(item_count, "Load")
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+    items = list(coordinator.items.values())
+    for item in items:
+        item.set(InventoryManagerEntityType.SUPPLY, INITIAL_SUPPLY)
+    await hass.async_block_till_done()
+    return entry, LoadGenerator(hass, coordinator, items)
@@ -0,0 +1,59 @@
+"""Test the load generator with a short run."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.inventory_manager.const import SERVICE_CONSUME, SERVICE_STORE
+from custom_components.inventory_manager.coordinator import InventoryManagerItem
+
+from .generator import ACTION_SET, async_setup_generator, parse_mix, plan_operations
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+MIX = {SERVICE_CONSUME: 6, SERVICE_STORE: 2, ACTION_SET: 1}
+
+
+def test_plan_operations() -> None:
+    """The same seed plans the same calls, at about the requested rate."""
+    operations = plan_operations(1, 20, 100, 10, MIX)
+    assert operations == plan_operations(1, 20, 100, 10, MIX)
+    assert operations != plan_operations(2, 20, 100, 10, MIX)
+    assert 900 < len(operations) < 1100
+    assert all(0 < operation.at < 10 for operation in operations)
+    assert {operation.action for operation in operations} == set(MIX)
+    # The first item is the busiest
+    calls = [0] * 20
+    for operation in operations:
+        calls[operation.item] += 1
+    assert calls[0] == max(calls)
+
+    assert parse_mix("consume=3, set") == {SERVICE_CONSUME: 3, ACTION_SET: 1}
+    with pytest.raises(ValueError, match="Unknown action"):
+        parse_mix("consume=1,restock=1")
+
+
+async def test_short_run(hass: HomeAssistant) -> None:
+    """A short burst of calls is measured without losing updates."""
+    entry, generator = await async_setup_generator(hass, 5)
+    operations = plan_operations(0, 5, 1000, 0.3, MIX)
+    result = await generator.async_run(operations)
+
+    assert result["completed"] == len(operations)
+    assert result["errors"] == 0
+    assert result["lost_updates"] == 0
+    assert result["stale_states"] == 0
+    assert 0 < result["state_writes"] <= len(operations)
+    assert result["latency"]["p50_ms"] <= result["latency"]["p99_ms"]
+    assert result["loop_lag"]["max_ms"] is not None
+
+    # Changes that are not recorded are lost
+    with patch.object(InventoryManagerItem, "record"):
+        result = await generator.async_run(operations[:10])
+    assert result["lost_updates"] >= 10
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
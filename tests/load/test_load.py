@@ -0,0 +1,30 @@
+"""Sustained load of consume, store and set calls on a hub with many items."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from .conftest import LoadOptions
+    from .generator import LoadGenerator, Operation
+
+pytestmark = pytest.mark.load
+
+
+async def test_sustained_load(
+    load_options: LoadOptions,
+    load_operations: list[Operation],
+    load_generator: LoadGenerator,
+    load_report: list[dict[str, Any]],
+) -> None:
+    """Issue the planned calls and check that no update is lost."""
+    result = await load_generator.async_run(load_operations)
+    load_report.append({**asdict(load_options), **result})
+
+    assert result["errors"] == 0
+    assert result["completed"] == len(load_operations)
+    assert result["lost_updates"] == 0, result["inconsistent"]
+    assert result["stale_states"] == 0
@@ -0,0 +1,87 @@
+"""Test the sensors summarizing all items of a hub."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_TITLE,
+    CONF_ITEMS,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+)
+from tests.conftest import async_set_number
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+async def test_aggregates(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Items in warning and the next empty item follow changes and time."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Cabinet",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: "Cabinet",
+            CONF_ITEMS: {
+                name: {
+                    CONF_ITEM_TITLE: name,
+                    CONF_ITEM_DATA: {
+                        CONF_ITEM_NAME: name,
+                        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+                        CONF_SENSOR_BEFORE_EMPTY: 5,
+                    },
+                }
+                for name in ("Pills", "Drops", "Tabs")
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    warning = "sensor.cabinet_items_running_low"
+    next_empty = "sensor.cabinet_next_empty"
+    assert hass.states.get(warning).state == "0"
+    assert hass.states.get(next_empty).state == "unknown"
+
+    await async_set_number(hass, "number.pills_morning", 1)
+    await async_set_number(hass, "number.pills_supply", 20)
+    await async_set_number(hass, "number.drops_morning", 1)
+    await async_set_number(hass, "number.drops_supply", 10)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(warning).state == "0"
+    state = hass.states.get(next_empty)
+    assert state.attributes["item"] == "Drops"
+    expected = dt_util.utcnow() + timedelta(days=10)
+    assert abs(dt_util.parse_datetime(state.state) - expected) < timedelta(seconds=5)
+
+    # Drops run low after five days
+    freezer.tick(timedelta(days=5, minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(warning).state == "1"
+
+    # Refilling the drops makes the pills run out first
+    await async_set_number(hass, "number.drops_supply", 100)
+    await hass.async_block_till_done()
+    assert hass.states.get(warning).state == "0"
+    assert hass.states.get(next_empty).attributes["item"] == "Pills"
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
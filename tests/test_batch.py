@@ -0,0 +1,115 @@
+"""Test the batch service consuming from and storing to many items."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    SERVICE_ACTION,
+    SERVICE_AMOUNT,
+    SERVICE_BATCH,
+    SERVICE_CONSUME,
+    SERVICE_ITEM,
+    SERVICE_OPERATIONS,
+    SERVICE_PREDEFINED_AMOUNT,
+    SERVICE_STORE,
+)
+from custom_components.inventory_manager.ledger import LedgerEventKind
+from tests.conftest import async_set_number
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+PILLS = "number.pills_supply"
+DROPS = "number.drops_supply"
+
+
+async def test_batch(hass: HomeAssistant) -> None:
+    """Operations on items of several entries are applied together."""
+    for name in ("Pills", "Drops"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=name,
+            data={
+                CONF_ITEM_NAME: name,
+                CONF_ITEM_MAX_CONSUMPTION: 5.0,
+                CONF_SENSOR_BEFORE_EMPTY: 10,
+            },
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_set_number(hass, "number.pills_morning", 2)
+    await async_set_number(hass, PILLS, 10)
+
+    # Unknown items fail the whole batch
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BATCH,
+            {
+                SERVICE_OPERATIONS: [
+                    {SERVICE_ITEM: PILLS, SERVICE_AMOUNT: 1},
+                    {SERVICE_ITEM: "number.gum_supply", SERVICE_AMOUNT: 1},
+                ]
+            },
+            blocking=True,
+        )
+    assert hass.states.get(PILLS).state == "10.0"
+
+    # The states are written once the blocking call returns
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BATCH,
+        {
+            SERVICE_OPERATIONS: [
+                {SERVICE_ITEM: PILLS, SERVICE_PREDEFINED_AMOUNT: "morning"},
+                {SERVICE_ITEM: PILLS, SERVICE_AMOUNT: 1},
+                {SERVICE_ITEM: DROPS, SERVICE_ACTION: SERVICE_STORE, SERVICE_AMOUNT: 5},
+            ]
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response["items"][PILLS]["supply"] == 7
+    assert response["items"][DROPS]["supply"] == 5
+    assert hass.states.get(PILLS).state == "7.0"
+    assert hass.states.get(DROPS).state == "5.0"
+
+    # Consuming more than is left records only what was left
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BATCH,
+        {SERVICE_OPERATIONS: [{SERVICE_ITEM: PILLS, SERVICE_AMOUNT: 20}]},
+        blocking=True,
+    )
+    assert hass.states.get(PILLS).state == "0.0"
+    await async_set_number(hass, DROPS, 2)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CONSUME,
+        {SERVICE_AMOUNT: 3},
+        target={"entity_id": DROPS},
+        blocking=True,
+    )
+    assert hass.states.get(DROPS).state == "0.0"
+    # The ledger is shared by all entries
+    ledger = entry.runtime_data.coordinator.ledger
+    consumed = {
+        item.title: [
+            value
+            for _, kind, value in ledger.events(item.item_id)
+            if kind == LedgerEventKind.CONSUME
+        ]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        for item in entry.runtime_data.coordinator.items.values()
+    }
+    assert consumed == {"Pills": [2, 1, 7], "Drops": [2]}
@@ -0,0 +1,84 @@
+"""Test that the cached consumption and days remaining never go stale."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    NO_CONSUMPTION_DAYS,
+)
+from custom_components.inventory_manager.coordinator import InventoryManagerItem
+from custom_components.inventory_manager.entity import (
+    NUMBER_INDEX,
+    InventoryManagerEntityType,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+async def _async_setup_item(hass: HomeAssistant) -> InventoryManagerItem:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    (item,) = entry.runtime_data.coordinator.items.values()
+    return item
+
+
+async def test_invalidation(hass: HomeAssistant) -> None:
+    """A new supply clears days remaining, a new dose the daily consumption."""
+    # Without entities, which would recalculate right away
+    coordinator = (await _async_setup_item(hass)).coordinator
+    item = InventoryManagerItem(coordinator, "tabs", "Tabs", {CONF_ITEM_NAME: "Tabs"})
+    item.set(InventoryManagerEntityType.MORNING, 2)
+    item.set(InventoryManagerEntityType.SUPPLY, 10)
+    assert item.days_remaining() == 5
+    assert (item._daily_consumption, item._days_remaining) == (2, 5)
+
+    item.set(InventoryManagerEntityType.SUPPLY, 20)
+    assert item._days_remaining is None
+    assert item._daily_consumption == 2
+    assert item.days_remaining() == 10
+
+    item.set(InventoryManagerEntityType.EVENING, 2)
+    assert item._daily_consumption is None
+    assert item._days_remaining is None
+    assert item.days_remaining() == 5
+    assert item.daily_consumption() == 4
+
+
+async def test_never_stale(hass: HomeAssistant) -> None:
+    """After any sequence of changes, cached values equal fresh ones."""
+    item = await _async_setup_item(hass)
+    rng = random.Random(5)  # noqa: S311
+    for _ in range(500):
+        entity_type = rng.choice(list(NUMBER_INDEX))
+        if rng.random() < 0.3:
+            item.take_number(rng.randint(0, 3))
+        else:
+            item.set(entity_type, rng.randint(0, 20))
+        if rng.random() < 0.5:
+            item.days_remaining()
+
+        daily = item._calculate_daily_consumption()
+        supply = item.get(InventoryManagerEntityType.SUPPLY)
+        assert item.daily_consumption() == daily
+        assert item.days_remaining() == (
+            supply / daily if daily > 0 else NO_CONSUMPTION_DAYS
+        )
@@ -0,0 +1,109 @@
+"""Test that concurrent service calls do not lose updates."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    SERVICE_AMOUNT,
+    SERVICE_BATCH,
+    SERVICE_CONSUME,
+    SERVICE_ITEM,
+    SERVICE_OPERATIONS,
+    SERVICE_STORE,
+)
+from custom_components.inventory_manager.coordinator import InventoryManagerItem
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+SUPPLY = "number.pills_supply"
+
+
+async def test_parallel_consumes(hass: HomeAssistant) -> None:
+    """Thousands of parallel consumes and stores add up exactly, on the loop."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": SUPPLY, "value": 5000}, blocking=True
+    )
+
+    calls = [
+        *(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_CONSUME,
+                {SERVICE_AMOUNT: 1},
+                target={"entity_id": SUPPLY},
+                blocking=True,
+            )
+            for _ in range(3000)
+        ),
+        *(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_STORE,
+                {SERVICE_AMOUNT: 1},
+                target={"entity_id": SUPPLY},
+                blocking=True,
+            )
+            for _ in range(1000)
+        ),
+        *(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_BATCH,
+                {SERVICE_OPERATIONS: [{SERVICE_ITEM: SUPPLY, SERVICE_AMOUNT: 0.5}]},
+                blocking=True,
+            )
+            for _ in range(200)
+        ),
+    ]
+    threads = set()
+    original_set = InventoryManagerItem.set
+
+    def _set(item: InventoryManagerItem, *args: object) -> None:
+        threads.add(threading.get_ident())
+        original_set(item, *args)
+
+    with patch.object(InventoryManagerItem, "set", _set):
+        await asyncio.gather(*calls)
+        await hass.async_block_till_done()
+
+    assert threads == {threading.get_ident()}
+
+    # A blocking call returns with the state written
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CONSUME,
+        {SERVICE_AMOUNT: 100},
+        target={"entity_id": SUPPLY},
+        blocking=True,
+    )
+
+    (item,) = entry.runtime_data.coordinator.items.values()
+    assert item.get(InventoryManagerEntityType.SUPPLY) == 2800
+    assert float(hass.states.get(SUPPLY).state) == 2800
+    # Every change has been recorded, after setting the supply once
+    assert len(list(item.coordinator.ledger.events(item.item_id))) == 4202
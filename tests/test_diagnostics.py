@@ -0,0 +1,160 @@
+"""Test the diagnostics and the statistics they contain."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    SERVICE_AMOUNT,
+    SERVICE_CONSUME,
+)
+from custom_components.inventory_manager.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.inventory_manager.sensor import SCAN_INTERVAL
+from custom_components.inventory_manager.stats import Histogram
+from tests.conftest import hub_entry
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+DEBUG = "sensor.cabinet_debug"
+
+
+async def test_diagnostics(hass: HomeAssistant) -> None:
+    """Service calls, sets and timings show up in the diagnostics."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    for value in (20, 1):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": "number.pills_supply", "value": value},
+            blocking=True,
+        )
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CONSUME,
+        {SERVICE_AMOUNT: 1},
+        target={"entity_id": "number.pills_supply"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    statistics = diagnostics["statistics"]
+    # Without consumption, neither the prediction nor the warning change
+    assert statistics["totals"] == {
+        "service_calls": 3,
+        "sets": 3,
+        "writes_suppressed": 6,
+    }
+    assert statistics["writes_requested"] >= statistics["writes_flushed"] > 0
+    assert "setup" in statistics["durations_s"]
+    assert statistics["timings"]["days_remaining"]["count"] > 0
+    assert statistics["timings"]["sensor_update"]["count"] == 3
+    item = diagnostics["items"][entry.entry_id]
+    assert item["numbers"]["SUPPLY"] == 0
+    assert item["counters"] == statistics["totals"]
+
+    # Only hubs have a debug sensor
+    registry = er.async_get(hass)
+    assert not registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_debug")
+
+
+async def test_debug_sensor_removed(hass: HomeAssistant) -> None:
+    """The debug sensor single item entries used to have is removed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+        },
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    registry.async_get_or_create(
+        "sensor", DOMAIN, f"{entry.entry_id}_debug", config_entry=entry
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert not registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_debug")
+
+
+async def test_debug_sensor(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Once enabled, the debug sensor is polled without writing other entities."""
+    entry = hub_entry({"pills": "Pills"})
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    debug = f"{entry.entry_id}_debug"
+    registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        debug,
+        config_entry=entry,
+        suggested_object_id="cabinet_debug",
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(DEBUG).state == "0"
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CONSUME,
+        {SERVICE_AMOUNT: 1},
+        target={"entity_id": "number.pills_supply"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(DEBUG).state == "0"
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    freezer.tick(SCAN_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(DEBUG).state == "1"
+    assert [event.data["entity_id"] for event in events] == [DEBUG]
+
+    # Timings change on every poll and are only part of the diagnostics
+    attributes = hass.states.get(DEBUG).attributes
+    assert attributes["totals"]["service_calls"] == 1
+    assert "timings" not in attributes
+    assert "durations_s" not in attributes
+
+
+def test_histogram() -> None:
+    """Durations are counted in buckets of powers of two microseconds."""
+    histogram = Histogram()
+    for duration_ns in (500, 1500, 3000, 3999, 10**12):
+        histogram.add(duration_ns)
+    summary = histogram.as_dict()
+    assert summary["count"] == 5
+    assert summary["buckets"] == {"<1us": 1, "<2us": 1, "<4us": 2, ">=16384us": 1}
@@ -0,0 +1,160 @@
+"""Test consuming the doses of items at their time of day."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_AUTO_CONSUME,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_MORNING_TIME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+)
+from custom_components.inventory_manager.doses import STORAGE_KEY, _DoseSlot
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from custom_components.inventory_manager.scheduler import async_get_scheduler
+from tests.conftest import async_set_number
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+SUPPLY = "number.pills_supply"
+
+
+def _local(day: int, hour: int, minute: int = 0) -> datetime:
+    """Return a moment in October 2026, where the 19th is a Monday."""
+    return datetime(2026, 10, day, hour, minute, tzinfo=dt_util.get_default_time_zone())
+
+
+async def _async_move_to(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, moment: datetime
+) -> None:
+    freezer.move_to(moment)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def _scheduled_doses(hass: HomeAssistant) -> set[str]:
+    return {
+        target.dose.name
+        for target in async_get_scheduler(hass)._deadlines
+        if isinstance(target, _DoseSlot)
+    }
+
+
+async def _async_setup(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+            CONF_AUTO_CONSUME: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_due_doses(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Doses are consumed when due, slots without a dose are not scheduled."""
+    freezer.move_to(_local(19, 5))
+    await _async_setup(hass)
+    assert not _scheduled_doses(hass)
+
+    await async_set_number(hass, "number.pills_morning", 1)
+    await async_set_number(hass, "number.pills_noon", 2)
+    await async_set_number(hass, "number.pills_supply", 100)
+    assert _scheduled_doses(hass) == {"MORNING", "NOON"}
+    await async_set_number(hass, "number.pills_noon", 0)
+    assert _scheduled_doses(hass) == {"MORNING"}
+
+    await _async_move_to(hass, freezer, _local(19, 8))
+    assert hass.states.get(SUPPLY).state == "99.0"
+    await _async_move_to(hass, freezer, _local(20, 7))
+    assert hass.states.get(SUPPLY).state == "99.0"
+    await _async_move_to(hass, freezer, _local(20, 8))
+    assert hass.states.get(SUPPLY).state == "98.0"
+    assert _scheduled_doses(hass) == {"MORNING"}
+
+
+async def test_catch_up(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Doses missed while not running are consumed once at startup."""
+    freezer.move_to(_local(19, 5))
+    entry = await _async_setup(hass)
+    await async_set_number(hass, "number.pills_morning", 1)
+    await async_set_number(hass, "number.pills_evening", 2)
+    await async_set_number(hass, "number.pills_supply", 100)
+    # The weekly dose is disabled by default
+    (item,) = entry.runtime_data.coordinator.items.values()
+    item.set(InventoryManagerEntityType.WEEK, 4)
+    await hass.async_block_till_done()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await _async_move_to(hass, freezer, _local(29, 13))
+
+    # 11 mornings, 10 evenings and 2 Mondays have been missed
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(SUPPLY).state == str(100.0 - 11 - 10 * 2 - 2 * 4)
+
+    # Neither a restart nor the next due dose consumes them again
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(SUPPLY).state == "61.0"
+    await _async_move_to(hass, freezer, _local(29, 18))
+    assert hass.states.get(SUPPLY).state == "59.0"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    await _async_move_to(hass, freezer, _local(29, 19))
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(SUPPLY).state == "59.0"
+
+
+async def test_options_changed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Moving a dose to an earlier time does not consume it again."""
+    freezer.move_to(_local(19, 5))
+    entry = await _async_setup(hass)
+    await async_set_number(hass, "number.pills_morning", 1)
+    await async_set_number(hass, "number.pills_supply", 100)
+    await _async_move_to(hass, freezer, _local(19, 8))
+    assert hass.states.get(SUPPLY).state == "99.0"
+
+    await _async_move_to(hass, freezer, _local(19, 9))
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_MORNING_TIME: "08:30:00"}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(SUPPLY).state == "99.0"
+    await _async_move_to(hass, freezer, _local(20, 8, 30))
+    assert hass.states.get(SUPPLY).state == "98.0"
+
+
+async def test_saved_when_consumed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, hass_storage: dict[str, Any]
+) -> None:
+    """Consumed doses are saved right away, not only after a delay."""
+    freezer.move_to(_local(19, 5))
+    entry = await _async_setup(hass)
+    await async_set_number(hass, "number.pills_morning", 1)
+    await _async_move_to(hass, freezer, _local(19, 8))
+    assert hass_storage[STORAGE_KEY]["data"] == {
+        entry.entry_id: int(_local(19, 8).timestamp())
+    }
@@ -0,0 +1,35 @@
+"""Test the estimated consumption rate."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.inventory_manager.estimator import ALPHA, ConsumptionRate
+
+DAY = 740000
+
+
+def _day_by_day(values: list[float]) -> tuple[float, float]:
+    """Return mean and variance after updating with every day in turn."""
+    mean = values[0]
+    variance = 0.0
+    for value in values[1:]:
+        diff = value - mean
+        mean += ALPHA * diff
+        variance = (1 - ALPHA) * (variance + ALPHA * diff * diff)
+    return mean, variance
+
+
+@pytest.mark.parametrize("gap", [1, 2, 3, 30, 400, 5000])
+def test_days_without_consumption(gap: int) -> None:
+    """Days without consumption update the estimate as if added one by one."""
+    rate = ConsumptionRate()
+    for offset, amount in enumerate((3, 1, 4, 1)):
+        rate.add(DAY + offset, amount)
+    rate.add(DAY + 3 + gap, 5)
+
+    mean, variance = _day_by_day([3, 1, 4, 1, *[0] * (gap - 1)])
+    assert rate.mean == pytest.approx(mean, rel=1e-9, abs=1e-300)
+    assert rate.variance == pytest.approx(variance, rel=1e-9, abs=1e-300)
+    assert rate.days == 3 + gap
+    assert rate.amount == 5
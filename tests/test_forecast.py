@@ -0,0 +1,66 @@
+"""Test the forecast of the range of empty dates."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager import forecast
+from custom_components.inventory_manager.const import (
+    CONF_FORECAST,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+)
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from tests.conftest import async_set_number
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+
+def test_simulate() -> None:
+    """Varying consumption spreads the empty dates around the prediction."""
+    result = forecast.simulate([(100.0, 2.0, 0.0), (100.0, 2.0, 4.0), (0.0, 1.0, 1.0)])
+    assert result[0].tolist() == [50.0, 50.0, 50.0]
+    p10, p50, p90 = result[1]
+    assert p10 < p50 < p90
+    assert 45 < p50 < 55
+    assert result[2].tolist() == [0.0, 0.0, 0.0]
+
+
+async def test_forecast_cached(hass: HomeAssistant) -> None:
+    """Forecasts are shown and only recomputed when their inputs change."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 7.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+            CONF_FORECAST: True,
+        },
+    )
+    entry.add_to_hass(hass)
+    with patch.object(forecast, "simulate", wraps=forecast.simulate) as simulate:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await async_set_number(hass, "number.pills_supply", 70)
+        await async_set_number(hass, "number.pills_morning", 1)
+        # Weekly doses are consumed on one day, which makes them vary
+        (item,) = entry.runtime_data.coordinator.items.values()
+        item.set(InventoryManagerEntityType.WEEK, 7)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        calls = simulate.call_count
+
+        attributes = hass.states.get("sensor.pills_emptyprediction").attributes
+        p10, p50, p90 = attributes["forecast"].values()
+        assert p10 < p50 < p90
+
+        # Setting the same supply again keeps the forecast
+        await async_set_number(hass, "number.pills_supply", 70)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert simulate.call_count == calls
@@ -0,0 +1,137 @@
+"""Test hubs with several items and moving single item entries into hubs."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_HUB_NAME,
+    CONF_IMPORT_ENTRIES,
+    CONF_ITEMS,
+    DOMAIN,
+)
+from tests.conftest import async_set_number, hub_entry, item_data
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+ITEMS = {"pills": "Pills", "eye_drops": "Eye Drops"}
+
+
+async def test_hub_items(hass: HomeAssistant) -> None:
+    """Every item of a hub gets its own device and entities."""
+    entry = hub_entry(ITEMS)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    for item_id, name, prefix in (
+        ("pills", "Pills", "pills"),
+        ("eye_drops", "Eye Drops", "eye-drops"),
+    ):
+        device = device_registry.async_get_device({(DOMAIN, item_id)})
+        assert device is not None
+        assert device.name == name
+        for entity_id, unique_id in (
+            (f"number.{item_id}_supply", f"{prefix}-supply"),
+            (f"number.{item_id}_morning", f"{prefix}-morning"),
+            (f"sensor.{item_id}_emptyprediction", f"{prefix}-emptyprediction"),
+            (f"binary_sensor.{item_id}_warning", f"{prefix}-warning"),
+        ):
+            registry_entry = entity_registry.async_get(entity_id)
+            assert registry_entry.unique_id == unique_id
+            assert registry_entry.config_entry_id == entry.entry_id
+            assert registry_entry.device_id == device.id
+
+    # Items of the same hub keep separate values
+    await async_set_number(hass, "number.pills_supply", 10)
+    await async_set_number(hass, "number.eye_drops_supply", 3)
+    assert hass.states.get("number.pills_supply").state == "10.0"
+    assert hass.states.get("number.eye_drops_supply").state == "3.0"
+
+
+async def test_import_entries(hass: HomeAssistant) -> None:
+    """A hub takes over single item entries with their entities and values."""
+    entity_registry = er.async_get(hass)
+    old_entries = []
+    for name in ITEMS.values():
+        entry = MockConfigEntry(domain=DOMAIN, title=name, data=item_data(name))
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        old_entries.append(entry)
+    await hass.async_block_till_done()
+    await async_set_number(hass, "number.pills_supply", 10)
+    await async_set_number(hass, "number.eye_drops_morning", 2)
+    # Summary and debug sensors belong to the entries, not to the items
+    old_unique_ids = {
+        registry_entry.entity_id: registry_entry.unique_id
+        for entry in old_entries
+        for registry_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        )
+        if not registry_entry.unique_id.startswith(entry.entry_id)
+    }
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "hub"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_HUB_NAME: "Cabinet",
+            CONF_IMPORT_ENTRIES: [entry.entry_id for entry in old_entries],
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    # The old entries are gone, their entities now belong to the hub
+    (hub,) = hass.config_entries.async_entries(DOMAIN)
+    assert hub.entry_id == result["result"].entry_id
+    assert set(hub.data[CONF_ITEMS]) == {entry.entry_id for entry in old_entries}
+    new_unique_ids = {
+        registry_entry.entity_id: registry_entry.unique_id
+        for registry_entry in er.async_entries_for_config_entry(
+            entity_registry, hub.entry_id
+        )
+        if registry_entry.entity_id in old_unique_ids
+    }
+    assert new_unique_ids == old_unique_ids
+
+    # Values are restored and the items keep working
+    assert hass.states.get("number.pills_supply").state == "10.0"
+    assert hass.states.get("number.eye_drops_morning").state == "2.0"
+    await async_set_number(hass, "number.pills_supply", 12)
+    assert hass.states.get("number.pills_supply").state == "12.0"
+
+
+async def test_entity_ids_in_use(hass: HomeAssistant) -> None:
+    """New entities do not take entity ids used by other entities."""
+    hass.states.async_set("number.pills_supply", "1")
+    er.async_get(hass).async_get_or_create(
+        "number", "other", "pills", suggested_object_id="pills_morning"
+    )
+    entry = MockConfigEntry(domain=DOMAIN, title="Pills", data=item_data("Pills"))
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_registry = er.async_get(hass)
+    for entity_id, unique_id in (
+        ("number.pills_supply_2", "pills-supply"),
+        ("number.pills_morning_2", "pills-morning"),
+        ("number.pills_noon", "pills-noon"),
+    ):
+        assert entity_registry.async_get(entity_id).unique_id == unique_id
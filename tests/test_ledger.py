@@ -0,0 +1,133 @@
+"""Test the ledger of supply changes and its storage."""
+
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.inventory_manager.ledger import (
+    DAY_RETENTION_DAYS,
+    EVENT_RETENTION_DAYS,
+    SAVE_DELAY,
+    SECONDS_PER_DAY,
+    STORAGE_KEY,
+    InventoryManagerLedger,
+    LedgerEventKind,
+    _compact,
+)
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+def _append_days(
+    ledger: InventoryManagerLedger,
+    freezer: FrozenDateTimeFactory,
+    item_id: str,
+    days: int,
+) -> None:
+    """Append a few consumptions and stores on each of the days."""
+    rng = random.Random(days)  # noqa: S311
+    for _ in range(days):
+        for _ in range(rng.randint(0, 4)):
+            kind = rng.choice((LedgerEventKind.CONSUME, LedgerEventKind.STORE))
+            ledger.append(item_id, kind, rng.randint(1, 8) / 4)
+            freezer.tick(timedelta(minutes=rng.randint(1, 120)))
+        freezer.tick(timedelta(days=1))
+
+
+def _replay(
+    ledger: InventoryManagerLedger, item_id: str, supply: float
+) -> tuple[float, int]:
+    """Return the supply after the recorded changes and the number of changes."""
+    count = 0
+    for _, consumed, stored, events in ledger.days(item_id):
+        supply += stored - consumed
+        count += events
+    for _, kind, value in ledger.events(item_id):
+        supply += value if kind == LedgerEventKind.STORE else -value
+        count += 1
+    return supply, count
+
+
+async def test_round_trip(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, hass_storage: dict[str, Any]
+) -> None:
+    """Events, aggregates and rates are stored and loaded unchanged."""
+    ledger = InventoryManagerLedger(hass)
+    _append_days(ledger, freezer, "pills", 90)
+    ledger.append("drops", LedgerEventKind.SET, 12.5)
+    ledger.append("drops", LedgerEventKind.CONSUME, 0.25)
+    appended = dt_util.utcnow().replace(microsecond=0)
+
+    # Appends are saved in one batch after a delay
+    assert STORAGE_KEY not in hass_storage
+    freezer.tick(timedelta(seconds=SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert set(hass_storage[STORAGE_KEY]["data"]["items"]) == {"pills", "drops"}
+
+    loaded = InventoryManagerLedger(hass)
+    await loaded.async_load()
+    for item_id in ("pills", "drops"):
+        assert list(loaded.events(item_id)) == list(ledger.events(item_id))
+        assert list(loaded.days(item_id)) == list(ledger.days(item_id))
+        assert loaded.rate(item_id).to_bytes() == ledger.rate(item_id).to_bytes()
+    assert list(loaded.events("drops")) == [
+        (appended, LedgerEventKind.SET, 12.5),
+        (appended, LedgerEventKind.CONSUME, 0.25),
+    ]
+
+
+async def test_compaction(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Compacting old events into days keeps the replayed supply."""
+    ledger = InventoryManagerLedger(hass)
+    _append_days(ledger, freezer, "pills", 120)
+    expected = _replay(ledger, "pills", 1000)
+    assert not list(ledger.days("pills"))
+
+    item = ledger._items["pills"]
+    now = int(dt_util.utcnow().timestamp())
+    _compact(item, now)
+    assert list(ledger.days("pills"))
+    assert _replay(ledger, "pills", 1000) == expected
+    cutoff = dt_util.utc_from_timestamp(now - EVENT_RETENTION_DAYS * SECONDS_PER_DAY)
+    assert all(timestamp >= cutoff for timestamp, *_ in ledger.events("pills"))
+
+    # Compacting again, or later on, does not count anything twice
+    _append_days(ledger, freezer, "pills", 10)
+    expected = _replay(ledger, "pills", 1000)
+    _compact(item, int(dt_util.utcnow().timestamp()))
+    _compact(item, int(dt_util.utcnow().timestamp()))
+    assert _replay(ledger, "pills", 1000) == expected
+
+    # Only aggregates beyond the retention are dropped
+    _compact(item, now + DAY_RETENTION_DAYS * SECONDS_PER_DAY)
+    assert not list(ledger.events("pills"))
+    first_day = dt_util.as_local(dt_util.utc_from_timestamp(now)).date()
+    assert all(day >= first_day for day, *_ in ledger.days("pills"))
+
+
+async def test_compaction_local_days(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Events are aggregated by local day, like the estimated consumption."""
+    ledger = InventoryManagerLedger(hass)
+    time_zone = dt_util.get_default_time_zone()
+    # Late in the evening, already the next day in UTC
+    freezer.move_to(datetime(2026, 10, 19, 22, 0, tzinfo=time_zone))
+    ledger.append("pills", LedgerEventKind.CONSUME, 1)
+    freezer.move_to(datetime(2026, 10, 20, 1, 0, tzinfo=time_zone))
+    ledger.append("pills", LedgerEventKind.CONSUME, 2)
+
+    now = int(dt_util.utcnow().timestamp()) + EVENT_RETENTION_DAYS * SECONDS_PER_DAY
+    _compact(ledger._items["pills"], now + SECONDS_PER_DAY)
+    assert list(ledger.days("pills")) == [
+        (date(2026, 10, 19), 1.0, 0.0, 1),
+        (date(2026, 10, 20), 2.0, 0.0, 1),
+    ]
@@ -0,0 +1,93 @@
+"""Test lots with expiry dates."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    EVENT_LOT_EXPIRED,
+    SERVICE_AMOUNT,
+    SERVICE_CONSUME,
+    SERVICE_EXPIRY,
+    SERVICE_STORE,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import FrozenDateTimeFactory
+
+SUPPLY = "number.pills_supply"
+EXPIRES_SOONEST = "sensor.pills_expires_soonest"
+
+
+async def _async_call(hass: HomeAssistant, service: str, **data: object) -> None:
+    await hass.services.async_call(
+        DOMAIN, service, data, target={"entity_id": SUPPLY}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+
+async def test_lots(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Consumption draws from the lots expiring first, expiry fires an event."""
+    freezer.move_to(dt_util.parse_datetime("2026-10-18T12:00:00+00:00"))
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(EXPIRES_SOONEST).state == "unknown"
+
+    await _async_call(
+        hass, SERVICE_STORE, **{SERVICE_AMOUNT: 10, SERVICE_EXPIRY: "2027-01-10"}
+    )
+    await _async_call(
+        hass, SERVICE_STORE, **{SERVICE_AMOUNT: 5, SERVICE_EXPIRY: "2026-11-01"}
+    )
+    await _async_call(hass, SERVICE_STORE, **{SERVICE_AMOUNT: 3})
+    state = hass.states.get(EXPIRES_SOONEST)
+    assert state.state == "2026-11-01"
+    assert state.attributes["amount"] == 5
+
+    await _async_call(hass, SERVICE_CONSUME, **{SERVICE_AMOUNT: 7})
+    assert float(hass.states.get(SUPPLY).state) == 11
+    state = hass.states.get(EXPIRES_SOONEST)
+    assert state.state == "2027-01-10"
+    assert state.attributes["amount"] == 8
+
+    # Setting a lower supply trims the lots
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": SUPPLY, "value": 6}, blocking=True
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(EXPIRES_SOONEST).attributes["amount"] == 6
+
+    events = async_capture_events(hass, EVENT_LOT_EXPIRED)
+    freezer.move_to(dt_util.parse_datetime("2027-01-11T12:00:00+00:00"))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [event.data for event in events] == [
+        {
+            "item": "Pills",
+            "entity_id": SUPPLY,
+            "expiry": "2027-01-10",
+            "amount": 6,
+        }
+    ]
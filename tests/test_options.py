@@ -0,0 +1,80 @@
+"""Test that changed options are applied without reloading if possible."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_UNIT,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DATA = {
+    CONF_ITEM_NAME: "Pills",
+    CONF_ITEM_MAX_CONSUMPTION: 5.0,
+    CONF_SENSOR_BEFORE_EMPTY: 10,
+    CONF_ITEM_UNIT: "pcs",
+}
+
+
+async def _async_setup(hass: HomeAssistant) -> MockConfigEntry:
+    entry = MockConfigEntry(domain=DOMAIN, title="Pills", data=DATA)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    for entity, value in (("morning", 1), ("supply", 20)):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": f"number.pills_{entity}", "value": value},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_options_applied_in_place(hass: HomeAssistant) -> None:
+    """Changing warning days, unit and limit updates the live entities."""
+    entry = await _async_setup(hass)
+    coordinator = entry.runtime_data.coordinator
+    assert hass.states.get("binary_sensor.pills_warning").state == "off"
+
+    hass.config_entries.async_update_entry(
+        entry,
+        data={
+            **DATA,
+            CONF_SENSOR_BEFORE_EMPTY: 30,
+            CONF_ITEM_UNIT: "tablets",
+            CONF_ITEM_MAX_CONSUMPTION: 2.0,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.coordinator is coordinator
+    assert hass.states.get("binary_sensor.pills_warning").state == "on"
+    morning = hass.states.get("number.pills_morning")
+    assert morning.attributes["unit_of_measurement"] == "tablets"
+    assert morning.attributes["max"] == 2.0
+    assert float(hass.states.get("number.pills_supply").state) == 20
+
+
+async def test_renaming_reloads(hass: HomeAssistant) -> None:
+    """Changing the name changes the entities, which requires a reload."""
+    entry = await _async_setup(hass)
+    coordinator = entry.runtime_data.coordinator
+
+    hass.config_entries.async_update_entry(
+        entry, title="Tablets", data={**DATA, CONF_ITEM_NAME: "Tablets"}
+    )
+    await hass.async_block_till_done()
+
+    assert entry.runtime_data.coordinator is not coordinator
+    assert hass.states.get("number.tablets_supply") is not None
@@ -0,0 +1,101 @@
+"""Test reorder points and the planned orders."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_SIZE,
+    CONF_ITEM_TITLE,
+    CONF_ITEM_VENDOR,
+    CONF_ITEMS,
+    CONF_LEAD_TIME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+    SERVICE_PLAN_ORDERS,
+)
+from custom_components.inventory_manager.planner import (
+    reorder_point,
+    round_to_packages,
+)
+from tests.conftest import async_set_number
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Options, daily consumption and supply of the items
+ITEMS = {
+    "Pills": ({CONF_ITEM_VENDOR: "Acme", CONF_ITEM_SIZE: 10, CONF_LEAD_TIME: 7}, 2, 20),
+    "Drops": ({CONF_ITEM_VENDOR: "Acme"}, 1, 3),
+    "Tabs": ({CONF_ITEM_VENDOR: "Other"}, 1, 100),
+    "Gum": ({}, 1, 1),
+}
+
+
+def test_reorder_point() -> None:
+    """The reorder point covers the lead time plus a safety stock."""
+    assert reorder_point(2, 4, 0, 95) == 0
+    assert reorder_point(2, 0, 4, 95) == 8
+    assert reorder_point(2, 4, 4, 95) == pytest.approx(8 + 1.645 * 4, abs=0.01)
+    assert reorder_point(2, 4, 4, 99) > reorder_point(2, 4, 4, 95)
+    assert round_to_packages(31, 10) == (40, 4)
+    assert round_to_packages(30, 10) == (30, 3)
+    assert round_to_packages(5.5, None) == (5.5, None)
+
+
+async def test_plan_orders(hass: HomeAssistant) -> None:
+    """Items in warning are ordered up to their reorder point plus cover."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Cabinet",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: "Cabinet",
+            CONF_ITEMS: {
+                name: {
+                    CONF_ITEM_TITLE: name,
+                    CONF_ITEM_DATA: {
+                        CONF_ITEM_NAME: name,
+                        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+                        CONF_SENSOR_BEFORE_EMPTY: 5,
+                        **options,
+                    },
+                }
+                for name, (options, _, _) in ITEMS.items()
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    for name, (_, daily, supply) in ITEMS.items():
+        await async_set_number(hass, f"number.{name.lower()}_morning", daily)
+        await async_set_number(hass, f"number.{name.lower()}_supply", supply)
+    await hass.async_block_till_done()
+
+    # 10 days left, warned 5 days before empty or at the reorder point of 14
+    assert hass.states.get("binary_sensor.pills_warning").state == "off"
+    await async_set_number(hass, "number.pills_supply", 12)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.pills_warning").state == "on"
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_PLAN_ORDERS, {}, blocking=True, return_response=True
+    )
+    assert [
+        (order["vendor"], [item["item"] for item in order["items"]])
+        for order in response["orders"]
+    ] == [(None, ["Gum"]), ("Acme", ["Pills", "Drops"])]
+    pills, drops = response["orders"][1]["items"]
+    assert pills["reorder_point"] == 14
+    assert (pills["quantity"], pills["packages"]) == (70, 7)
+    assert (drops["quantity"], drops["packages"]) == (27, None)
@@ -0,0 +1,80 @@
+"""Test that the prediction only changes the state when it moves."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_PREDICTION_RESOLUTION,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    SERVICE_AMOUNT,
+    SERVICE_CONSUME,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+SUPPLY = "number.pills_supply"
+PREDICTION = "sensor.pills_emptyprediction"
+
+
+async def _async_consume(hass: HomeAssistant, amount: float) -> None:
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CONSUME,
+        {SERVICE_AMOUNT: amount},
+        target={"entity_id": SUPPLY},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+
+async def test_prediction_anchored(hass: HomeAssistant) -> None:
+    """Consuming small amounts changes the supply, but not the prediction."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pills",
+        data={
+            CONF_ITEM_NAME: "Pills",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+            CONF_PREDICTION_RESOLUTION: 24 * 60,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    for number, value in (("morning", 5), ("supply", 100)):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": f"number.pills_{number}", "value": value},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+    state = hass.states.get(PREDICTION)
+    assert state.attributes["days_remaining"] == 20
+
+    # Each consume moves the prediction by 4.8 hours, less than a day
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    for _ in range(4):
+        await _async_consume(hass, 1)
+    assert [event.data["entity_id"] for event in events] == [SUPPLY] * 4
+    assert hass.states.get(PREDICTION) == state
+
+    # Until it has moved by more than a day
+    await _async_consume(hass, 2)
+    assert sorted(event.data["entity_id"] for event in events[4:]) == [
+        SUPPLY,
+        PREDICTION,
+    ]
+    assert hass.states.get(PREDICTION).attributes["days_remaining"] == 94 / 5
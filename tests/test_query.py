@@ -0,0 +1,121 @@
+"""Test the query service and the indexes behind it."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_AGENT,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_TITLE,
+    CONF_ITEM_VENDOR,
+    CONF_ITEMS,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+    SERVICE_QUERY,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+# Vendor, agent and daily consumption of the items, all with a supply of 20
+ITEMS = {
+    "Pills": ("Acme", "Pimobendan", 4),
+    "Drops": ("ACME", "Trilostane", 1),
+    "Tabs": ("Other", "Pimobendan", 2),
+}
+
+
+def _data(name: str, vendor: str, agent: str) -> dict[str, object]:
+    return {
+        CONF_ITEM_NAME: name,
+        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+        CONF_SENSOR_BEFORE_EMPTY: 5,
+        CONF_ITEM_VENDOR: vendor,
+        CONF_ITEM_AGENT: agent,
+    }
+
+
+async def _async_query(hass: HomeAssistant, **data: object) -> list[str]:
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_QUERY, data, blocking=True, return_response=True
+    )
+    return [item["item"] for item in response["items"]]
+
+
+async def test_query(hass: HomeAssistant) -> None:
+    """Items are found by options and days remaining, following changes."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Cabinet",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: "Cabinet",
+            CONF_ITEMS: {
+                name: {
+                    CONF_ITEM_TITLE: name,
+                    CONF_ITEM_DATA: _data(name, vendor, agent),
+                }
+                for name, (vendor, agent, _) in ITEMS.items()
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    for name, (_, _, daily) in ITEMS.items():
+        for number, value in (("morning", daily), ("supply", 20)):
+            await hass.services.async_call(
+                "number",
+                "set_value",
+                {"entity_id": f"number.{name.lower()}_{number}", "value": value},
+                blocking=True,
+            )
+    await hass.async_block_till_done()
+
+    assert await _async_query(hass) == ["Pills", "Tabs", "Drops"]
+    assert await _async_query(hass, vendor="acme") == ["Pills", "Drops"]
+    assert await _async_query(hass, days_remaining_below=15) == ["Pills", "Tabs"]
+    assert await _async_query(
+        hass, agent="Pimobendan", days_remaining_below=15, vendor="Other"
+    ) == ["Tabs"]
+    assert await _async_query(hass, unit="tablets") == []
+
+    # Consuming moves an item in the order, changed options move it between sets
+    await hass.services.async_call(
+        "number",
+        "set_value",
+        {"entity_id": "number.drops_supply", "value": 2},
+        blocking=True,
+    )
+    items = dict(entry.data[CONF_ITEMS])
+    items["Drops"] = {
+        CONF_ITEM_TITLE: "Drops",
+        CONF_ITEM_DATA: _data("Drops", "ACME", "Pimobendan"),
+    }
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_ITEMS: items}
+    )
+    await hass.async_block_till_done()
+
+    assert await _async_query(hass, days_remaining_below=15) == [
+        "Drops",
+        "Pills",
+        "Tabs",
+    ]
+    assert await _async_query(hass, agent="pimobendan") == ["Drops", "Pills", "Tabs"]
+    assert await _async_query(hass, agent="Trilostane") == []
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_QUERY, {"vendor": "acme"}, blocking=True, return_response=True
+    )
+    drops = response["items"][0]
+    assert drops["entity_id"] == "number.drops_supply"
+    assert drops["supply"] == 2
+    assert 1.9 < drops["days_remaining"] <= 2
@@ -0,0 +1,141 @@
+"""Test that reloading a config entry does not leak memory."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components import inventory_manager
+from custom_components.inventory_manager.const import (
+    CONF_AUTO_CONSUME,
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_TITLE,
+    CONF_ITEMS,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+)
+from custom_components.inventory_manager.coordinator import (
+    InventoryManagerCoordinator,
+    InventoryManagerItem,
+)
+from custom_components.inventory_manager.entity import InventoryManagerEntity
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+ITEMS = 5
+RELOADS = 200
+
+# Memory allocated by the integration may vary a little between reloads
+ALLOWED_GROWTH_BYTES = 64 * 1024
+
+
+def _count(cls: type) -> int:
+    """Count the live objects of a class and its subclasses."""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, cls))
+
+
+def _integration_bytes(snapshot: tracemalloc.Snapshot) -> int:
+    """Return the memory allocated by the integration itself."""
+    pattern = str(Path(inventory_manager.__file__).parent / "*")
+    return sum(
+        stat.size
+        for stat in snapshot.filter_traces(
+            [tracemalloc.Filter(inclusive=True, filename_pattern=pattern)]
+        ).statistics("filename")
+    )
+
+
+async def test_reload_does_not_leak(hass: HomeAssistant) -> None:
+    """Reload a hub many times and check that its objects are released."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Hub",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: "Hub",
+            CONF_ITEMS: {
+                f"item{index}": {
+                    CONF_ITEM_TITLE: f"Item {index}",
+                    CONF_ITEM_DATA: {
+                        CONF_ITEM_NAME: f"Item {index}",
+                        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+                        CONF_SENSOR_BEFORE_EMPTY: 10,
+                        CONF_AUTO_CONSUME: True,
+                    },
+                }
+                for index in range(ITEMS)
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+
+    # Another entry keeps the shared scheduler busy during reloads
+    other_entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Other",
+        data={
+            CONF_ITEM_NAME: "Other",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+            CONF_AUTO_CONSUME: True,
+        },
+    )
+    other_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(other_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # Give the items deadlines, which are scheduled on every setup
+    for index in range(ITEMS):
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": f"number.item_{index}_morning", "value": 1},
+            blocking=True,
+        )
+        await hass.services.async_call(
+            "number",
+            "set_value",
+            {"entity_id": f"number.item_{index}_supply", "value": 100},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+
+    tracemalloc.start()
+    try:
+        for reload in range(RELOADS):
+            assert await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+            if reload == RELOADS // 2:
+                gc.collect()
+                baseline = _integration_bytes(tracemalloc.take_snapshot())
+        gc.collect()
+        final = _integration_bytes(tracemalloc.take_snapshot())
+    finally:
+        tracemalloc.stop()
+
+    assert _count(InventoryManagerCoordinator) == 2
+    assert _count(InventoryManagerItem) == ITEMS + 1
+    assert _count(InventoryManagerEntity) == (ITEMS + 1) * 9
+    assert final - baseline < ALLOWED_GROWTH_BYTES
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    gc.collect()
+    assert _count(InventoryManagerCoordinator) == 1
+    assert _count(InventoryManagerItem) == 1
+    assert _count(InventoryManagerEntity) == 9
+    assert list(hass.data[DOMAIN]) == [other_entry.entry_id]
+
+    assert await hass.config_entries.async_unload(other_entry.entry_id)
+    await hass.async_block_till_done()
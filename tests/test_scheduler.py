@@ -0,0 +1,144 @@
+"""Test the scheduler waking items and doses at their deadline."""
+
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.inventory_manager import scheduler as scheduler_module
+from custom_components.inventory_manager.scheduler import async_get_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+
+class _Target:
+    """Record when it is woken."""
+
+    def __init__(self, name: str, woken: list[str]) -> None:
+        self.name = name
+        self._woken = woken
+
+    def async_deadline_reached(self) -> None:
+        self._woken.append(self.name)
+
+
+async def _async_tick(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, minutes: int
+) -> None:
+    freezer.tick(timedelta(minutes=minutes))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_order(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Targets are woken by deadline, those due together in one pass."""
+    scheduler = async_get_scheduler(hass)
+    woken: list[str] = []
+    now = dt_util.utcnow()
+    for name, minutes in (("a", 3), ("b", 1), ("c", 2), ("d", 1)):
+        scheduler.async_schedule(_Target(name, woken), now + timedelta(minutes=minutes))
+
+    await _async_tick(hass, freezer, 1)
+    assert woken == ["b", "d"]
+    await _async_tick(hass, freezer, 5)
+    assert woken == ["b", "d", "c", "a"]
+    assert scheduler._timer is None
+
+
+async def test_reschedule(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Only the latest deadline of a target counts."""
+    scheduler = async_get_scheduler(hass)
+    woken: list[str] = []
+    now = dt_util.utcnow()
+    later = _Target("later", woken)
+    earlier = _Target("earlier", woken)
+    scheduler.async_schedule(later, now + timedelta(minutes=1))
+    scheduler.async_schedule(earlier, now + timedelta(minutes=5))
+    scheduler.async_schedule(later, now + timedelta(minutes=4))
+    scheduler.async_schedule(earlier, now + timedelta(minutes=2))
+
+    await _async_tick(hass, freezer, 1)
+    assert woken == []
+    await _async_tick(hass, freezer, 1)
+    assert woken == ["earlier"]
+    await _async_tick(hass, freezer, 2)
+    assert woken == ["earlier", "later"]
+    await _async_tick(hass, freezer, 1)
+    assert woken == ["earlier", "later"]
+
+
+async def test_cancel(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Unscheduled and removed targets are not woken."""
+    scheduler = async_get_scheduler(hass)
+    woken: list[str] = []
+    deadline = dt_util.utcnow() + timedelta(minutes=1)
+    targets = [_Target(name, woken) for name in ("a", "b", "c", "d")]
+    for target in targets:
+        scheduler.async_schedule(target, deadline)
+
+    scheduler.async_schedule(targets[0], None)
+    scheduler.async_unschedule(targets[1])
+    scheduler.async_remove([targets[2]])
+    await _async_tick(hass, freezer, 1)
+    assert woken == ["d"]
+
+    # Without deadlines, no timer is left armed
+    scheduler.async_schedule(targets[0], deadline + timedelta(minutes=1))
+    scheduler.async_unschedule(targets[0])
+    assert scheduler._timer is None
+    assert not scheduler._heap
+
+
+async def test_single_timer(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """One timer is armed for the earliest deadline, whatever the targets."""
+    armed: list[object] = []
+    original = scheduler_module.async_track_point_in_utc_time
+
+    def _track(
+        hass: HomeAssistant, action: Callable[[datetime], None], point: datetime
+    ) -> Callable[[], None]:
+        def _fire(now: datetime) -> None:
+            armed.remove(token)
+            action(now)
+
+        def _cancel() -> None:
+            armed.remove(token)
+            cancel()
+
+        token = object()
+        armed.append(token)
+        cancel = original(hass, _fire, point)
+        return _cancel
+
+    scheduler = async_get_scheduler(hass)
+    woken: list[str] = []
+    now = dt_util.utcnow()
+    rng = random.Random(2)  # noqa: S311
+    targets = [_Target(str(index), woken) for index in range(100)]
+    deadlines = {}
+    with patch.object(scheduler_module, "async_track_point_in_utc_time", _track):
+        for _ in range(500):
+            target = rng.choice(targets)
+            deadlines[target.name] = now + timedelta(minutes=rng.randint(1, 60))
+            scheduler.async_schedule(target, deadlines[target.name])
+            assert len(armed) == 1
+            assert scheduler._timer_at <= min(deadlines.values())
+
+        for _ in range(60):
+            await _async_tick(hass, freezer, 1)
+            assert len(armed) <= 1
+
+    assert sorted(woken) == sorted(deadlines)
+    assert woken == sorted(woken, key=lambda name: deadlines[name])
@@ -0,0 +1,108 @@
+"""Test restoring the numbers of all items from the snapshot."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from homeassistant.components.number import RestoreNumber
+
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from custom_components.inventory_manager.snapshot import (
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from tests.conftest import hub_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+ITEMS = {"pills": "Pills", "drops": "Drops"}
+
+# Numbers enabled by default per item
+NUMBERS_PER_ITEM = 5
+
+
+def _numbers(supply: float, morning: float) -> dict[str, float]:
+    return {
+        entity_type.name: 0.0
+        for entity_type in (
+            InventoryManagerEntityType.NIGHT,
+            InventoryManagerEntityType.NOON,
+            InventoryManagerEntityType.EVENING,
+            InventoryManagerEntityType.WEEK,
+            InventoryManagerEntityType.MONTH,
+        )
+    } | {"SUPPLY": supply, "MORNING": morning}
+
+
+async def test_bulk_restore(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Items in the snapshot are restored without looking up each number."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "items": {
+                "pills": {"numbers": _numbers(30, 2), "changed_at": 0},
+                "drops": {"numbers": _numbers(12.5, 0.5), "changed_at": 0},
+            }
+        },
+    }
+    entry = hub_entry(ITEMS)
+    entry.add_to_hass(hass)
+    with patch.object(
+        RestoreNumber, "async_get_last_number_data", autospec=True
+    ) as get_last_number_data:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    get_last_number_data.assert_not_called()
+    for entity_id, state in (
+        ("number.pills_supply", "30.0"),
+        ("number.pills_morning", "2.0"),
+        ("number.drops_supply", "12.5"),
+        ("number.drops_morning", "0.5"),
+    ):
+        assert hass.states.get(entity_id).state == state
+    items = entry.runtime_data.coordinator.items
+    assert items["pills"].days_remaining() == 15
+    assert items["drops"].days_remaining() == 25
+
+
+async def test_restore_missing(hass: HomeAssistant) -> None:
+    """Items missing in the snapshot look up their numbers instead."""
+    entry = hub_entry(ITEMS)
+    entry.add_to_hass(hass)
+    with patch.object(
+        RestoreNumber,
+        "async_get_last_number_data",
+        autospec=True,
+        return_value=None,
+    ) as get_last_number_data:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    assert get_last_number_data.call_count == len(ITEMS) * NUMBERS_PER_ITEM
+
+
+async def test_unflushed_changes(hass: HomeAssistant) -> None:
+    """Changes made right before unloading are restored."""
+    entry = hub_entry(ITEMS)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    items = entry.runtime_data.coordinator.items
+    items["pills"].set(InventoryManagerEntityType.SUPPLY, 42)
+    items["drops"].set(InventoryManagerEntityType.MORNING, 1)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch.object(
+        RestoreNumber, "async_get_last_number_data", autospec=True
+    ) as get_last_number_data:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    get_last_number_data.assert_not_called()
+    assert hass.states.get("number.pills_supply").state == "42.0"
+    assert hass.states.get("number.drops_morning").state == "1.0"
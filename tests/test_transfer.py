@@ -0,0 +1,122 @@
+"""Test importing and exporting items."""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.inventory_manager.const import (
+    CONF_ENTRY_TYPE,
+    CONF_HUB_NAME,
+    CONF_ITEM_DATA,
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_ITEM_TITLE,
+    CONF_ITEMS,
+    CONF_SENSOR_BEFORE_EMPTY,
+    DOMAIN,
+    ENTRY_TYPE_HUB,
+    SERVICE_EXPORT_ITEMS,
+    SERVICE_FILE,
+    SERVICE_IMPORT_ITEMS,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+
+@pytest.fixture
+async def hub(hass: HomeAssistant, tmp_path: Path) -> MockConfigEntry:
+    """Set up a hub with one item, with the config directory in a temporary path."""
+    hass.config.config_dir = str(tmp_path)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Pantry",
+        data={
+            CONF_ENTRY_TYPE: ENTRY_TYPE_HUB,
+            CONF_HUB_NAME: "Pantry",
+            CONF_ITEMS: {
+                "coffee": {
+                    CONF_ITEM_TITLE: "Coffee",
+                    CONF_ITEM_DATA: {
+                        CONF_ITEM_NAME: "Coffee",
+                        CONF_ITEM_MAX_CONSUMPTION: 5.0,
+                        CONF_SENSOR_BEFORE_EMPTY: 10,
+                    },
+                }
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_call(hass: HomeAssistant, service: str, file: str) -> dict:
+    return await hass.services.async_call(
+        DOMAIN, service, {SERVICE_FILE: file}, blocking=True, return_response=True
+    )
+
+
+async def test_import_and_export(
+    hass: HomeAssistant, hub: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Imported rows update and create items, which are exported again."""
+    (tmp_path / "import.csv").write_text(
+        """item_id,item_name,item_unit,supply,morning
+coffee,,kg,2.5,
+,Tea,bags,40,2
+"""
+    )
+    response = await _async_call(hass, SERVICE_IMPORT_ITEMS, "import.csv")
+    await hass.async_block_till_done()
+
+    assert response == {"created": 1, "updated": 1}
+    assert len(hub.data[CONF_ITEMS]) == 2
+    coffee = hass.states.get("number.coffee_supply")
+    assert float(coffee.state) == 2.5
+    assert coffee.attributes["unit_of_measurement"] == "kg"
+    assert float(hass.states.get("number.tea_supply").state) == 40
+    assert float(hass.states.get("number.tea_morning").state) == 2
+
+    response = await _async_call(hass, SERVICE_EXPORT_ITEMS, "export.csv")
+    assert response == {"exported": 2}
+    with (tmp_path / "export.csv").open() as handle:
+        rows = {row["title"]: row for row in csv.DictReader(handle)}
+    assert float(rows["Tea"]["supply"]) == 40
+    assert float(rows["Tea"]["days_remaining"]) == 20
+    assert rows["Coffee"]["item_unit"] == "kg"
+
+    await _async_call(hass, SERVICE_EXPORT_ITEMS, "export.json")
+    lines = (tmp_path / "export.json").read_text().splitlines()
+    assert {json.loads(line)["title"] for line in lines} == {"Coffee", "Tea"}
+
+
+async def test_invalid_import_changes_nothing(
+    hass: HomeAssistant, hub: MockConfigEntry, tmp_path: Path
+) -> None:
+    """Rows are validated before any of them is applied."""
+    (tmp_path / "import.json").write_text(
+        '{"item_name": "Tea", "supply": 40}\n{"item_name": "Milk", "supply": -1}\n'
+    )
+    with pytest.raises(ServiceValidationError):
+        await _async_call(hass, SERVICE_IMPORT_ITEMS, "import.json")
+    assert len(hub.data[CONF_ITEMS]) == 1
+
+    # Lines of JSON that are not objects
+    for line in ("[1]", "3"):
+        (tmp_path / "import.json").write_text(f'{{"item_name": "Tea"}}\n{line}\n')
+        with pytest.raises(ServiceValidationError, match="row 2"):
+            await _async_call(hass, SERVICE_IMPORT_ITEMS, "import.json")
+    assert len(hub.data[CONF_ITEMS]) == 1
+
+    with pytest.raises(ServiceValidationError):
+        await _async_call(hass, SERVICE_IMPORT_ITEMS, "../outside.csv")
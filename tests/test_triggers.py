@@ -0,0 +1,121 @@
+"""Test consumption triggered by the state changes of other entities."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.const import (
+    CONF_ITEM_MAX_CONSUMPTION,
+    CONF_ITEM_NAME,
+    CONF_SENSOR_BEFORE_EMPTY,
+    CONF_TRIGGER_AMOUNT,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_MODE,
+    DOMAIN,
+    TRIGGER_MODE_ON,
+)
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from custom_components.inventory_manager.triggers import APPLY_DELAY
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import FrozenDateTimeFactory
+
+SUPPLY = "number.tabs_supply"
+
+
+async def _async_setup(hass: HomeAssistant, **options: object) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Tabs",
+        data={
+            CONF_ITEM_NAME: "Tabs",
+            CONF_ITEM_MAX_CONSUMPTION: 5.0,
+            CONF_SENSOR_BEFORE_EMPTY: 10,
+            **options,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.services.async_call(
+        "number", "set_value", {"entity_id": SUPPLY, "value": 20}, blocking=True
+    )
+    await hass.async_block_till_done()
+    return entry
+
+
+async def _async_apply(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=APPLY_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_counter_increments(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A burst of counter increments is consumed at once, resets are ignored."""
+    hass.states.async_set("counter.dishwasher", "3")
+    await _async_setup(
+        hass, **{CONF_TRIGGER_ENTITY: "counter.dishwasher", CONF_TRIGGER_AMOUNT: 2.0}
+    )
+
+    for value in ("4", "5", "0", "1"):
+        hass.states.async_set("counter.dishwasher", value)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(SUPPLY).state) == 20
+
+    await _async_apply(hass, freezer)
+    assert float(hass.states.get(SUPPLY).state) == 14
+
+
+async def test_turning_on(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Turning on consumes, becoming available while on does not."""
+    hass.states.async_set("switch.dishwasher", "unavailable")
+    entry = await _async_setup(
+        hass,
+        **{
+            CONF_TRIGGER_ENTITY: "switch.dishwasher",
+            CONF_TRIGGER_MODE: TRIGGER_MODE_ON,
+        },
+    )
+
+    for state in ("on", "off", "on", "on"):
+        hass.states.async_set("switch.dishwasher", state)
+    await _async_apply(hass, freezer)
+    assert float(hass.states.get(SUPPLY).state) == 19
+
+    # Pending consumption is applied when the entry is unloaded
+    (item,) = entry.runtime_data.coordinator.items.values()
+    hass.states.async_set("switch.dishwasher", "off")
+    hass.states.async_set("switch.dishwasher", "on")
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert item.get(InventoryManagerEntityType.SUPPLY) == 18
+
+
+async def test_not_postponed(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Changes do not postpone consuming the changes before them."""
+    hass.states.async_set("counter.dishwasher", "0")
+    await _async_setup(hass, **{CONF_TRIGGER_ENTITY: "counter.dishwasher"})
+
+    hass.states.async_set("counter.dishwasher", "1")
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=APPLY_DELAY / 2))
+    async_fire_time_changed(hass)
+    hass.states.async_set("counter.dishwasher", "2")
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=APPLY_DELAY / 2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert float(hass.states.get(SUPPLY).state) == 18
@@ -0,0 +1,107 @@
+"""Test that entity states are written once, through the coalesced flush."""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.entity import Entity
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+)
+
+from custom_components.inventory_manager.entity import InventoryManagerEntityType
+from tests.conftest import hub_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+
+ITEMS = ("Pills", "Drops", "Tabs")
+
+# Entities enabled by default per item, and those summarizing the hub
+ENTITIES_PER_ITEM = 7
+ENTITIES_PER_HUB = 3
+
+
+@pytest.fixture
+def writes() -> Generator[Counter[str]]:
+    """Count the state writes of all entities by entity id."""
+    writes: Counter[str] = Counter()
+    original = Entity._async_write_ha_state
+
+    def _write(entity: Entity) -> None:
+        writes[entity.entity_id] += 1
+        original(entity)
+
+    with patch.object(Entity, "_async_write_ha_state", _write):
+        yield writes
+
+
+async def test_written_once_when_added(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, writes: Counter[str]
+) -> None:
+    """Entities are written once when added, and not again by a refresh."""
+    assert await async_setup_component(hass, "homeassistant", {})
+    entry = hub_entry({name: name for name in ITEMS})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(writes) == len(ITEMS) * ENTITIES_PER_ITEM + ENTITIES_PER_HUB
+    assert set(writes.values()) == {1}
+
+    # Nothing is written later on
+    writes.clear()
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert not writes
+
+    # Updating an entity only writes that entity
+    await hass.services.async_call(
+        "homeassistant",
+        "update_entity",
+        {"entity_id": "sensor.pills_emptyprediction"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert writes == {"sensor.pills_emptyprediction": 1}
+
+
+async def test_coalesced(hass: HomeAssistant, writes: Counter[str]) -> None:
+    """Many changes in one event loop iteration write each entity once."""
+    entry = hub_entry({name: name for name in ITEMS})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = entry.runtime_data.coordinator
+    items = list(coordinator.items.values())
+    for item in items:
+        item.set(InventoryManagerEntityType.MORNING, 1)
+    await hass.async_block_till_done()
+
+    writes.clear()
+    requested = coordinator.writes_requested
+    for _ in range(50):
+        for item in items:
+            item.set(
+                InventoryManagerEntityType.SUPPLY,
+                item.get(InventoryManagerEntityType.SUPPLY) + 10,
+            )
+    await hass.async_block_till_done()
+
+    supplies = {f"number.{name.lower()}_supply" for name in ITEMS}
+    assert supplies <= set(writes)
+    assert set(writes.values()) == {1}
+    assert coordinator.writes_requested - requested >= 50 * len(ITEMS)
+    for name in ITEMS:
+        assert hass.states.get(f"number.{name.lower()}_supply").state == "500.0"